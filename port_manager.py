@@ -7,59 +7,54 @@ import os
 # import psutil  # 제거 - 불필요한 의존성
 from threading import Thread
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+import build_cache  # RSVSHOP_MODE=production: 캐시된 빌드로 next start
+from rsvshop import ports, proc  # 포트 확인/해제, npm 명령 (공통 코어)
+from rsvshop.events import ProcessEvents  # 라이프사이클 이벤트 (브라우저 매니저가 구독)
+
 class PortManager:
     def __init__(self, port=4900):
         self.port = port
         self.node_process = None
         self.running = True
+        self.events = ProcessEvents("rsvshop", port)
         
     def find_process_on_port(self):
         """포트를 사용하는 프로세스 찾기"""
-        try:
-            result = subprocess.run(['netstat', '-ano'], capture_output=True, text=True)
-            for line in result.stdout.split('\n'):
-                if f':{self.port}' in line and 'LISTENING' in line:
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        return int(parts[-1])
-        except:
-            pass
-        return None
+        pids = ports.listening_pids(self.port)
+        return pids[0] if pids else None
     
     def kill_process_on_port(self):
         """포트를 사용하는 프로세스 종료"""
-        pid = self.find_process_on_port()
-        if pid:
-            try:
-                subprocess.run(['taskkill', '/F', '/PID', str(pid)], check=True)
-                print(f"포트 {self.port}의 프로세스 {pid} 종료됨")
-                time.sleep(2)
-                return True
-            except:
-                pass
+        if ports.free_port(self.port):
+            time.sleep(2)
+            return True
         return False
     
     def start_node_server(self):
         """Node.js 서버 시작"""
         try:
-            # Windows에서 npm 명령어 실행
-            if os.name == 'nt':  # Windows
+            if build_cache.production_mode():
+                # 소스가 바뀐 경우에만 빌드하고 next start
+                command, env = build_cache.production_command(self.port)
                 self.node_process = subprocess.Popen(
-                    ['cmd', '/c', 'npm', 'run', 'dev'],
+                    command,
                     cwd=os.getcwd(),
+                    env=env,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     text=True
                 )
-            else:  # Linux/Mac
+            else:  # 윈도우는 cmd /c 경유
                 self.node_process = subprocess.Popen(
-                    ['npm', 'run', 'dev'],
+                    proc.npm_command('run', 'dev'),
                     cwd=os.getcwd(),
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     text=True
                 )
             print(f"Node.js 서버 시작됨 (PID: {self.node_process.pid})")
+            self.events.starting(self.node_process)
             return True
         except Exception as e:
             print(f"서버 시작 실패: {e}")
@@ -70,6 +65,7 @@ class PortManager:
         while self.running:
             if self.node_process and self.node_process.poll() is not None:
                 print("서버가 종료됨. 재시작 중...")
+                self.events.exited(self.node_process.returncode, restart_delay=3)
                 self.kill_process_on_port()
                 time.sleep(3)
                 self.start_node_server()
@@ -81,6 +77,7 @@ class PortManager:
         self.running = False
         if self.node_process:
             self.node_process.terminate()
+        self.events.stopped()
         sys.exit(0)
     
     def run(self):
@@ -4,37 +4,45 @@ import os
 import signal
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+import build_cache  # RSVSHOP_MODE=production: 캐시된 빌드로 next start
+from rsvshop import ports, proc  # 포트 확인/해제, npm 명령 (공통 코어)
+from rsvshop.events import ProcessEvents  # 라이프사이클 이벤트 (브라우저 매니저가 구독)
+
 class ProtectedServer:
     def __init__(self, port=4900):
         self.port = port
         self.node_process = None
         self.running = True
+        self.events = ProcessEvents("rsvshop", port)
         
     def kill_port(self):
         """포트를 사용하는 프로세스 종료"""
-        try:
-            result = subprocess.run(['netstat', '-ano'], capture_output=True, text=True)
-            for line in result.stdout.split('\n'):
-                if f':{self.port}' in line and 'LISTENING' in line:
-                    parts = line.split()
-                    if len(parts) >= 5:
-                        pid = int(parts[-1])
-                        subprocess.run(['taskkill', '/F', '/PID', str(pid)])
-                        print(f"포트 {self.port}의 프로세스 {pid} 종료됨")
-                        return True
-        except:
-            pass
-        return False
+        return bool(ports.free_port(self.port))
     
     def start_server(self):
         """Node.js 서버 시작"""
         try:
-            self.node_process = subprocess.Popen(
-                ['cmd', '/c', 'npm', 'run', 'dev'],
-                cwd=os.getcwd(),
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP  # 프로세스 그룹 분리
-            )
+            command, env = proc.npm_command('run', 'dev'), None
+            if build_cache.production_mode():
+                # 소스가 바뀐 경우에만 빌드하고 next start
+                command, env = build_cache.production_command(self.port)
+            if os.name == 'nt':  # Windows
+                self.node_process = subprocess.Popen(
+                    command,
+                    cwd=os.getcwd(),
+                    env=env,
+                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP  # 프로세스 그룹 분리
+                )
+            else:  # Linux/Mac
+                self.node_process = subprocess.Popen(
+                    command,
+                    cwd=os.getcwd(),
+                    env=env,
+                    start_new_session=True  # 프로세스 그룹 분리
+                )
             print(f"✅ 보호된 서버 시작됨 (PID: {self.node_process.pid})")
+            self.events.starting(self.node_process)
             print("🛡️ Node.js 프로세스 보호 활성화")
             return True
         except Exception as e:
@@ -46,6 +54,7 @@ class ProtectedServer:
         while self.running:
             if self.node_process and self.node_process.poll() is not None:
                 print("🔄 서버가 종료됨. 재시작 중...")
+                self.events.exited(self.node_process.returncode, restart_delay=2)
                 time.sleep(2)
                 self.start_server()
             time.sleep(3)
@@ -56,6 +65,7 @@ class ProtectedServer:
         self.running = False
         if self.node_process:
             self.node_process.terminate()
+        self.events.stopped()
         sys.exit(0)
     
     def run(self):
@@ -84,7 +94,7 @@ class ProtectedServer:
         
         try:
             # 포그라운드에서 서버 프로세스 대기
-            self.node_process.wait()
+            self.events.exited(self.node_process.wait())
         except KeyboardInterrupt:
             self.signal_handler(None, None)
 
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+RSVShop asyncio HTTP/1.1 클라이언트
+keep-alive 연결 풀 기반의 최소 HTTP 클라이언트 (표준 라이브러리만 사용)
+"""
+
+import asyncio
+
+
+class HttpError(Exception):
+    pass
+
+
+class HttpResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+
+class HttpConnection:
+    """단일 keep-alive 연결"""
+
+    def __init__(self, host, port, timeout=10):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.requests = 0
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), timeout=self.timeout)
+        self.requests = 0
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=None, body=None):
+        if not self.connected:
+            await self.connect()
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        if body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+        self.writer.write(payload)
+        await self.writer.drain()
+        response = await asyncio.wait_for(self._read_response(method), timeout=self.timeout)
+        self.requests += 1
+        if response.headers.get("connection", "").lower() == "close":
+            self.close()
+        return response
+
+    async def _read_response(self, method):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("응답 전에 연결이 닫혔습니다")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise HttpError(f"잘못된 상태 줄: {status_line[:80]!r}")
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return HttpResponse(status, headers, b"")
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            return HttpResponse(status, headers, b"".join(chunks))
+        if "content-length" in headers:
+            return HttpResponse(status, headers, await self.reader.readexactly(int(headers["content-length"])))
+        body = await self.reader.read()
+        self.close()
+        return HttpResponse(status, headers, body)
+
+
+class ConnectionPool:
+    """고정 크기 keep-alive 연결 풀. 연결은 처음 필요할 때 연다."""
+
+    def __init__(self, host, port, size=10, timeout=10):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self._idle = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(HttpConnection(host, port, timeout))
+        self.reconnects = 0
+
+    async def request(self, method, path, headers=None, body=None):
+        connection = await self._idle.get()
+        try:
+            reused = connection.connected and connection.requests > 0
+            try:
+                return await connection.request(method, path, headers, body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                if not reused:
+                    raise
+                # 서버가 유휴 keep-alive 연결을 닫은 경우 한 번만 재시도
+                self.reconnects += 1
+                try:
+                    return await connection.request(method, path, headers, body)
+                except BaseException:
+                    connection.close()  # 응답을 읽다 만 연결이 풀로 돌아가지 않게
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+        finally:
+            self._idle.put_nowait(connection)
+
+    async def get(self, path, headers=None):
+        return await self.request("GET", path, headers)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
@@ -6,6 +6,7 @@ RSVShop 자동 오류 수정 스크립트
 수집된 로그를 분석하여 일반적인 오류를 자동으로 수정
 """
 
+import hashlib
 import json
 import os
 import re
@@ -15,6 +16,13 @@ from pathlib import Path
 import subprocess
 import sys
 
+from supervisor_metrics import MetricsRegistry, MetricsServer
+from event_collector import load_cursor, read_new_events, save_cursor
+from error_rate_detector import ErrorRateDetector
+from log_reader import TS_PREFIX_RE, parse_ts
+from rsvshop import DEFAULT_PORT, ports
+from rsvshop.proc import npm_command
+
 class AutoErrorFixer:
     def __init__(self):
         self.project_root = Path.cwd()
@@ -22,6 +30,18 @@ class AutoErrorFixer:
         self.console_logs_file = self.logs_dir / "console-logs.json"
         self.server_errors_file = self.logs_dir / "server-errors.log"
         self.fixed_errors_file = self.logs_dir / "fixed-errors.json"
+        # event_collector.py 세그먼트와 마지막으로 읽은 위치
+        self.events_dir = self.logs_dir / "events"
+        self.events_cursor_file = self.events_dir / ".fixer-cursor.json"
+        # 지난 분석 이후 새로 생긴 로그만 보도록 위치 기억. 재시작할 때마다 로그 전체를 "지금" 오류로
+        # 다시 세면 탐지기가 가짜 버스트로 발동하므로 위치는 파일에 저장한다
+        self.logs_cursor_file = self.logs_dir / ".fixer-logs-cursor.json"
+        cursor = load_cursor(self.logs_cursor_file)
+        self.server_errors_offset = cursor.get("server_errors_offset", 0)
+        self.console_last_ts = cursor.get("console_last_ts", 0.0)
+        # console_last_ts와 같은 시각에 이미 본 항목 (같은 ms에 여러 개가 올 수 있음)
+        self.console_last_keys = set(cursor.get("console_last_keys", []))
+        self.console_untimed_keys = set(cursor.get("console_untimed_keys", []))  # 시각이 없는 항목은 내용으로 거른다
         
         # 오류 패턴 정의
         self.error_patterns = {
@@ -54,6 +74,25 @@ class AutoErrorFixer:
         
         # 수정된 오류 기록
         self.fixed_errors = self.load_fixed_errors()
+        
+        # 수정 실행 메트릭 (monitor 모드에서 RSVSHOP_FIXER_METRICS_PORT로 노출, 0이면 비활성화)
+        self.metrics = MetricsRegistry()
+        self.m_errors_found = self.metrics.counter(
+            "rsvshop_errors_detected_total", "로그 분석에서 발견된 오류 수", ["type", "source"])
+        self.m_fix_runs = self.metrics.counter(
+            "rsvshop_remediation_runs_total", "자동 수정 실행 횟수", ["type", "status"])
+        self.m_fix_duration = self.metrics.histogram(
+            "rsvshop_remediation_duration_seconds", "자동 수정 실행 시간", ["type"],
+            buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600))
+        self.m_last_scan = self.metrics.gauge(
+            "rsvshop_fixer_last_scan_timestamp_seconds", "마지막 로그 분석 시각 (epoch)")
+        try:
+            self.metrics_port = int(os.environ.get("RSVSHOP_FIXER_METRICS_PORT", "9465"))
+        except ValueError:
+            self.metrics_port = 9465
+        
+        # 한 줄이 아니라 오류율이 임계값을 넘은 카테고리만 수정 (error_rate_detector.py)
+        self.detector = ErrorRateDetector(registry=self.metrics)
     
     def load_fixed_errors(self):
         """수정된 오류 기록 로드"""
@@ -70,28 +109,53 @@ class AutoErrorFixer:
         with open(self.fixed_errors_file, 'w', encoding='utf-8') as f:
             json.dump(self.fixed_errors, f, ensure_ascii=False, indent=2)
     
+    def save_logs_cursor(self):
+        """서버 오류 로그 위치와 콘솔 로그 중복 제거 상태 저장"""
+        try:
+            save_cursor(self.logs_cursor_file, {
+                "server_errors_offset": self.server_errors_offset,
+                "console_last_ts": self.console_last_ts,
+                "console_last_keys": sorted(self.console_last_keys),
+                "console_untimed_keys": sorted(self.console_untimed_keys),
+            })
+        except OSError as e:
+            print(f"⚠️  로그 분석 위치 저장 실패: {e}")
+
     def analyze_logs(self):
         """로그 분석 및 오류 패턴 매칭"""
         errors_found = []
         
-        # 서버 오류 로그 분석
+        # 서버 오류 로그 분석 (지난 분석 이후 덧붙여진 줄만)
         if self.server_errors_file.exists():
-            with open(self.server_errors_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
+            stat = self.server_errors_file.stat()
+            if stat.st_size < self.server_errors_offset:
+                self.server_errors_offset = 0  # 로그가 교체됨
+            # 시각 접두사가 없는 줄은 앞 줄의 시각, 그것도 없으면 파일 수정 시각 (현재 시각으로 찍으면 밀린 줄이 버스트가 된다)
+            line_ts = datetime.fromtimestamp(stat.st_mtime).isoformat()
+            with open(self.server_errors_file, 'rb') as f:
+                f.seek(self.server_errors_offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    self.server_errors_offset += len(raw)
+                    line = raw.decode('utf-8', errors='replace')
+                    match = TS_PREFIX_RE.match(line.strip())
+                    if match:
+                        line_ts = match.group(1)
                     for error_type, config in self.error_patterns.items():
                         if re.search(config["pattern"], line, re.IGNORECASE):
                             errors_found.append({
                                 "type": error_type,
                                 "line": line.strip(),
-                                "line_num": line_num,
                                 "description": config["description"],
-                                "timestamp": datetime.now().isoformat(),
+                                "timestamp": line_ts,
                                 "source": "server"
                             })
         
         # 콘솔 로그 분석
         if self.console_logs_file.exists():
             try:
+                console_mtime = datetime.fromtimestamp(self.console_logs_file.stat().st_mtime).isoformat()
                 with open(self.console_logs_file, 'r', encoding='utf-8') as f:
                     console_data = json.load(f)
                     if isinstance(console_data, list):
@@ -99,8 +163,28 @@ class AutoErrorFixer:
                     else:
                         logs = console_data.get("logs", [])
                     
+                    last_ts = self.console_last_ts
+                    last_keys = set(self.console_last_keys)
+                    untimed_keys = set()
                     for log_entry in logs:
-                        if isinstance(log_entry, dict) and log_entry.get("type") == "error":
+                        if not isinstance(log_entry, dict):
+                            continue
+                        entry_ts = parse_ts(log_entry.get("timestamp"))
+                        key = hashlib.sha1(json.dumps(log_entry, sort_keys=True, ensure_ascii=False, default=str)
+                                           .encode("utf-8")).hexdigest()
+                        if entry_ts is None:
+                            untimed_keys.add(key)
+                            if key in self.console_untimed_keys:
+                                continue
+                        else:
+                            if entry_ts < self.console_last_ts or (
+                                    entry_ts == self.console_last_ts and key in self.console_last_keys):
+                                continue
+                            if entry_ts > last_ts:
+                                last_ts, last_keys = entry_ts, set()
+                            if entry_ts == last_ts:
+                                last_keys.add(key)
+                        if log_entry.get("type") == "error":
                             message = log_entry.get("message", "")
                             for error_type, config in self.error_patterns.items():
                                 if re.search(config["pattern"], message, re.IGNORECASE):
@@ -108,12 +192,37 @@ class AutoErrorFixer:
                                         "type": error_type,
                                         "line": message,
                                         "description": config["description"],
-                                        "timestamp": log_entry.get("timestamp", ""),
+                                        "timestamp": log_entry.get("timestamp") or console_mtime,
                                         "source": "console",
                                         "url": log_entry.get("url", "")
                                     })
+                    self.console_last_ts = last_ts
+                    self.console_last_keys = last_keys
+                    # 파일에 남아 있는 것만 기억하므로 집합이 계속 커지지 않는다
+                    self.console_untimed_keys = untimed_keys
             except Exception as e:
                 print(f"⚠️  콘솔 로그 분석 실패: {e}")
+        self.save_logs_cursor()
+        
+        # 수집기 이벤트 분석 (지난 분석 이후 새로 기록된 것만)
+        if self.events_dir.exists():
+            cursor = load_cursor(self.events_cursor_file)
+            events, cursor = read_new_events(str(self.events_dir), cursor)
+            for event in events:
+                if event.get("type") not in ("error", "javascript", "unhandledrejection", "network"):
+                    continue
+                text = f"{event.get('message', '')} {event.get('stack', '')}"
+                for error_type, config in self.error_patterns.items():
+                    if re.search(config["pattern"], text, re.IGNORECASE):
+                        errors_found.append({
+                            "type": error_type,
+                            "line": event.get("message", ""),
+                            "description": config["description"],
+                            "timestamp": event.get("timestamp") or event.get("receivedAt", ""),
+                            "source": "collector",
+                            "url": event.get("url", "")
+                        })
+            save_cursor(self.events_cursor_file, cursor)
         
         return errors_found
     
@@ -158,12 +267,12 @@ class AutoErrorFixer:
             
             # node_modules 재설치
             print("📦 의존성 재설치...")
-            subprocess.run(["npm", "install"], check=True)
+            subprocess.run(npm_command("install"), check=True)
             print("✅ 의존성 재설치 완료")
             
             # 빌드 재시도
             print("🏗️  빌드 재시도...")
-            subprocess.run(["npm", "run", "build"], check=True)
+            subprocess.run(npm_command("run", "build"), check=True)
             print("✅ 빌드 성공")
             
             return True
@@ -179,9 +288,9 @@ class AutoErrorFixer:
         try:
             # 서버 재시작
             print("🔄 서버 재시작...")
-            subprocess.run(["pkill", "-f", "npm run dev"], check=False)
+            ports.free_port(DEFAULT_PORT)
             time.sleep(2)
-            subprocess.run(["npm", "run", "dev"], check=True)
+            subprocess.run(npm_command("run", "dev"), check=True)
             print("✅ 서버 재시작 완료")
             
             return True
@@ -210,15 +319,23 @@ class AutoErrorFixer:
         """메모리 부족 오류 수정"""
         print("🔧 메모리 부족 오류 수정 시도...")
         
+        # 슈퍼바이저가 임계값 초과 시 남긴 힙 스냅샷 분석이 있으면 안내 (무엇이 누수됐는지 확인용)
+        snapshots_dir = self.logs_dir / "heapsnapshots"
+        if snapshots_dir.exists():
+            summaries = sorted(snapshots_dir.glob("*.summary.json"))
+            if summaries:
+                print(f"🧠 최근 힙 스냅샷 분석: {summaries[-1]}")
+                print("   python scripts/heap_snapshot.py diff <이전.heapsnapshot> <최근.heapsnapshot> 으로 증가분 확인")
+        
         try:
-            # Node.js 프로세스 정리
+            # 서버 포트를 점유한 Node.js 프로세스만 정리 (다른 node 프로세스는 건드리지 않음)
             print("🧹 Node.js 프로세스 정리...")
-            subprocess.run(["pkill", "-f", "node"], check=False)
+            ports.free_port(DEFAULT_PORT)
             time.sleep(2)
             
             # 메모리 정리 후 서버 재시작
             print("🔄 서버 재시작...")
-            subprocess.run(["npm", "run", "dev"], check=True)
+            subprocess.run(npm_command("run", "dev"), check=True)
             print("✅ 메모리 정리 및 서버 재시작 완료")
             
             return True
@@ -228,60 +345,75 @@ class AutoErrorFixer:
             return False
     
     def auto_fix_errors(self):
-        """발견된 오류 자동 수정"""
+        """오류율이 임계값을 넘은 카테고리만 자동 수정"""
         print("🔍 오류 분석 중...")
         errors = self.analyze_logs()
+        self.m_last_scan.set(time.time())
+        for error in errors:
+            self.m_errors_found.labels(type=error["type"], source=error.get("source", "")).inc()
+            self.detector.observe(error["type"], error["line"], parse_ts(error.get("timestamp")))
+        alerts = self.detector.evaluate()
         
-        if not errors:
+        if not errors and not alerts:
             print("✅ 발견된 오류가 없습니다.")
             return
         
-        print(f"🎯 {len(errors)}개의 오류를 발견했습니다.")
+        if errors:
+            print(f"🎯 {len(errors)}개의 새 오류를 발견했습니다.")
+        for category, snap in sorted(self.detector.last_status.items()):
+            state = "🔥 발동" if self.detector.states[category].firing else "📉 임계값 미만"
+            print(f"   {category}: 1분 {snap['count_1m']}건, 15분 {snap['count_15m']}건, "
+                  f"기준선 {snap['baseline_per_min']}/분, 버스트 {snap['burst']} → {state}")
         
-        for error in errors:
-            error_id = f"{error['type']}_{error.get('timestamp', 'unknown')}"
-            
-            # 이미 수정된 오류인지 확인
-            if any(fixed['id'] == error_id for fixed in self.fixed_errors):
-                print(f"⏭️  이미 수정된 오류: {error['description']}")
-                continue
+        for alert in alerts:
+            error_type = alert["category"]
+            config = self.error_patterns.get(error_type, {"description": error_type})
+            error_id = f"{error_type}_{datetime.fromtimestamp(time.time()).isoformat()}"
+            sample = alert["fingerprints"][0]["sample"] if alert["fingerprints"] else ""
             
-            print(f"\n🔧 오류 수정 시도: {error['description']}")
-            print(f"   📝 상세: {error['line'][:100]}...")
+            print(f"\n🔧 오류 수정 시도: {config['description']} (1분 {alert['count_1m']}건, 버스트 {alert['burst']})")
+            print(f"   📝 대표 메시지: {sample[:100]}...")
             
             # 수정 함수 실행
-            fix_method = getattr(self, error['type'] + '_fix', None)
+            fix_method = getattr(self, error_type + '_fix', None)
             if fix_method and callable(fix_method):
-                if fix_method():
-                    # 수정 성공 시 기록
-                    self.fixed_errors.append({
-                        "id": error_id,
-                        "error": error,
-                        "fixed_at": datetime.now().isoformat(),
-                        "status": "success"
-                    })
-                    print(f"✅ 오류 수정 성공: {error['description']}")
+                started = time.monotonic()
+                fixed = fix_method()
+                self.m_fix_duration.labels(type=error_type).observe(time.monotonic() - started)
+                self.m_fix_runs.labels(type=error_type, status="success" if fixed else "failed").inc()
+                self.fixed_errors.append({
+                    "id": error_id,
+                    "error": {"type": error_type, "description": config["description"], "line": sample,
+                              "rate": {key: alert[key] for key in ("count_1m", "count_15m", "baseline_per_min",
+                                                                   "burst")},
+                              "fingerprints": alert["fingerprints"]},
+                    "fixed_at": datetime.now().isoformat(),
+                    "status": "success" if fixed else "failed"
+                })
+                if fixed:
+                    print(f"✅ 오류 수정 성공: {config['description']}")
                 else:
-                    # 수정 실패 시 기록
-                    self.fixed_errors.append({
-                        "id": error_id,
-                        "error": error,
-                        "fixed_at": datetime.now().isoformat(),
-                        "status": "failed"
-                    })
-                    print(f"❌ 오류 수정 실패: {error['description']}")
+                    print(f"❌ 오류 수정 실패: {config['description']}")
             else:
-                print(f"⚠️  수정 방법이 정의되지 않음: {error['type']}")
+                print(f"⚠️  수정 방법이 정의되지 않음: {error_type}")
         
         # 수정 결과 저장
-        self.save_fixed_errors()
-        print(f"\n📊 수정 결과: {len(self.fixed_errors)}개 오류 처리 완료")
+        if alerts:
+            self.save_fixed_errors()
+            print(f"\n📊 수정 결과: {len(self.fixed_errors)}개 오류 처리 완료")
     
     def run_monitoring(self):
         """지속적인 모니터링 실행"""
         print("🚀 자동 오류 수정 모니터링 시작...")
         print("💡 Ctrl+C로 종료")
         
+        if self.metrics_port:
+            try:
+                server = MetricsServer(self.metrics, port=self.metrics_port).start()
+                print(f"📈 메트릭 엔드포인트: http://127.0.0.1:{server.port}/metrics")
+            except OSError as e:
+                print(f"⚠️  메트릭 엔드포인트 시작 실패 (포트 {self.metrics_port}): {e}")
+        
         try:
             while True:
                 self.auto_fix_errors()
@@ -7,17 +7,25 @@ RSVShop 브라우저 매니저
 import webbrowser
 import time
 import threading
-import subprocess
 import sys
 import os
-from datetime import datetime
+
+from rsvshop import DEFAULT_PORT, ports, proc
+from rsvshop.events import Subscriber
+from rsvshop.log import Logger
 
 class BrowserManager:
     def __init__(self):
-        self.app_url = "http://localhost:4900"
-        self.admin_url = "http://localhost:4900/admin"
+        self.port = DEFAULT_PORT
+        self.app_url = f"http://localhost:{self.port}"
+        self.admin_url = f"http://localhost:{self.port}/admin"
         self.browser_opened = False
-        self.check_interval = 5  # 5초마다 체크
+        # 이벤트 발행자(슈퍼바이저/런처)가 없을 때만 이 간격으로 포트를 확인 (npm run dev 직접 실행 등)
+        self.fallback_interval = 30
+        # 발행자가 있어도 이 간격으로 살아 있는지 확인 (taskkill /f, SIGKILL 등으로 죽으면 stopped가 오지 않는다)
+        self.liveness_interval = 5
+        self.publisher_active = False
+        self.publisher_pid = None
         self.log_file = "logs/browser-manager.log"
         self.lock_file = "logs/browser-open.lock"  # 최근 오픈 기록(중복 오픈 방지)
         # 브라우저 오픈 TTL(분). 기본 240분(4시간). 환경변수로 조정 가능
@@ -26,19 +34,8 @@ class BrowserManager:
         except ValueError:
             self.open_ttl_minutes = 240
         
-        # 로그 디렉토리 생성
-        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-        
-    def log(self, message):
-        """로그 기록"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_message = f"[{timestamp}] {message}"
-        
-        print(log_message)
-        
-        # 로그 파일에 기록
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(log_message + "\n")
+        # 로그 기록 (콘솔 + 파일, 로그 디렉토리 생성 포함)
+        self.log = Logger(self.log_file)
 
     def _now_epoch(self):
         return int(time.time())
@@ -80,16 +77,7 @@ class BrowserManager:
     
     def is_port_in_use(self, port):
         """포트 사용 여부 확인"""
-        try:
-            result = subprocess.run(
-                ["netstat", "-ano"], 
-                capture_output=True, 
-                text=True, 
-                shell=True
-            )
-            return f":{port}" in result.stdout
-        except:
-            return False
+        return ports.port_in_use(port)
     
     def open_browser(self, url):
         """브라우저 열기"""
@@ -109,39 +97,76 @@ class BrowserManager:
         """관리자 브라우저 열기"""
         return self.open_browser(self.admin_url)
     
+    def open_once(self):
+        """서버가 준비됐을 때 브라우저를 한 번만 열기"""
+        if self.browser_opened:
+            return
+        # 최근에 이미 열었으면 중복으로 열지 않음
+        if self.has_recent_open():
+            self.log("✅ 서버 실행 중(최근 이미 브라우저를 열었으므로 새로 열지 않습니다).")
+            self.browser_opened = True  # 현재 세션에선 다시 열지 않도록 표시
+            return
+        self.log("🚀 서버가 실행 중입니다. 브라우저를 한 번만 엽니다...")
+        if self.open_app_browser():
+            self.browser_opened = True
+            self.mark_opened()
+            # 2초 후 관리자 페이지도 열기
+            time.sleep(2)
+            self.open_admin_browser()
+
     def check_and_open_browser(self):
         """포트 확인 후 브라우저 열기"""
-        if self.is_port_in_use(4900):
-            if not self.browser_opened:
-                # 최근에 이미 열었으면 중복으로 열지 않음
-                if self.has_recent_open():
-                    self.log("✅ 서버 실행 중(최근 이미 브라우저를 열었으므로 새로 열지 않습니다).")
-                    self.browser_opened = True  # 현재 세션에선 다시 열지 않도록 표시
-                    return
-                self.log("🚀 서버가 실행 중입니다. 브라우저를 한 번만 엽니다...")
-                if self.open_app_browser():
-                    self.browser_opened = True
-                    self.mark_opened()
-                    # 2초 후 관리자 페이지도 열기
-                    time.sleep(2)
-                    self.open_admin_browser()
-        else:
+        if self.is_port_in_use(self.port):
+            self.open_once()
+        elif self.browser_opened:
+            self.log("📴 서버가 중단되었습니다.")
+            self.browser_opened = False
+
+    def on_event(self, event):
+        """슈퍼바이저 라이프사이클 이벤트 처리"""
+        name = event["event"]
+        self.publisher_active = not (name == "stopped")
+        self.publisher_pid = event.get("supervisor") if self.publisher_active else None
+        if name == "ready":
+            self.open_once()
+        elif name in ("crashed", "stopped"):
             if self.browser_opened:
                 self.log("📴 서버가 중단되었습니다.")
                 self.browser_opened = False
+        elif name == "restarting":
+            self.log(f"🔄 서버 재시작 대기 중 ({event.get('reason')})")
     
+    def check_publisher(self):
+        """발행자가 stopped 없이 강제 종료됐으면 포트 확인 방식으로 돌아간다"""
+        if self.publisher_active and not proc.pid_alive(self.publisher_pid):
+            self.log(f"⚠️ 이벤트 발행자(PID {self.publisher_pid})가 종료되었습니다. 포트 확인으로 돌아갑니다.")
+            self.publisher_active = False
+            self.publisher_pid = None
+
     def start_monitoring(self):
-        """브라우저 모니터링 시작"""
+        """브라우저 모니터링 시작
+
+        슈퍼바이저/런처 이벤트를 구독하고, 발행자가 살아 있는 동안은 liveness_interval초마다 PID만 확인한다.
+        발행자가 없으면(시작 전, stopped 이후, 강제 종료) fallback_interval초마다 포트를 확인한다.
+        """
         self.log("🛡️ 브라우저 매니저를 시작합니다...")
         self.log(f"📍 앱 URL: {self.app_url}")
         self.log(f"📍 관리자 URL: {self.admin_url}")
-        self.log("💡 서버가 시작되면 자동으로 브라우저가 열립니다.")
+        self.log("💡 서버가 준비되면(ready 이벤트) 바로 브라우저가 열립니다.")
         self.log("💡 Ctrl+C로 종료할 수 있습니다.")
         
         try:
-            while True:
-                self.check_and_open_browser()
-                time.sleep(self.check_interval)
+            with Subscriber(ports=[self.port]) as subscriber:
+                for event in subscriber.snapshot():
+                    self.on_event(event)
+                while True:
+                    self.check_publisher()
+                    if not self.publisher_active:
+                        # 이벤트를 발행하지 않는 방식으로 떠 있거나 뜰 서버
+                        self.check_and_open_browser()
+                    event = subscriber.recv(self.liveness_interval if self.publisher_active else self.fallback_interval)
+                    if event is not None:
+                        self.on_event(event)
         except KeyboardInterrupt:
             self.log("\n🛑 브라우저 매니저를 종료합니다...")
     
@@ -154,11 +179,11 @@ class BrowserManager:
     
     def show_status(self):
         """상태 확인"""
-        port_status = "🔴 사용 중" if self.is_port_in_use(4900) else "🟢 사용 가능"
+        port_status = "🔴 사용 중" if self.is_port_in_use(self.port) else "🟢 사용 가능"
         browser_status = "🟢 열림" if self.browser_opened else "🔴 닫힘"
         
         self.log("📊 상태 확인:")
-        self.log(f"  포트 4900: {port_status}")
+        self.log(f"  포트 {self.port}: {port_status}")
         self.log(f"  브라우저: {browser_status}")
         self.log(f"  앱 URL: {self.app_url}")
         self.log(f"  관리자 URL: {self.admin_url}")
@@ -179,7 +204,8 @@ def main():
 특징:
   ✅ 서버 시작 시 브라우저 1회만 자동 오픈(최근 열었으면 생략)
   ✅ taskkill /f /im node.exe에 영향받지 않음
-  ✅ 포트 모니터링 (5초마다)
+  ✅ 서버 매니저/멀티 앱 슈퍼바이저/런처의 ready 이벤트를 구독해 즉시 오픈 (발행자가 있으면 폴링 없음)
+  ✅ 발행자가 없으면(npm run dev 직접 실행 등) 30초마다 포트 확인
   ✅ 앱 + 관리자 페이지 자동 열기(중복 방지)
   ✅ Python 기반 (Node.js 독립적)
   ⚙️ 환경변수 BROWSER_OPEN_TTL_MINUTES로 중복 방지 TTL(분) 설정 가능(기본 240)
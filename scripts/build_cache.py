@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+RSVShop 프로덕션 빌드 캐시
+소스(app/, prisma/, public/), lockfile, 설정 파일의 내용 해시가 바뀌었을 때만 `npm run build`
+(prisma generate && next build)를 실행하고, 빌드 결과(.next, 생성된 Prisma 클라이언트)를
+.build-cache/artifacts/<해시>/에 보관한다. 해시가 같으면 빌드 없이 바로 활성화하고,
+rollback으로 이전 빌드를 즉시 되살린다. 롤백한 빌드는 index.json에 고정(pinned)되어, 명시적인 build나
+소스 변경 전까지는 슈퍼바이저 (재)시작이 다시 최신 보관본으로 바꾸지 않는다. 슈퍼바이저는
+production_command()로 `next start` (output: 'standalone'이면 .next/standalone/server.js)를 실행한다.
+
+사용법:
+  python scripts/build_cache.py status
+  python scripts/build_cache.py build [--force]
+  python scripts/build_cache.py list
+  python scripts/build_cache.py rollback [해시 앞부분]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+HASH_DIRS = ["app", "prisma", "public"]
+HASH_FILES = ["package.json", "package-lock.json", "next.config.js", "tsconfig.json", "postcss.config.js",
+              "tailwind.config.js", "panda.config.ts", "middleware.ts", ".env", ".env.production",
+              ".env.local", ".env.production.local"]
+SKIP_DIRS = {"node_modules", ".next", ".git", "__pycache__"}
+PRISMA_CLIENT = os.path.join("node_modules", ".prisma", "client")
+MARKER = ".rsvshop-build"
+
+
+class BuildError(Exception):
+    pass
+
+
+def _copy_tree(src, dst, ignore=None):
+    """트리 복사. 하드링크는 쓰지 않는다: next build/ISR이 .next 파일을 제자리에서 덮어써 보관본까지 바뀐다"""
+    shutil.copytree(src, dst, symlinks=True, ignore=ignore)
+
+
+def _tree_bytes(path):
+    total = 0
+    for current, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(current, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _swap_dir(new, target):
+    """new를 target 자리로 옮긴다 (기존 target은 지움)"""
+    old = target + ".old"
+    if os.path.exists(old):
+        shutil.rmtree(old)
+    if os.path.exists(target):
+        os.rename(target, old)
+    os.rename(new, target)
+    if os.path.exists(old):
+        shutil.rmtree(old, ignore_errors=True)
+
+
+class BuildCache:
+    def __init__(self, root=".", cache_dir=None, keep=None, log=print):
+        self.root = os.path.abspath(root)
+        self.cache_dir = cache_dir or os.path.join(self.root, ".build-cache")
+        self.artifacts_dir = os.path.join(self.cache_dir, "artifacts")
+        self.index_file = os.path.join(self.cache_dir, "index.json")
+        self.stat_cache_file = os.path.join(self.cache_dir, "hash-cache.json")
+        self.next_dir = os.path.join(self.root, ".next")
+        self.keep = keep or int(os.environ.get("RSVSHOP_BUILD_KEEP", "3"))
+        self.log = log
+
+    # 해시 ---------------------------------------------------------------
+
+    def _hash_inputs(self):
+        for name in HASH_FILES:
+            path = os.path.join(self.root, name)
+            if os.path.isfile(path):
+                yield name, path
+        for directory in HASH_DIRS:
+            for current, dirs, files in os.walk(os.path.join(self.root, directory)):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+                for name in sorted(files):
+                    path = os.path.join(current, name)
+                    yield os.path.relpath(path, self.root).replace(os.sep, "/"), path
+
+    def source_hash(self):
+        """입력 파일 내용 + NEXT_PUBLIC_* 환경 변수의 해시. (크기, mtime)이 같은 파일은 이전 해시 재사용"""
+        try:
+            with open(self.stat_cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        fresh = {}
+        digest = hashlib.sha256()
+        for rel, path in self._hash_inputs():
+            stat = os.stat(path)
+            entry = cached.get(rel)
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                file_hash = entry[2]
+            else:
+                h = hashlib.sha256()
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+                file_hash = h.hexdigest()
+            fresh[rel] = [stat.st_size, stat.st_mtime_ns, file_hash]
+            digest.update(f"{rel}\0{file_hash}\n".encode("utf-8"))
+        for key in sorted(os.environ):
+            if key.startswith("NEXT_PUBLIC_"):
+                digest.update(f"env:{key}={os.environ[key]}\n".encode("utf-8"))
+        if fresh != cached:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.stat_cache_file, "w", encoding="utf-8") as f:
+                json.dump(fresh, f)
+        return digest.hexdigest()[:16]
+
+    # 인덱스 -------------------------------------------------------------
+
+    def load_index(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"active": None, "builds": []}
+
+    def save_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp = self.index_file + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(temp, self.index_file)
+
+    def find(self, prefix):
+        matches = [b for b in self.load_index()["builds"] if b["hash"].startswith(prefix)]
+        if len(matches) != 1:
+            raise BuildError(f"빌드를 찾을 수 없거나 여러 개가 일치합니다: {prefix}")
+        return matches[0]
+
+    def active_hash(self):
+        """현재 .next에 들어 있는 빌드의 해시 (빌드가 없거나 캐시 밖에서 만든 것이면 None)"""
+        try:
+            with open(os.path.join(self.next_dir, MARKER), "r", encoding="utf-8") as f:
+                build_hash = f.read().strip()
+        except OSError:
+            return None
+        return build_hash if os.path.exists(os.path.join(self.next_dir, "BUILD_ID")) else None
+
+    # 빌드/보관/활성화 ---------------------------------------------------
+
+    def _lock(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        handle = open(os.path.join(self.cache_dir, "lock"), "w")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)  # 여러 슈퍼바이저가 동시에 빌드하지 않도록
+        return handle
+
+    def _run_build(self, build_hash):
+        os.makedirs(os.path.join(self.root, "logs"), exist_ok=True)
+        log_path = os.path.join(self.root, "logs", f"build-{build_hash}.log")
+        command = ["cmd", "/c", "npm", "run", "build"] if os.name == "nt" else ["npm", "run", "build"]
+        self.log(f"🏗️ 소스가 바뀌어 프로덕션 빌드를 시작합니다 ({build_hash}, 로그: {log_path})")
+        started = time.monotonic()
+        with open(log_path, "w", encoding="utf-8") as output:
+            result = subprocess.run(command, cwd=self.root, stdout=output, stderr=subprocess.STDOUT,
+                                    env={**os.environ, "NODE_ENV": "production"})
+        elapsed = time.monotonic() - started
+        if result.returncode != 0 or not os.path.exists(os.path.join(self.next_dir, "BUILD_ID")):
+            with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                tail = f.readlines()[-20:]
+            for line in tail:
+                self.log(f"   {line.rstrip()}")
+            raise BuildError(f"빌드 실패 (종료 코드 {result.returncode}, {elapsed:.0f}초)")
+        self.log(f"✅ 빌드 완료 ({elapsed:.0f}초)")
+        return elapsed
+
+    def _store(self, build_hash, build_seconds):
+        """방금 만든 .next(빌드 캐시 제외)와 Prisma 클라이언트를 아티팩트로 보관"""
+        with open(os.path.join(self.next_dir, MARKER), "w", encoding="utf-8") as f:
+            f.write(build_hash)
+        standalone = os.path.join(self.next_dir, "standalone")
+        if os.path.isdir(standalone):
+            # standalone 서버는 정적 파일을 직접 들고 있어야 한다 (Next.js 문서의 배포 절차)
+            for src, dst in ((os.path.join(self.next_dir, "static"), os.path.join(standalone, ".next", "static")),
+                             (os.path.join(self.root, "public"), os.path.join(standalone, "public"))):
+                if os.path.isdir(src) and not os.path.exists(dst):
+                    _copy_tree(src, dst)
+        target = os.path.join(self.artifacts_dir, build_hash)
+        temp = target + ".tmp"
+        if os.path.exists(temp):
+            shutil.rmtree(temp)
+        os.makedirs(temp)
+        _copy_tree(self.next_dir, os.path.join(temp, "next"),
+                   ignore=lambda current, names: ["cache"] if current == self.next_dir else [])
+        prisma_client = os.path.join(self.root, PRISMA_CLIENT)
+        if os.path.isdir(prisma_client):
+            _copy_tree(prisma_client, os.path.join(temp, "prisma-client"))
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.rename(temp, target)
+
+        index = self.load_index()
+        index["builds"] = [b for b in index["builds"] if b["hash"] != build_hash]
+        index["builds"].append({
+            "hash": build_hash,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "build_seconds": round(build_seconds, 1),
+            "bytes": _tree_bytes(target),
+            "commit": _git_commit(self.root),
+            "standalone": os.path.isdir(standalone),
+        })
+        index["active"] = build_hash
+        self.save_index(index)
+        self.prune()
+
+    def activate(self, build_hash):
+        """보관된 빌드를 .next에 되살린다. .next/cache(webpack 캐시)는 유지. 실행 중인 서버는 재시작 필요"""
+        source = os.path.join(self.artifacts_dir, build_hash)
+        if not os.path.isdir(source):
+            raise BuildError(f"보관된 빌드가 없습니다: {build_hash}")
+        staging = self.next_dir + ".activate"
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+        _copy_tree(os.path.join(source, "next"), staging)
+        cache = os.path.join(self.next_dir, "cache")
+        if os.path.isdir(cache):
+            os.rename(cache, os.path.join(staging, "cache"))
+        _swap_dir(staging, self.next_dir)
+        if os.path.isdir(os.path.join(source, "prisma-client")):
+            client = os.path.join(self.root, PRISMA_CLIENT)
+            os.makedirs(os.path.dirname(client), exist_ok=True)
+            _copy_tree(os.path.join(source, "prisma-client"), client + ".activate")
+            _swap_dir(client + ".activate", client)
+        index = self.load_index()
+        index["active"] = build_hash
+        for build in index["builds"]:
+            if build["hash"] == build_hash:
+                build["last_used"] = datetime.now().isoformat(timespec="seconds")
+        self.save_index(index)
+        self.log(f"📦 빌드 {build_hash} 활성화")
+
+    def prune(self):
+        """최근 keep개와 활성 빌드만 남긴다"""
+        index = self.load_index()
+        builds = sorted(index["builds"], key=lambda b: b.get("last_used") or b["created"], reverse=True)
+        pinned = (index.get("pinned") or {}).get("hash")
+        kept = [b for i, b in enumerate(builds) if i < self.keep or b["hash"] in (index["active"], pinned)]
+        for build in builds:
+            if build not in kept:
+                shutil.rmtree(os.path.join(self.artifacts_dir, build["hash"]), ignore_errors=True)
+                self.log(f"🧹 오래된 빌드 삭제: {build['hash']}")
+        index["builds"] = sorted(kept, key=lambda b: b["created"])
+        self.save_index(index)
+
+    def ensure_build(self, force=False, unpin=False):
+        """현재 소스에 맞는 빌드가 .next에 있도록 한다. 반환: 해시
+
+        해시가 같으면 그대로, 보관된 빌드가 있으면 활성화만, 없으면 빌드 후 보관.
+        빌드가 실패하면 직전 빌드를 되살리고 BuildError를 던진다.
+        rollback으로 고정된 빌드가 있으면 소스가 그때와 같은 동안 그 빌드를 유지한다 (unpin/force면 해제).
+        """
+        lock = self._lock()
+        try:
+            started = time.perf_counter()
+            build_hash = self.source_hash()
+            hash_ms = (time.perf_counter() - started) * 1000
+            active = self.active_hash()
+            index = self.load_index()
+            pinned = index.get("pinned")
+            if pinned:
+                if (not force and not unpin and pinned.get("source") == build_hash
+                        and os.path.isdir(os.path.join(self.artifacts_dir, pinned["hash"]))):
+                    if active != pinned["hash"]:
+                        self.activate(pinned["hash"])
+                    self.log(f"📌 롤백한 빌드 {pinned['hash']} 유지 (소스가 바뀌거나 build를 실행하면 해제)")
+                    return pinned["hash"]
+                index.pop("pinned")
+                self.save_index(index)
+                self.log(f"📌 빌드 {pinned['hash']} 고정 해제")
+            if not force and active == build_hash:
+                self.log(f"⚡ 소스 변경 없음 - 기존 빌드 사용 ({build_hash}, 해시 {hash_ms:.0f}ms)")
+                return build_hash
+            if not force and os.path.isdir(os.path.join(self.artifacts_dir, build_hash)):
+                self.activate(build_hash)
+                return build_hash
+            previous = self.load_index()["active"]
+            try:
+                elapsed = self._run_build(build_hash)
+            except BuildError:
+                if previous and os.path.isdir(os.path.join(self.artifacts_dir, previous)):
+                    self.log(f"↩️ 직전 빌드 {previous}로 되돌립니다")
+                    self.activate(previous)
+                raise
+            self._store(build_hash, elapsed)
+            return build_hash
+        finally:
+            lock.close()
+
+    def rollback(self, prefix=None):
+        """지정한 빌드 또는 현재 바로 전에 만든 빌드로 되돌린다"""
+        index = self.load_index()
+        if prefix:
+            target = self.find(prefix)["hash"]
+        else:
+            hashes = [b["hash"] for b in sorted(index["builds"], key=lambda b: b["created"])]
+            if index["active"] not in hashes or hashes.index(index["active"]) == 0:
+                raise BuildError("되돌릴 이전 빌드가 없습니다")
+            target = hashes[hashes.index(index["active"]) - 1]
+        lock = self._lock()
+        try:
+            self.activate(target)
+            # 다음 (재)시작의 ensure_build가 최신 보관본을 다시 활성화하지 않도록 고정
+            index = self.load_index()
+            index["pinned"] = {"hash": target, "source": self.source_hash(),
+                               "at": datetime.now().isoformat(timespec="seconds")}
+            self.save_index(index)
+        finally:
+            lock.close()
+        return target
+
+    def start_command(self, port, host="0.0.0.0"):
+        """(argv, env): standalone 빌드면 node server.js, 아니면 next start"""
+        env = {**os.environ, "NODE_ENV": "production", "PORT": str(port), "HOSTNAME": host}
+        server = os.path.join(self.next_dir, "standalone", "server.js")
+        if os.path.exists(server):
+            return ["node", server], env
+        command = ["npx", "next", "start", "-p", str(port), "-H", host]
+        return (["cmd", "/c"] + command if os.name == "nt" else command), env
+
+
+def _git_commit(root):
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True, text=True,
+                                timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def production_mode():
+    return os.environ.get("RSVSHOP_MODE", "").lower() in ("production", "prod")
+
+
+def production_command(port, root=".", log=print):
+    """필요하면 빌드한 뒤 프로덕션 서버 실행 명령 (argv, env). 빌드도 보관본도 없으면 BuildError"""
+    cache = BuildCache(root, log=log)
+    try:
+        cache.ensure_build()
+    except BuildError as e:
+        if cache.active_hash() is None:
+            raise
+        log(f"⚠️ {e} - 기존 빌드로 시작합니다")
+    return cache.start_command(port)
+
+
+def print_builds(cache):
+    index = cache.load_index()
+    if not index["builds"]:
+        print("보관된 빌드가 없습니다.")
+        return
+    print(f"📦 보관된 빌드 (최대 {cache.keep}개):")
+    pinned = (index.get("pinned") or {}).get("hash")
+    for build in index["builds"]:
+        marker = "▶" if build["hash"] == index["active"] else " "
+        print(f"  {marker} {build['hash']}  {build['created']}  빌드 {build['build_seconds']}초  "
+              f"{build['bytes'] / 1024 / 1024:.1f}MB  커밋 {build.get('commit') or '-'}"
+              f"{'  standalone' if build.get('standalone') else ''}{'  📌 고정' if build['hash'] == pinned else ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 프로덕션 빌드 캐시")
+    parser.add_argument("--root", default=".", help="프로젝트 루트")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("status", help="현재 소스 해시와 활성 빌드")
+    build = sub.add_parser("build", help="소스가 바뀌었으면 빌드 (보관본이 있으면 활성화만)")
+    build.add_argument("--force", action="store_true", help="해시와 무관하게 다시 빌드")
+    sub.add_parser("list", help="보관된 빌드 목록")
+    back = sub.add_parser("rollback", help="이전 빌드로 되돌리기")
+    back.add_argument("hash", nargs="?", help="해시 앞부분 (기본: 활성 빌드 바로 전)")
+    args = parser.parse_args(argv)
+
+    cache = BuildCache(args.root)
+    try:
+        if args.command == "status":
+            started = time.perf_counter()
+            build_hash = cache.source_hash()
+            elapsed = (time.perf_counter() - started) * 1000
+            active = cache.active_hash()
+            pinned = cache.load_index().get("pinned")
+            if pinned and pinned["hash"] == active and pinned.get("source") == build_hash:
+                state = "롤백 고정"
+            elif active == build_hash:
+                state = "최신"
+            elif os.path.isdir(os.path.join(cache.artifacts_dir, build_hash)):
+                state = "보관본 활성화 필요"
+            else:
+                state = "빌드 필요"
+            print(f"🔑 소스 해시: {build_hash} ({elapsed:.0f}ms)")
+            print(f"📦 활성 빌드: {active or '없음'} ({state})")
+            if pinned:
+                print(f"📌 롤백 고정: {pinned['hash']} (소스 {pinned['source']}가 바뀌거나 build를 실행하면 해제)")
+        elif args.command == "build":
+            cache.ensure_build(force=args.force, unpin=True)
+        elif args.command == "list":
+            print_builds(cache)
+        elif args.command == "rollback":
+            cache.rollback(args.hash)
+            print("🔄 실행 중인 서버를 재시작해야 적용됩니다.")
+        else:
+            parser.print_help()
+    except BuildError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+RSVShop CPU 프로파일 요약기
+V8 .cpuprofile(JSON)을 함수/파일별 self-time/total-time 순위와 flame graph용 folded stack으로 변환
+
+사용법:
+  python scripts/cpu_profile.py <file.cpuprofile> [top_n]
+"""
+
+import json
+import os
+import sys
+
+IDLE_FRAMES = {"(idle)", "(program)", "(garbage collector)"}
+
+
+def load_profile(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _short_url(url):
+    if not url:
+        return ""
+    url = url.replace("file://", "")
+    for marker in ("/node_modules/", "/.next/", "/app/", "/lib/"):
+        index = url.find(marker)
+        if index >= 0:
+            return url[index + 1:]
+    return os.path.basename(url)
+
+
+def frame_label(call_frame):
+    """folded stack/순위표에 쓰는 함수 표기: name (file:line)"""
+    name = call_frame.get("functionName") or "(anonymous)"
+    url = _short_url(call_frame.get("url", ""))
+    if not url:
+        return name
+    return f"{name} ({url}:{call_frame.get('lineNumber', -1) + 1})"
+
+
+def sample_durations(profile):
+    """샘플별 지속 시간(µs). timeDeltas[i+1]이 샘플 i의 길이, 마지막 샘플은 평균으로 보정"""
+    samples = profile.get("samples") or []
+    deltas = profile.get("timeDeltas") or []
+    if not samples:
+        return []
+    if len(deltas) != len(samples):
+        total = profile.get("endTime", 0) - profile.get("startTime", 0)
+        return [total / len(samples)] * len(samples)
+    durations = [max(0, d) for d in deltas[1:]]
+    durations.append(sum(durations) / len(durations) if durations else 0)
+    return durations
+
+
+def summarize(profile):
+    """노드별 self time을 구한 뒤 함수/파일 단위로 self·total time 집계
+
+    total time은 재귀 호출이 있어도 한 스택에서 같은 함수를 한 번만 센다.
+    """
+    nodes = {node["id"]: node for node in profile["nodes"]}
+    parent = {}
+    for node in profile["nodes"]:
+        for child in node.get("children", []):
+            parent[child] = node["id"]
+
+    self_time = {}
+    for node_id, duration in zip(profile.get("samples") or [], sample_durations(profile)):
+        self_time[node_id] = self_time.get(node_id, 0) + duration
+
+    functions = {}
+    files = {}
+    folded = {}
+    total_time = 0.0
+    for node_id, duration in self_time.items():
+        total_time += duration
+        stack = []
+        current = node_id
+        while current is not None:
+            stack.append(nodes[current])
+            current = parent.get(current)
+        stack.reverse()
+        labels = [frame_label(n["callFrame"]) for n in stack if n["callFrame"].get("functionName") != "(root)"]
+        if labels:
+            key = ";".join(labels)
+            folded[key] = folded.get(key, 0) + duration
+
+        leaf = nodes[node_id]["callFrame"]
+        leaf_label = frame_label(leaf)
+        functions.setdefault(leaf_label, [0.0, 0.0])[0] += duration
+        # idle/program/GC는 URL이 없어 파일 순위에서 "(native)"를 부풀리므로 함수 표에만 남긴다
+        idle = leaf_label in IDLE_FRAMES
+        if not idle:
+            leaf_file = _short_url(leaf.get("url", "")) or "(native)"
+            files.setdefault(leaf_file, [0.0, 0.0])[0] += duration
+
+        seen_functions = set()
+        seen_files = set()
+        for n in stack:
+            frame = n["callFrame"]
+            if frame.get("functionName") == "(root)":
+                continue
+            label = frame_label(frame)
+            if label not in seen_functions:
+                seen_functions.add(label)
+                functions.setdefault(label, [0.0, 0.0])[1] += duration
+            file_key = _short_url(frame.get("url", "")) or "(native)"
+            if not idle and file_key not in seen_files:
+                seen_files.add(file_key)
+                files.setdefault(file_key, [0.0, 0.0])[1] += duration
+
+    return {
+        "total_us": total_time,
+        "functions": functions,
+        "files": files,
+        "folded": folded,
+    }
+
+
+def ranking(table, total_us, key="self", top_n=20, include_idle=False):
+    """[(label, self_us, total_us, self_pct, total_pct), ...] self 또는 total 기준 내림차순"""
+    index = 0 if key == "self" else 1
+    rows = []
+    for label, (self_us, sub_total) in table.items():
+        if not include_idle and label in IDLE_FRAMES:
+            continue
+        rows.append((label, self_us, sub_total,
+                     100 * self_us / total_us if total_us else 0,
+                     100 * sub_total / total_us if total_us else 0))
+    rows.sort(key=lambda row: row[1 + index], reverse=True)
+    return rows[:top_n]
+
+
+def write_folded(summary, path):
+    """Brendan Gregg flamegraph.pl / speedscope 호환 folded stack (값: µs)"""
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, duration in sorted(summary["folded"].items()):
+            if duration >= 1:
+                f.write(f"{stack} {int(duration)}\n")
+    return path
+
+
+def print_summary(summary, top_n=20):
+    total_ms = summary["total_us"] / 1000
+    idle_ms = sum(summary["functions"].get(label, (0, 0))[0] for label in IDLE_FRAMES) / 1000
+    print(f"🔥 CPU 프로파일 요약: 총 {total_ms:.0f}ms (idle/program/GC {idle_ms:.0f}ms)")
+    for title, table, key in (
+        ("함수별 self time", summary["functions"], "self"),
+        ("함수별 total time", summary["functions"], "total"),
+        ("파일별 self time", summary["files"], "self"),
+    ):
+        print(f"\n  {title} TOP {top_n}")
+        print(f"    {'self ms':>9} {'self%':>6} {'total ms':>9} {'total%':>6}  이름")
+        for label, self_us, sub_total, self_pct, total_pct in ranking(table, summary["total_us"], key, top_n):
+            print(f"    {self_us / 1000:>9.1f} {self_pct:>5.1f}% {sub_total / 1000:>9.1f} {total_pct:>5.1f}%  {label}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("사용법: python scripts/cpu_profile.py <file.cpuprofile> [top_n]")
+        return
+    path = sys.argv[1]
+    top_n = int(sys.argv[2]) if len(sys.argv) >= 3 else 20
+    summary = summarize(load_profile(path))
+    print_summary(summary, top_n)
+    folded_path = write_folded(summary, os.path.splitext(path)[0] + ".folded")
+    print(f"\n📄 folded stack: {folded_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+RSVShop 오류율 감지기
+카테고리/지문(fingerprint)별 오류 수를 1초·1분·15분 단위 링 버퍼에 누적해 비율과 기준선 대비 버스트 점수를
+계산하고, 임계값을 넘은 카테고리만 수정 단계로 넘긴다 (히스테리시스로 반복 발동 방지).
+이벤트당 O(1), 추적 키 수가 제한되어 메모리는 일정하다.
+"""
+
+import hashlib
+import math
+import re
+import time
+from collections import OrderedDict
+
+# 카테고리별 발동/해제 조건
+#   rate_1m: 최근 1분 건수가 이 이상이고 burst: 기준선 대비 점수가 이 이상이면 발동 (count_15m은 지속 오류용 대안 조건)
+#   clear_rate_1m 이하가 clear_after초 이어지면 해제
+DEFAULT_THRESHOLDS = {
+    "prisma_connection": {"rate_1m": 5, "burst": 3.0, "count_15m": 30, "clear_rate_1m": 1, "clear_after": 300},
+    "build_error": {"rate_1m": 2, "burst": 1.0, "count_15m": 5, "clear_rate_1m": 0, "clear_after": 120},
+    "api_error": {"rate_1m": 10, "burst": 4.0, "count_15m": 60, "clear_rate_1m": 2, "clear_after": 300},
+    "validation_error": {"rate_1m": 20, "burst": 4.0, "count_15m": 120, "clear_rate_1m": 5, "clear_after": 300},
+    "memory_error": {"rate_1m": 1, "burst": 0.0, "count_15m": 1, "clear_rate_1m": 0, "clear_after": 600},
+}
+FALLBACK_THRESHOLD = {"rate_1m": 10, "burst": 4.0, "count_15m": 60, "clear_rate_1m": 2, "clear_after": 300}
+
+FINGERPRINT_RES = [
+    (re.compile(r"https?://\S+"), "<url>"),
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{16,}\b", re.IGNORECASE), "<hex>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ][\d:.]+Z?"), "<ts>"),
+    (re.compile(r"\d+"), "<n>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint(message):
+    """숫자/URL/ID/문자열 리터럴을 지운 메시지의 짧은 해시"""
+    text = message[:500]
+    for pattern, replacement in FINGERPRINT_RES:
+        text = pattern.sub(replacement, text)
+    return hashlib.blake2b(text.strip().encode("utf-8"), digest_size=6).hexdigest(), text.strip()[:120]
+
+
+class Ring:
+    """width초 버킷 size개짜리 원형 버퍼. 이벤트 추가는 O(1) (지나간 버킷 비우기는 상환 O(1))"""
+
+    __slots__ = ("width", "size", "counts", "head", "first", "total")
+
+    def __init__(self, width, size):
+        self.width = width
+        self.size = size
+        self.counts = [0] * size
+        self.head = None
+        self.first = None
+        self.total = 0
+
+    def advance(self, bucket):
+        if self.head is None:
+            self.head = self.first = bucket
+            return
+        if bucket <= self.head:
+            return
+        for step in range(1, min(bucket - self.head, self.size) + 1):
+            index = (self.head + step) % self.size
+            self.total -= self.counts[index]
+            self.counts[index] = 0
+        self.head = bucket
+
+    def add(self, ts, count=1):
+        bucket = int(ts // self.width)
+        self.advance(bucket)
+        if self.head - bucket >= self.size:
+            return False  # 창 밖의 오래된 이벤트
+        self.counts[bucket % self.size] += count
+        self.total += count
+        return True
+
+    def recent(self, now, buckets):
+        """현재 버킷을 포함한 최근 buckets개의 합"""
+        self.advance(int(now // self.width))
+        if self.head is None:
+            return 0
+        return sum(self.counts[(self.head - i) % self.size] for i in range(min(buckets, self.size)))
+
+    def history(self, now):
+        """(현재 버킷을 뺀 합, 채워진 과거 버킷 수)"""
+        self.advance(int(now // self.width))
+        if self.head is None:
+            return 0, 0
+        filled = min(self.head - self.first, self.size - 1)
+        return self.total - self.counts[self.head % self.size], filled
+
+
+class WindowCounts:
+    """1초×60(최근 1분), 1분×60(최근 15분/1시간), 15분×96(24시간 기준선)"""
+
+    __slots__ = ("seconds", "minutes", "quarters", "last_seen")
+
+    def __init__(self):
+        self.seconds = Ring(1, 60)
+        self.minutes = Ring(60, 60)
+        self.quarters = Ring(900, 96)
+        self.last_seen = 0.0
+
+    def add(self, ts):
+        self.last_seen = max(self.last_seen, ts)
+        self.quarters.add(ts)
+        self.minutes.add(ts)
+        self.seconds.add(ts)
+
+    def snapshot(self, now):
+        count_1s = self.seconds.recent(now, 1)
+        count_1m = self.seconds.recent(now, 60)
+        count_15m = self.minutes.recent(now, 15)
+        past, filled = self.quarters.history(now)
+        # 지난 24시간(현재 15분 제외)의 분당 평균. 이력이 없으면 0
+        baseline = past / (filled * 15) if filled else 0.0
+        burst = (count_1m - baseline) / math.sqrt(baseline + 1)
+        return {"count_1s": count_1s, "count_1m": count_1m, "count_15m": count_15m,
+                "rate_1m": count_1m / 60, "rate_15m": count_15m / 900,
+                "baseline_per_min": round(baseline, 3), "burst": round(burst, 2)}
+
+
+class CategoryState:
+    __slots__ = ("firing", "fired_at", "quiet_since")
+
+    def __init__(self):
+        self.firing = False
+        self.fired_at = None
+        self.quiet_since = None
+
+
+class ErrorRateDetector:
+    """observe()로 이벤트를 넣고 evaluate()로 새로 발동한 카테고리 목록을 받는다"""
+
+    def __init__(self, thresholds=None, max_fingerprints=512, registry=None, clock=time.time):
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.max_fingerprints = max_fingerprints
+        self.clock = clock
+        self.categories = {}
+        self.states = {}
+        self.fingerprints = OrderedDict()  # (category, fp) -> (WindowCounts, 예시 메시지), LRU
+        self.dropped = 0
+        self.last_status = {}
+        self.registry = registry
+        if registry is not None:
+            self.m_rate = registry.gauge("rsvshop_error_rate_per_minute", "카테고리별 최근 1분 오류 수", ["category"])
+            self.m_burst = registry.gauge("rsvshop_error_burst_score", "카테고리별 기준선 대비 버스트 점수",
+                                          ["category"])
+            self.m_firing = registry.gauge("rsvshop_error_category_firing", "임계값 초과 상태 (1=발동)", ["category"])
+
+    def _category(self, category):
+        counts = self.categories.get(category)
+        if counts is None:
+            counts = self.categories[category] = WindowCounts()
+            self.states[category] = CategoryState()
+            if self.registry is not None:
+                # 메트릭 스레드는 링을 건드리지 않고 마지막 evaluate() 결과만 읽는다
+                self.m_rate.labels(category=category).set_function(
+                    lambda: self.last_status.get(category, {}).get("count_1m"))
+                self.m_burst.labels(category=category).set_function(
+                    lambda: self.last_status.get(category, {}).get("burst"))
+                self.m_firing.labels(category=category).set_function(lambda: int(self.states[category].firing))
+        return counts
+
+    def observe(self, category, message="", ts=None):
+        now = self.clock()
+        ts = min(ts or now, now)
+        self._category(category).add(ts)
+        fp, sample = fingerprint(message)
+        key = (category, fp)
+        entry = self.fingerprints.get(key)
+        if entry is None:
+            if len(self.fingerprints) >= self.max_fingerprints:
+                self.fingerprints.popitem(last=False)
+                self.dropped += 1
+            entry = self.fingerprints[key] = (WindowCounts(), sample)
+        else:
+            self.fingerprints.move_to_end(key)
+        entry[0].add(ts)
+
+    def top_fingerprints(self, category, now=None, limit=3):
+        now = now or self.clock()
+        rows = []
+        for (cat, fp), (counts, sample) in self.fingerprints.items():
+            if cat == category:
+                count = counts.seconds.recent(now, 60) or counts.minutes.recent(now, 15)
+                if count:
+                    rows.append({"fingerprint": fp, "sample": sample, "count": count})
+        rows.sort(key=lambda row: row["count"], reverse=True)
+        return rows[:limit]
+
+    def evaluate(self, now=None):
+        """임계값을 새로 넘은 카테고리의 [{category, ...스냅샷, fingerprints}] (발동 중인 것은 해제 전까지 제외)"""
+        now = now or self.clock()
+        fired = []
+        status = {}
+        for category, counts in self.categories.items():
+            snap = status[category] = counts.snapshot(now)
+            rule = self.thresholds.get(category, FALLBACK_THRESHOLD)
+            state = self.states[category]
+            if state.firing:
+                if snap["count_1m"] <= rule["clear_rate_1m"]:
+                    state.quiet_since = state.quiet_since or now
+                    if now - state.quiet_since >= rule["clear_after"]:
+                        state.firing = False
+                        state.quiet_since = None
+                else:
+                    state.quiet_since = None
+                continue
+            triggered = ((snap["count_1m"] >= rule["rate_1m"] and snap["burst"] >= rule["burst"])
+                         or snap["count_15m"] >= rule["count_15m"])
+            if triggered:
+                state.firing = True
+                state.fired_at = now
+                state.quiet_since = None
+                fired.append({"category": category, **snap, "fingerprints": self.top_fingerprints(category, now)})
+        self.last_status = status
+        return fired
+
+    def status(self, now=None):
+        now = now or self.clock()
+        return {category: {**counts.snapshot(now), "firing": self.states[category].firing}
+                for category, counts in self.categories.items()}
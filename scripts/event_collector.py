@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+RSVShop 브라우저 이벤트 수집기
+브라우저 콘솔/오류 이벤트를 HTTP로 묶음 수신해 검증한 뒤 logs/events/의 추가 전용 세그먼트
+(events-00000001.jsonl ...)에 그룹 커밋으로 기록. 클라이언트별 속도 제한과 대기열 한도(503)로
+과부하를 막고, AutoErrorFixer.analyze_logs()가 커서로 새 이벤트만 이어 읽는다.
+
+요청:
+  POST /events   {"client": "admin-session-1", "events": [{"type": "error", "message": "...", "url": "...",
+                  "timestamp": "2025-08-26T11:13:56.687Z", "stack": "..."}]}  (배열만 보내도 됨)
+  GET  /health, GET /stats, GET /metrics
+
+사용법:
+  python scripts/event_collector.py [--port 9470] [--unix /tmp/rsvshop-events.sock] [--dir logs/events]
+                                    [--rate 200] [--burst 2000] [--fsync]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from log_reader import parse_ts
+from supervisor_metrics import MetricsRegistry
+
+EVENT_TYPES = {"error", "warn", "warning", "info", "log", "debug", "javascript", "unhandledrejection",
+               "network", "resource", "console"}
+MAX_MESSAGE = 8192
+MAX_STACK = 16384
+MAX_BODY = 1 << 20
+MAX_CLIENTS = 10000  # 속도 제한 버킷 수 상한 (client는 본문에서 오므로 오래 안 쓴 것부터 버린다)
+STATUS_TEXT = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+               503: "Service Unavailable"}
+
+
+def validate_event(raw, client, received_at):
+    """(정규화된 이벤트, None) 또는 (None, 거부 사유)"""
+    if not isinstance(raw, dict):
+        return None, "not_object"
+    kind = str(raw.get("type") or raw.get("level") or "").lower()
+    if kind not in EVENT_TYPES:
+        return None, "bad_type"
+    message = raw.get("message", raw.get("text"))
+    if not isinstance(message, str) or not message.strip():
+        return None, "no_message"
+    event = {"type": kind, "message": message[:MAX_MESSAGE]}
+    timestamp = raw.get("timestamp", raw.get("time"))
+    if timestamp is not None:
+        try:
+            ts = parse_ts(timestamp)
+            # 비교가 항상 거짓인 NaN, 음수/무한대 에포크도 여기서 거른다
+            if ts is None or not 0 <= ts <= received_at + 86400:
+                return None, "bad_timestamp"
+            event["timestamp"] = datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds")
+        except (OverflowError, ValueError, OSError):
+            return None, "bad_timestamp"
+    for key in ("url", "filename", "userAgent"):
+        if isinstance(raw.get(key), str):
+            event[key] = raw[key][:2048]
+    if isinstance(raw.get("stack"), str):
+        event["stack"] = raw["stack"][:MAX_STACK]
+    for key in ("lineno", "colno", "status"):
+        if isinstance(raw.get(key), int) and not isinstance(raw.get(key), bool):
+            event[key] = raw[key]
+    event["client"] = client
+    event["receivedAt"] = datetime.fromtimestamp(received_at, timezone.utc).isoformat(timespec="milliseconds")
+    return event, None
+
+
+class TokenBucket:
+    """클라이언트별 속도 제한 (초당 rate개, 최대 burst개까지 몰아서 허용)"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, count):
+        """허용되면 토큰을 차감하고 0, 아니면 다시 시도할 때까지의 초 (burst보다 크면 영원히 불가: inf)"""
+        if count > self.burst:
+            return float("inf")
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if count <= self.tokens:
+            self.tokens -= count
+            return 0
+        return (count - self.tokens) / self.rate
+
+
+class SegmentStore:
+    """추가 전용 JSONL 세그먼트. 크기가 segment_bytes를 넘으면 다음 세그먼트로 넘어간다"""
+
+    def __init__(self, directory="logs/events", segment_bytes=8 << 20, max_segments=64, fsync=False):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        existing = self.segments()
+        self.sequence = int(os.path.basename(existing[-1])[7:15]) if existing else 1
+        self.file = open(self.segment_path(self.sequence), "ab")
+
+    def segment_path(self, sequence):
+        return os.path.join(self.directory, f"events-{sequence:08d}.jsonl")
+
+    def segments(self):
+        return list_segments(self.directory)
+
+    def append(self, data):
+        """한 그룹을 한 번의 write(+fsync)로 기록"""
+        self.file.write(data)
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        if self.file.tell() >= self.segment_bytes:
+            self.roll()
+
+    def roll(self):
+        self.file.close()
+        self.sequence += 1
+        self.file = open(self.segment_path(self.sequence), "ab")
+        for path in self.segments()[:-self.max_segments]:
+            os.remove(path)
+
+    def close(self):
+        self.file.close()
+
+
+def list_segments(directory):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.startswith("events-") and name.endswith(".jsonl"))
+
+
+def read_new_events(directory, cursor):
+    """cursor({세그먼트 파일명: 바이트 위치}) 이후에 기록된 이벤트와 새 커서"""
+    events = []
+    new_cursor = {}
+    for path in list_segments(directory):
+        name = os.path.basename(path)
+        offset = cursor.get(name, 0)
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # 아직 쓰는 중인 줄
+                offset += len(line)
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+        new_cursor[name] = offset
+    return events, new_cursor
+
+
+def load_cursor(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cursor(path, cursor):
+    temp = f"{path}.tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(cursor, f)
+    os.replace(temp, path)
+
+
+class EventCollector:
+    def __init__(self, store, rate=200, burst=2000, max_pending=50000, max_batch=5000, max_delay=0.002,
+                 registry=None, log=print, max_clients=MAX_CLIENTS):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.log = log
+        self.buckets = OrderedDict()  # 최근 사용 순 (LRU)
+        self.max_clients = max_clients
+        self.pending = 0
+        self.queue = None
+        self.committer = None
+        self.servers = []
+        self.stats = {"accepted": 0, "rejected": 0, "rate_limited": 0, "backpressure": 0,
+                      "commits": 0, "committed_events": 0}
+        self.metrics = registry or MetricsRegistry()
+        self.m_events = self.metrics.counter("rsvshop_collector_events_total", "수신 이벤트 수", ["result"])
+        self.m_commit = self.metrics.histogram(
+            "rsvshop_collector_commit_seconds", "그룹 커밋 시간",
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1))
+        self.m_group = self.metrics.histogram(
+            "rsvshop_collector_group_events", "커밋 1회당 이벤트 수",
+            buckets=(1, 10, 50, 100, 500, 1000, 5000, 20000))
+        self.metrics.gauge("rsvshop_collector_pending_events", "커밋 대기 중인 이벤트 수").set_function(
+            lambda: self.pending)
+
+    async def start(self, host="127.0.0.1", port=9470, unix_path=None):
+        self.queue = asyncio.Queue()
+        self.committer = asyncio.ensure_future(self.commit_loop())
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            self.servers.append(await asyncio.start_unix_server(self.handle, unix_path))
+        if port is not None:
+            server = await asyncio.start_server(self.handle, host, port)
+            self.port = server.sockets[0].getsockname()[1]
+            self.servers.append(server)
+        return self
+
+    async def close(self):
+        for server in self.servers:
+            server.close()
+        while self.pending:
+            await asyncio.sleep(0.01)
+        self.committer.cancel()
+        self.store.close()
+
+    async def commit_loop(self):
+        """쌓인 배치를 모아 한 번에 기록. 기록하는 동안 들어온 배치는 다음 그룹이 된다"""
+        loop = asyncio.get_running_loop()
+        while True:
+            group = [await self.queue.get()]
+            if self.max_delay:
+                await asyncio.sleep(self.max_delay)
+            count = group[0][1]
+            while count < self.max_batch and not self.queue.empty():
+                item = self.queue.get_nowait()
+                group.append(item)
+                count += item[1]
+            started = time.perf_counter()
+            try:
+                await loop.run_in_executor(None, self.store.append, b"".join(item[0] for item in group))
+            except OSError as e:
+                self.log(f"❌ 이벤트 기록 실패: {e}")
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_result(True)
+                self.stats["commits"] += 1
+                self.stats["committed_events"] += count
+                self.m_commit.observe(time.perf_counter() - started)
+                self.m_group.observe(count)
+            finally:
+                self.pending -= count
+
+    async def submit(self, client, payload):
+        """(상태 코드, 응답 본문, 추가 헤더)"""
+        received_at = time.time()
+        if isinstance(payload, dict):
+            client = str(payload.get("client") or payload.get("sessionId") or client)[:128]
+            raw_events = payload.get("events", payload.get("logs"))
+        else:
+            raw_events = payload
+        if not isinstance(raw_events, list):
+            return 400, {"error": "events 배열이 필요합니다"}, {}
+
+        if len(raw_events) > self.burst:
+            # 토큰이 가득 차도 받을 수 없는 크기: 재시도해도 소용없으므로 429가 아니라 413
+            self.stats["rejected"] += len(raw_events)
+            self.m_events.labels(result="rejected").inc(len(raw_events))
+            return 413, {"error": f"한 번에 최대 {self.burst}개까지 보낼 수 있습니다"}, {}
+
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = self.buckets[client] = TokenBucket(self.rate, self.burst)
+            if len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(client)
+        retry_after = bucket.take(len(raw_events))
+        if retry_after:
+            self.stats["rate_limited"] += len(raw_events)
+            self.m_events.labels(result="rate_limited").inc(len(raw_events))
+            return 429, {"error": "요청이 너무 많습니다"}, {"Retry-After": str(max(1, round(retry_after)))}
+        if self.pending + len(raw_events) > self.max_pending:
+            self.stats["backpressure"] += len(raw_events)
+            self.m_events.labels(result="backpressure").inc(len(raw_events))
+            return 503, {"error": "수집기 대기열이 가득 찼습니다"}, {"Retry-After": "1"}
+
+        lines = []
+        reasons = {}
+        for raw in raw_events:
+            event, reason = validate_event(raw, client, received_at)
+            if event is None:
+                reasons[reason] = reasons.get(reason, 0) + 1
+            else:
+                lines.append(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+        rejected = len(raw_events) - len(lines)
+        self.stats["rejected"] += rejected
+        if rejected:
+            self.m_events.labels(result="rejected").inc(rejected)
+        if lines:
+            future = asyncio.get_running_loop().create_future()
+            self.pending += len(lines)
+            self.queue.put_nowait((b"".join(lines), len(lines), future))
+            try:
+                await future
+            except OSError:
+                return 500, {"error": "이벤트 기록 실패"}, {}
+            self.stats["accepted"] += len(lines)
+            self.m_events.labels(result="accepted").inc(len(lines))
+        return 200, {"accepted": len(lines), "rejected": rejected, "reasons": reasons}, {}
+
+    def cors_headers(self, headers):
+        origin = headers.get("origin", "")
+        if origin.startswith(("http://localhost:", "http://127.0.0.1:")):
+            return {"Access-Control-Allow-Origin": origin, "Vary": "Origin",
+                    "Access-Control-Allow-Methods": "POST, GET, OPTIONS",
+                    "Access-Control-Allow-Headers": "Content-Type, X-Client-Id"}
+        return {}
+
+    async def route(self, method, path, headers, body, peer):
+        if path == "/events":
+            if method == "OPTIONS":
+                return 204, None, {}
+            if method != "POST":
+                return 405, {"error": "POST만 지원합니다"}, {}
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                return 400, {"error": "JSON 형식이 아닙니다"}, {}
+            return await self.submit(headers.get("x-client-id") or peer, payload)
+        if path == "/health":
+            return 200, {"status": "ok", "pending": self.pending}, {}
+        if path == "/stats":
+            commits = self.stats["commits"]
+            return 200, {**self.stats, "pending": self.pending, "clients": len(self.buckets),
+                         "avg_group": round(self.stats["committed_events"] / commits, 1) if commits else 0,
+                         "segment": os.path.basename(self.store.segment_path(self.store.sequence))}, {}
+        if path == "/metrics":
+            return 200, self.metrics.render(), {}
+        return 404, {"error": "Not Found"}, {}
+
+    async def handle(self, reader, writer):
+        peername = writer.get_extra_info("peername")
+        peer = peername[0] if isinstance(peername, tuple) else "unix"
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) < 2:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0") or 0)
+                if length > MAX_BODY:
+                    status, payload, extra = 413, {"error": "본문이 너무 큽니다"}, {}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload, extra = await self.route(parts[0], parts[1].split("?", 1)[0], headers,
+                                                              body, peer)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                if isinstance(payload, str):
+                    content_type, data = "text/plain; version=0.0.4", payload.encode("utf-8")
+                else:
+                    content_type = "application/json"
+                    data = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}", f"Content-Type: {content_type}",
+                        f"Content-Length: {len(data)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head += [f"{name}: {value}" for name, value in {**self.cors_headers(headers), **extra}.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    store = SegmentStore(args.dir, segment_bytes=args.segment_mb << 20, fsync=args.fsync)
+    collector = await EventCollector(store, rate=args.rate, burst=args.burst,
+                                     max_pending=args.max_pending).start(args.host, args.port, args.unix)
+    where = [f"http://{args.host}:{collector.port}/events"] if args.port is not None else []
+    if args.unix:
+        where.append(f"unix:{args.unix}")
+    print(f"📥 이벤트 수집기 시작: {', '.join(where)} → {args.dir}")
+    print(f"   클라이언트별 {args.rate}건/초 (최대 {args.burst}건), 대기열 {args.max_pending}건, "
+          f"fsync {'사용' if args.fsync else '미사용'}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await collector.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 브라우저 이벤트 수집기")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("RSVSHOP_COLLECTOR_PORT", "9470")))
+    parser.add_argument("--no-tcp", dest="port", action="store_const", const=None, help="TCP 리스너 없이 Unix 소켓만")
+    parser.add_argument("--unix", help="Unix 소켓 경로")
+    parser.add_argument("--dir", default="logs/events", help="세그먼트 디렉토리")
+    parser.add_argument("--segment-mb", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=200, help="클라이언트별 초당 이벤트 수")
+    parser.add_argument("--burst", type=int, default=2000)
+    parser.add_argument("--max-pending", type=int, default=50000, help="커밋 대기 이벤트 한도 (넘으면 503)")
+    parser.add_argument("--fsync", action="store_true", help="그룹 커밋마다 fsync")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("\n🛑 이벤트 수집기 종료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
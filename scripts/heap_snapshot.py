@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+RSVShop V8 힙 스냅샷 분석기
+수백 MB의 .heapsnapshot을 스트리밍으로 읽어 필요한 필드만 array 기반 노드/엣지 테이블로 보관하고,
+지배자 트리(dominator tree)로 생성자별 retained size를 계산하며 두 스냅샷의 증가분을 비교
+
+사용법:
+  python scripts/heap_snapshot.py analyze <file.heapsnapshot> [top_n]
+  python scripts/heap_snapshot.py diff <before.heapsnapshot> <after.heapsnapshot> [top_n]
+
+메모리: 노드당 13바이트(type/name/self_size/edge_count), 엣지당 5바이트(type/to_node),
+문자열은 120자로 잘라 보관하므로 원본 스냅샷 크기의 일부만 사용한다.
+"""
+
+import codecs
+import json
+import os
+import sys
+import time
+from array import array
+
+CHUNK_SIZE = 1 << 20
+MAX_STRING_LENGTH = 120
+
+
+class SnapshotFormatError(Exception):
+    pass
+
+
+class _StreamReader:
+    """바이트 버퍼 기반 순차 리더"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = b""
+        self.eof = False
+
+    def fill(self):
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def seek_array(self, key):
+        """'"key":[' 다음 위치로 이동"""
+        token = b'"' + key.encode() + b'"'
+        while True:
+            index = self.buffer.find(token)
+            if index >= 0:
+                bracket = self.buffer.find(b"[", index + len(token))
+                if bracket >= 0:
+                    self.buffer = self.buffer[bracket + 1:]
+                    return
+            elif len(self.buffer) > len(token):
+                self.buffer = self.buffer[-len(token):]
+            if not self.fill():
+                raise SnapshotFormatError(f"'{key}' 배열을 찾을 수 없습니다")
+
+    def read_int_array(self, on_ints):
+        """정수 배열을 청크 단위 int 리스트로 콜백에 전달 (']'까지)"""
+        while True:
+            end = self.buffer.find(b"]")
+            if end >= 0:
+                segment, self.buffer = self.buffer[:end], self.buffer[end + 1:]
+                ints = json.loads(b"[" + segment + b"]")
+                if ints:
+                    on_ints(ints)
+                return
+            comma = self.buffer.rfind(b",")
+            if comma >= 0:
+                segment, self.buffer = self.buffer[:comma], self.buffer[comma + 1:]
+                # 정수 파싱은 C로 구현된 json 디코더에 맡긴다
+                on_ints(json.loads(b"[" + segment + b"]"))
+            if not self.fill():
+                raise SnapshotFormatError("정수 배열이 끝나지 않았습니다")
+
+    def read_string_array(self, on_string):
+        """JSON 문자열 배열을 하나씩 디코딩 (UTF-8 경계가 청크 사이에 걸려도 안전)"""
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        text = utf8.decode(self.buffer)
+        self.buffer = b""
+        position = 0
+        while True:
+            while position < len(text) and text[position] in " \t\r\n,":
+                position += 1
+            if position < len(text):
+                if text[position] == "]":
+                    return
+                try:
+                    value, end = decoder.raw_decode(text, position)
+                    # 문자열이 버퍼 끝에서 잘렸을 가능성이 없을 때만 확정
+                    if end < len(text) or self.eof:
+                        on_string(value)
+                        position = end
+                        continue
+                except json.JSONDecodeError:
+                    if self.eof:
+                        raise SnapshotFormatError("strings 배열을 해석할 수 없습니다")
+            chunk = self.f.read(CHUNK_SIZE)
+            if not chunk:
+                self.eof = True
+                if position >= len(text):
+                    raise SnapshotFormatError("strings 배열이 끝나지 않았습니다")
+            text = text[position:] + utf8.decode(chunk, final=not chunk)
+            position = 0
+
+
+class _FieldCollector:
+    """레코드 경계에 맞춰 필요한 필드만 골라 array에 저장"""
+
+    def __init__(self, field_count, targets):
+        self.field_count = field_count
+        self.targets = targets  # [(offset, array), ...]
+        self.pending = []
+
+    def __call__(self, ints):
+        if self.pending:
+            ints = self.pending + ints
+        usable = len(ints) // self.field_count * self.field_count
+        for offset, target in self.targets:
+            target.extend(ints[offset:usable:self.field_count])
+        self.pending = ints[usable:]
+
+
+class HeapSnapshot:
+    """압축된 노드/엣지 테이블"""
+
+    def __init__(self):
+        self.node_types = []
+        self.edge_types = []
+        self.node_type = array("B")
+        self.node_name = array("I")
+        self.node_self_size = array("I")
+        self.node_edge_count = array("I")
+        self.edge_type = array("B")
+        self.edge_to = array("I")
+        self.strings = []
+        self.first_edge = None
+
+    @property
+    def node_count(self):
+        return len(self.node_type)
+
+    @classmethod
+    def load(cls, path):
+        snapshot = cls()
+        with open(path, "rb") as f:
+            reader = _StreamReader(f)
+            while b'"nodes"' not in reader.buffer:
+                if not reader.fill():
+                    raise SnapshotFormatError("스냅샷 헤더를 찾을 수 없습니다")
+            head = reader.buffer[:reader.buffer.find(b'"nodes"')].rstrip().rstrip(b",")
+            meta = json.loads(head + b"}")["snapshot"]["meta"]
+            node_fields, edge_fields = meta["node_fields"], meta["edge_fields"]
+            snapshot.node_types = meta["node_types"][node_fields.index("type")]
+            snapshot.edge_types = meta["edge_types"][edge_fields.index("type")]
+
+            reader.seek_array("nodes")
+            nodes = _FieldCollector(len(node_fields), [
+                (node_fields.index("type"), snapshot.node_type),
+                (node_fields.index("name"), snapshot.node_name),
+                (node_fields.index("self_size"), snapshot.node_self_size),
+                (node_fields.index("edge_count"), snapshot.node_edge_count),
+            ])
+            reader.read_int_array(nodes)
+
+            reader.seek_array("edges")
+            to_node = array("I")
+            edges = _FieldCollector(len(edge_fields), [
+                (edge_fields.index("type"), snapshot.edge_type),
+                (edge_fields.index("to_node"), to_node),
+            ])
+            reader.read_int_array(edges)
+            # to_node는 nodes 배열 오프셋이므로 노드 인덱스로 변환
+            width = len(node_fields)
+            snapshot.edge_to = array("I", (offset // width for offset in to_node))
+            del to_node
+
+            reader.seek_array("strings")
+            strings = snapshot.strings
+            reader.read_string_array(lambda s: strings.append(s[:MAX_STRING_LENGTH]))
+
+        first_edge = array("I", [0]) * (snapshot.node_count + 1)
+        total = 0
+        for i, count in enumerate(snapshot.node_edge_count):
+            first_edge[i] = total
+            total += count
+        first_edge[snapshot.node_count] = total
+        snapshot.first_edge = first_edge
+        return snapshot
+
+    def class_name(self, index):
+        """Chrome DevTools의 Constructor 열과 같은 분류"""
+        kind = self.node_types[self.node_type[index]]
+        if kind in ("object", "native"):
+            return self.strings[self.node_name[index]]
+        if kind == "closure":
+            return "(closure)"
+        if kind in ("string", "concatenated string", "sliced string"):
+            return "(string)"
+        return f"({kind})"
+
+    def dominators(self):
+        """Cooper-Harvey-Kennedy 반복 알고리즘으로 직계 지배자 계산 (weak 엣지 제외)
+
+        반환: (postorder 노드 목록, idom array). 도달 불가 노드는 idom = -1
+        """
+        n = self.node_count
+        weak = self.edge_types.index("weak") if "weak" in self.edge_types else -1
+        first_edge, edge_to, edge_type = self.first_edge, self.edge_to, self.edge_type
+
+        post_index = array("i", [-1]) * n
+        order = array("I")
+        visited = bytearray(n)
+        stack = [(0, first_edge[0])]
+        visited[0] = 1
+        while stack:
+            node, edge = stack[-1]
+            end = first_edge[node + 1]
+            while edge < end and (edge_type[edge] == weak or visited[edge_to[edge]]):
+                edge += 1
+            if edge < end:
+                stack[-1] = (node, edge + 1)
+                child = edge_to[edge]
+                visited[child] = 1
+                stack.append((child, first_edge[child]))
+            else:
+                stack.pop()
+                post_index[node] = len(order)
+                order.append(node)
+
+        # 역방향 엣지 (도달 가능한 노드에서 나가는 strong 엣지만)
+        edge_from = array("I")
+        for node, count in enumerate(self.node_edge_count):
+            if count:
+                edge_from.extend([node] * count)
+        pred_count = array("I", [0]) * (n + 1)
+        for source, target, kind in zip(edge_from, edge_to, edge_type):
+            if kind != weak and visited[source]:
+                pred_count[target + 1] += 1
+        for i in range(n):
+            pred_count[i + 1] += pred_count[i]
+        pred_fill = array("I", pred_count)
+        preds = array("I", [0]) * pred_count[n]
+        for source, target, kind in zip(edge_from, edge_to, edge_type):
+            if kind != weak and visited[source]:
+                preds[pred_fill[target]] = source
+                pred_fill[target] += 1
+        del pred_fill, edge_from
+
+        root = 0
+        idom = array("i", [-1]) * n
+        idom[root] = root
+        # 첫 패스는 역 postorder 전체, 이후 패스는 선행 노드가 여럿인 노드만 다시 본다
+        # (선행 노드가 하나뿐인 노드의 지배자는 첫 패스에서 확정된다. 힙 노드 대부분이 여기에 해당)
+        candidates = array("I", reversed(order[:-1]))
+        changed = True
+        while changed:
+            changed = False
+            multi = array("I")
+            for node in candidates:
+                start, end = pred_count[node], pred_count[node + 1]
+                if end - start == 1:
+                    # 선행 노드가 하나뿐이면 그 노드가 곧 직계 지배자
+                    new_idom = preds[start]
+                    if idom[new_idom] == -1:
+                        continue
+                else:
+                    multi.append(node)
+                    new_idom = -1
+                    for p in range(start, end):
+                        pred = preds[p]
+                        if idom[pred] == -1:
+                            continue
+                        if new_idom == -1:
+                            new_idom = pred
+                            continue
+                        a, b = pred, new_idom
+                        while a != b:
+                            while post_index[a] < post_index[b]:
+                                a = idom[a]
+                            while post_index[b] < post_index[a]:
+                                b = idom[b]
+                        new_idom = a
+                if new_idom != -1 and idom[node] != new_idom:
+                    idom[node] = new_idom
+                    changed = True
+            candidates = multi
+        return order, idom
+
+    def summarize(self):
+        """생성자별 {count, self_size, retained_size} 집계
+
+        지배자 트리의 자식은 postorder에서 항상 부모보다 먼저 나오므로 한 번의 순회로 retained를 누적한다.
+        생성자별 retained 합계는 지배자 조상 중에 같은 생성자가 없는 인스턴스만 더해 중복 집계를 피한다.
+        """
+        order, idom = self.dominators()
+        n = self.node_count
+        retained = array("Q", self.node_self_size)
+        child_count = array("I", [0]) * (n + 1)
+        for node in order:
+            parent = idom[node]
+            if parent != node:
+                retained[parent] += retained[node]
+                child_count[parent + 1] += 1
+        for i in range(n):
+            child_count[i + 1] += child_count[i]
+        fill = array("I", child_count)
+        children = array("I", [0]) * child_count[n]
+        for node in order:
+            parent = idom[node]
+            if parent != node:
+                children[fill[parent]] = node
+                fill[parent] += 1
+        del fill
+
+        classes = {}
+        active = {}
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                active[self.class_name(~node)] -= 1
+                continue
+            key = self.class_name(node)
+            entry = classes.get(key)
+            if entry is None:
+                entry = classes[key] = [0, 0, 0]
+            entry[0] += 1
+            entry[1] += self.node_self_size[node]
+            if not active.get(key):
+                entry[2] += retained[node]
+            active[key] = active.get(key, 0) + 1
+            stack.append(~node)
+            stack.extend(children[child_count[node]:child_count[node + 1]])
+        return {
+            "nodes": self.node_count,
+            "reachable": len(order),
+            "total_size": retained[0] if self.node_count else 0,
+            "classes": {k: {"count": v[0], "self_size": v[1], "retained_size": v[2]} for k, v in classes.items()},
+        }
+
+
+def analyze(path, use_cache=True):
+    """스냅샷 요약 (옆에 .summary.json 캐시를 남겨 diff를 빠르게 함)"""
+    cache = os.path.splitext(path)[0] + ".summary.json"
+    if use_cache and os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        with open(cache, "r", encoding="utf-8") as f:
+            return json.load(f)
+    started = time.monotonic()
+    summary = HeapSnapshot.load(path).summarize()
+    summary["source"] = path
+    summary["analysis_seconds"] = round(time.monotonic() - started, 2)
+    with open(cache, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False)
+    return summary
+
+
+def diff(before, after):
+    """생성자별 증가분 [(name, d_count, d_self, d_retained, after_entry), ...] (self size 증가순)"""
+    rows = []
+    empty = {"count": 0, "self_size": 0, "retained_size": 0}
+    for name in set(before["classes"]) | set(after["classes"]):
+        a = before["classes"].get(name, empty)
+        b = after["classes"].get(name, empty)
+        rows.append((name, b["count"] - a["count"], b["self_size"] - a["self_size"],
+                     b["retained_size"] - a["retained_size"], b))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def _mb(value):
+    return f"{value / 1024 / 1024:.2f}MB"
+
+
+def print_summary(summary, top_n=20):
+    print(f"🧠 힙 스냅샷: 노드 {summary['nodes']:,}개 (도달 가능 {summary['reachable']:,}), "
+          f"총 {_mb(summary['total_size'])}, 분석 {summary.get('analysis_seconds', 0)}초")
+    rows = sorted(summary["classes"].items(), key=lambda item: item[1]["retained_size"], reverse=True)
+    print(f"\n  retained size TOP {top_n}")
+    print(f"    {'retained':>11} {'self':>11} {'count':>10}  생성자")
+    for name, entry in rows[:top_n]:
+        print(f"    {_mb(entry['retained_size']):>11} {_mb(entry['self_size']):>11} {entry['count']:>10,}  {name}")
+
+
+def print_diff(before, after, top_n=20):
+    print(f"📈 힙 증가분: {_mb(before['total_size'])} → {_mb(after['total_size'])} "
+          f"({_mb(after['total_size'] - before['total_size'])})")
+    print(f"    {'Δself':>11} {'Δretained':>11} {'Δcount':>10}  생성자")
+    for name, d_count, d_self, d_retained, _ in diff(before, after)[:top_n]:
+        if d_self <= 0 and d_count <= 0:
+            break
+        print(f"    {_mb(d_self):>11} {_mb(d_retained):>11} {d_count:>+10,}  {name}")
+
+
+def capture(session, path):
+    """InspectorSession으로 힙 스냅샷을 받아 청크 단위로 파일에 기록"""
+    with open(path, "w", encoding="utf-8") as f:
+        def on_event(method, params):
+            if method == "HeapProfiler.addHeapSnapshotChunk":
+                f.write(params["chunk"])
+        session.on_event = on_event
+        session.call("HeapProfiler.enable")
+        session.call("HeapProfiler.takeHeapSnapshot", {"reportProgress": False}, timeout=600)
+        session.call("HeapProfiler.disable")
+    return path
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("analyze", "diff"):
+        print("사용법:")
+        print("  python scripts/heap_snapshot.py analyze <file.heapsnapshot> [top_n]")
+        print("  python scripts/heap_snapshot.py diff <before.heapsnapshot> <after.heapsnapshot> [top_n]")
+        return
+    if sys.argv[1] == "analyze":
+        top_n = int(sys.argv[3]) if len(sys.argv) >= 4 else 20
+        print_summary(analyze(sys.argv[2]), top_n)
+    else:
+        top_n = int(sys.argv[4]) if len(sys.argv) >= 5 else 20
+        print_diff(analyze(sys.argv[2]), analyze(sys.argv[3]), top_n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+RSVShop 장애 타임라인
+브라우저 오류(browser-errors.json, 수집기 이벤트), 네트워크 캡처, pm2/서버 로그, 에러 로그 덤프,
+자동 수정 기록(fixed-errors.json)을 시간순 스트림 하나로 병합(k-way merge)하고 구간 색인에 넣어
+"이 500 전후 ±5초에 무슨 일이 있었나"를 한 번의 질의로 답한다.
+오류/느린 요청을 기준으로 가까운 이벤트를 묶어 장애 번들(incident)로 보여준다.
+
+사용법:
+  python scripts/incident_timeline.py incidents [--since 2h] [--window 5] [--min-sources 2] [--json]
+  python scripts/incident_timeline.py around "/admin/reservations" [--window 5] [--limit 5]
+  python scripts/incident_timeline.py around 2025-08-26T11:13:56 [--window 5]
+  python scripts/incident_timeline.py timeline [--since ...] [--until ...] [--source network,pm2]
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import sys
+import time
+from bisect import bisect_right
+from collections import Counter, deque
+
+from log_index import parse_time_arg
+from log_reader import classify, format_ts, iter_log_files, load_content, normalize_severity, parse_ts, read_jsonl, \
+    read_text
+
+DEFAULT_WINDOW = 5.0
+SLOW_MS = 1000
+FIX_HORIZON = 600  # 장애 뒤 이 시간(초) 안의 자동 수정 기록을 번들에 붙인다
+TIMELINE_SOURCES = ("browser", "collector", "network", "pm2", "server", "error-log", "fixed")
+REORDER_SLACK = 256
+MAX_FOLDED = 4000
+PM2_RE = re.compile(r"^pm2-(out|error|combined)-(\d+)\.log$")
+
+
+def _event(start, source, severity, message, name, line, end=None, **extra):
+    event = {"start": start, "end": start if end is None else max(end, start), "source": source,
+             "severity": severity, "message": message, "file": name, "line": line}
+    event.update({key: value for key, value in extra.items() if value not in (None, "")})
+    return event
+
+
+def browser_events(data, name, source="browser"):
+    """browser-errors.json: 페이지 url과 스크립트 위치(filename:lineno:colno)를 유지"""
+    entries = data.get("errors") or [] if isinstance(data, dict) else data
+    events = []
+    for index, entry in enumerate(entries if isinstance(entries, list) else [], 1):
+        if not isinstance(entry, dict):
+            continue
+        ts = parse_ts(entry.get("timestamp") or entry.get("time"))
+        if ts is None:
+            continue
+        where = entry.get("filename") or ""
+        if where and entry.get("lineno"):
+            where += f":{entry['lineno']}" + (f":{entry['colno']}" if entry.get("colno") else "")
+        message = str(entry.get("message") or entry.get("text") or "")
+        events.append(_event(ts, source, normalize_severity(entry.get("type"), message), message, name, index,
+                             url=entry.get("url"), where=where, kind=entry.get("type")))
+    events.sort(key=lambda e: e["start"])
+    return events
+
+
+def network_events(data, name):
+    """요청/응답 쌍을 구간 하나로. 응답이 없는 요청은 길이 0의 경고 이벤트"""
+    pending = {}
+    events = []
+    for index, entry in enumerate(data if isinstance(data, list) else [], 1):
+        if not isinstance(entry, dict):
+            continue
+        ts = parse_ts(entry.get("time"))
+        if ts is None:
+            continue
+        url = entry.get("url", "")
+        if entry.get("type") == "request":
+            pending.setdefault(url, deque()).append((ts, entry.get("method") or "GET", index))
+            continue
+        started, method, line = pending[url].popleft() if pending.get(url) else (ts, "", index)
+        status = entry.get("status")
+        failure = entry.get("failure") or entry.get("errorText")
+        duration_ms = round((ts - started) * 1000)
+        if failure or (isinstance(status, int) and status >= 500):
+            severity = "error"
+        elif (isinstance(status, int) and status >= 400) or duration_ms >= SLOW_MS:
+            severity = "warn"
+        else:
+            severity = "info"
+        message = " ".join(str(p) for p in (method, status or "", url, failure or "", f"{duration_ms}ms") if p)
+        events.append(_event(started, "network", severity, message, name, line, end=ts, url=url, status=status,
+                             duration_ms=duration_ms, slow=duration_ms >= SLOW_MS or None))
+    for url, queue in pending.items():
+        for started, method, line in queue:
+            events.append(_event(started, "network", "warn", f"{method} {url} (응답 없음)", name, line, url=url))
+    events.sort(key=lambda e: e["start"])
+    return events
+
+
+def fixed_events(data, name):
+    """fixed-errors.json: auto-error-fixer의 수정 기록"""
+    events = []
+    for index, entry in enumerate(data if isinstance(data, list) else [], 1):
+        if not isinstance(entry, dict):
+            continue
+        ts = parse_ts(entry.get("fixed_at") or entry.get("fixedAt"))
+        if ts is None:
+            continue
+        error = entry.get("error") or {}
+        message = f"{entry.get('status', '')} {error.get('type', '')}: {error.get('description', '')}".strip()
+        events.append(_event(ts, "fixed", "info", message, name, index, kind=error.get("type"),
+                             status=entry.get("status")))
+    events.sort(key=lambda e: e["start"])
+    return events
+
+
+def entries_events(data, name, source):
+    """error-log-*.json 덤프 (브라우저 오류와 같은 형태)"""
+    return browser_events(data, name, source)
+
+
+def records_to_events(records, fold=False):
+    """log_reader 레코드(텍스트/jsonl) → 이벤트. 시각을 알 수 없는 줄은 버린다
+
+    fold=True면 같은 시각의 연속된 줄(스택 트레이스, Prisma 오류 본문)을 이벤트 하나로 합친다.
+    """
+    current = None
+    for record in records:
+        if record["ts"] is None:
+            continue
+        if fold and current is not None and record["ts"] == current["start"] and record["file"] == current["file"]:
+            if len(current["message"]) < MAX_FOLDED:
+                current["message"] += "\n" + record["message"]
+            current["lines"] += 1
+            if record["severity"] == "error":
+                current["severity"] = "error"
+            continue
+        if current is not None:
+            yield current
+        current = _event(record["ts"], record["source"], record["severity"], record["message"], record["file"],
+                         record["line"])
+        current["lines"] = 1
+    if current is not None:
+        yield current
+
+
+def reorder(events, slack=REORDER_SLACK):
+    """거의 정렬된 스트림(여러 프로세스가 같이 쓰는 로그)을 slack개 버퍼로 정렬해 내보낸다"""
+    heap = []
+    for sequence, event in enumerate(events):
+        heapq.heappush(heap, (event["start"], sequence, event))
+        if len(heap) > slack:
+            yield heapq.heappop(heap)[2]
+    while heap:
+        yield heapq.heappop(heap)[2]
+
+
+def content_events(name, content):
+    """이미 읽은 파일 내용 → 정렬된 이벤트 목록 (아카이브 안의 파일도 같은 경로)"""
+    kind = classify(name)
+    if kind is None:
+        return []
+    source = kind[0]
+    if source == "browser":
+        return browser_events(content, name)
+    if source == "network":
+        return network_events(content, name)
+    if source == "fixed":
+        return fixed_events(content, name)
+    if source == "error-log":
+        return entries_events(content, name, source)
+    return []
+
+
+def file_events(path, sources):
+    """파일 하나의 시간순 이벤트 이터레이터. JSON 덤프는 처음 꺼낼 때 읽는다"""
+    source, form = classify(path)
+    if form == "archive":
+        from log_archive import Archive
+        streams = [content_events(name, content) for name, _, content in Archive(path).files()
+                   if (classify(name) or ("",))[0] in sources]
+        yield from heapq.merge(*streams, key=lambda e: e["start"])
+    elif form == "text":
+        yield from reorder(records_to_events(read_text(path, source), fold=True))
+    elif form == "jsonl":
+        yield from reorder(records_to_events(read_jsonl(path, "browser")))
+    else:
+        try:
+            content = load_content(path)
+        except (OSError, ValueError):
+            return
+        yield from content_events(os.path.basename(path), content)
+
+
+def timeline_files(logs_dir="logs", sources=TIMELINE_SOURCES):
+    """병합 대상 파일. pm2-combined-N은 같은 번호의 out/error 로그가 있으면 중복이라 제외"""
+    paths = [path for path in iter_log_files(logs_dir)
+             if classify(path)[0] in sources or classify(path)[0] == "archive"]
+    names = {os.path.basename(path) for path in paths}
+    selected = []
+    for path in paths:
+        match = PM2_RE.match(os.path.basename(path))
+        if match and match.group(1) == "combined" and (
+                f"pm2-out-{match.group(2)}.log" in names or f"pm2-error-{match.group(2)}.log" in names):
+            continue
+        selected.append(path)
+    return selected
+
+
+def merged_events(logs_dir="logs", sources=TIMELINE_SOURCES, since=None, until=None):
+    """모든 소스를 시작 시각 순으로 병합한 스트림 (heapq.merge: 소스 k개에 대해 이벤트당 O(log k))"""
+    streams = [file_events(path, sources) for path in timeline_files(logs_dir, sources)]
+    for event in heapq.merge(*streams, key=lambda e: e["start"]):
+        if since is not None and event["end"] < since:
+            continue
+        if until is not None and event["start"] > until:
+            break
+        yield event
+
+
+class IntervalIndex:
+    """시작 시각으로 정렬된 이벤트 + 끝 시각 최댓값 세그먼트 트리
+
+    overlapping(lo, hi)는 [lo, hi]와 겹치는 이벤트(start <= hi, end >= lo)를 O(log n + k)로 찾는다.
+    """
+
+    def __init__(self, events):
+        # merged_events는 REORDER_SLACK 안에서만 정렬을 보장하므로 항상 정렬한다 (거의 정렬된 입력이라 선형에 가깝다)
+        self.events = sorted(events, key=lambda e: e["start"])
+        self.starts = [event["start"] for event in self.events]
+        size = 1
+        while size < len(self.events):
+            size *= 2
+        self.size = size
+        self.max_end = [float("-inf")] * (2 * size)
+        for index, event in enumerate(self.events):
+            self.max_end[size + index] = event["end"]
+        for node in range(size - 1, 0, -1):
+            self.max_end[node] = max(self.max_end[2 * node], self.max_end[2 * node + 1])
+
+    def __len__(self):
+        return len(self.events)
+
+    def overlapping(self, lo, hi):
+        limit = bisect_right(self.starts, hi)
+        found = []
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, left, right = stack.pop()
+            if left >= limit or self.max_end[node] < lo:
+                continue
+            if node >= self.size:
+                found.append(left)
+                continue
+            middle = (left + right) // 2
+            stack.append((2 * node + 1, middle, right))
+            stack.append((2 * node, left, middle))
+        return [self.events[index] for index in found]
+
+    def around(self, ts, window=DEFAULT_WINDOW):
+        return self.overlapping(ts - window, ts + window)
+
+
+def is_anchor(event):
+    """장애 번들의 기준이 되는 이벤트: 오류, 5xx/실패/느린 요청"""
+    if event["source"] == "fixed":
+        return False
+    return event["severity"] == "error" or bool(event.get("slow"))
+
+
+def _location(event):
+    return event.get("where") or (f"{event['file']}:{event['line']}" if event["source"] in ("pm2", "server") else "")
+
+
+def build_incidents(index, window=DEFAULT_WINDOW, fix_horizon=FIX_HORIZON, min_sources=1):
+    """window초 이내로 이어지는 기준 이벤트를 하나로 묶고, 그 구간 ±window의 모든 이벤트를 붙인다"""
+    clusters = []
+    for event in index.events:
+        if not is_anchor(event):
+            continue
+        if clusters and event["start"] - clusters[-1]["end"] <= window:
+            clusters[-1]["anchors"].append(event)
+            clusters[-1]["end"] = max(clusters[-1]["end"], event["end"])
+        else:
+            clusters.append({"start": event["start"], "end": event["end"], "anchors": [event]})
+    incidents = []
+    for cluster in clusters:
+        context = [event for event in index.overlapping(cluster["start"] - window, cluster["end"] + window)
+                   if event["source"] != "fixed"]
+        fixes = [event for event in index.overlapping(cluster["start"], cluster["end"] + fix_horizon)
+                 if event["source"] == "fixed"]
+        sources = Counter(event["source"] for event in context)
+        if len(sources) < min_sources:
+            continue
+        anchors = cluster["anchors"]
+        incidents.append({
+            "id": f"incident-{int(cluster['start'] * 1000)}",
+            "start": cluster["start"],
+            "end": cluster["end"],
+            "anchors": len(anchors),
+            "sources": dict(sources),
+            "statuses": dict(Counter(str(e["status"]) for e in anchors if e["source"] == "network")),
+            "pages": [url for url, _ in Counter(e["url"] for e in context if e.get("url")).most_common(5)],
+            "locations": [loc for loc, _ in Counter(_location(e) for e in anchors if _location(e)).most_common(5)],
+            "first": anchors[0]["message"][:200],
+            "events": context,
+            "fixes": fixes,
+        })
+    return incidents
+
+
+def matching_anchors(index, text):
+    """text를 메시지/url에 포함한 기준 이벤트 (대소문자 무시). 세 자리 숫자는 응답 코드로 비교"""
+    if re.match(r"^[1-5]\d\d$", text):
+        return [event for event in index.events if is_anchor(event) and event.get("status") == int(text)]
+    needle = text.lower()
+    return [event for event in index.events if is_anchor(event) and (
+        needle in event["message"].lower() or needle in (event.get("url") or "").lower())]
+
+
+def build_index(logs_dir="logs", sources=TIMELINE_SOURCES, since=None, until=None):
+    return IntervalIndex(list(merged_events(logs_dir, sources, since, until)))
+
+
+def print_event(event, anchor=None, width=150):
+    offset = f"{event['start'] - anchor:+7.2f}s" if anchor is not None else format_ts(event["start"])
+    duration = f" ({event['duration_ms']}ms)" if event.get("duration_ms") and "ms" not in event["message"] else ""
+    marker = "❌" if event["severity"] == "error" else "⚠️" if event["severity"] == "warn" else "  "
+    lines = event["message"].split("\n")
+    message = lines[0][:width] + (f" (+{len(lines) - 1}줄)" if len(lines) > 1 else "")
+    print(f"  {offset} {marker} {event['source']:<9} {message}{duration}")
+    location = _location(event)
+    if location and location not in message:
+        print(f"           ↳ {location}")
+
+
+def print_incident(incident, show_events=30):
+    sources = ", ".join(f"{k} {v}" for k, v in sorted(incident["sources"].items()))
+    print(f"\n🚨 {incident['id']}  {format_ts(incident['start'])} "
+          f"({incident['end'] - incident['start']:.1f}s, 기준 이벤트 {incident['anchors']}개)")
+    print(f"   소스: {sources}")
+    if incident["statuses"]:
+        print(f"   응답 코드: {', '.join(f'{k}×{v}' for k, v in incident['statuses'].items())}")
+    if incident["pages"]:
+        print(f"   관련 URL: {', '.join(incident['pages'])}")
+    if incident["locations"]:
+        print(f"   오류 위치: {', '.join(incident['locations'])}")
+    print(f"   첫 오류: {incident['first']}")
+    for event in incident["events"][:show_events]:
+        print_event(event, incident["start"])
+    if len(incident["events"]) > show_events:
+        print(f"   … 외 {len(incident['events']) - show_events}건")
+    for fix in incident["fixes"]:
+        print(f"   🔧 {format_ts(fix['start'])} 자동 수정: {fix['message']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 장애 타임라인")
+    parser.add_argument("--logs", default="logs", help="로그 디렉토리")
+    parser.add_argument("--source", help=f"쉼표로 구분한 소스 (기본: {','.join(TIMELINE_SOURCES)})")
+    parser.add_argument("--since")
+    parser.add_argument("--until")
+    sub = parser.add_subparsers(dest="command")
+    incidents = sub.add_parser("incidents", help="장애 번들 목록")
+    incidents.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="묶음/주변 범위(초)")
+    incidents.add_argument("--min-sources", type=int, default=1, help="이 수 이상의 소스가 얽힌 번들만")
+    incidents.add_argument("--limit", type=int, default=10, help="최근 번들 수")
+    incidents.add_argument("--json", action="store_true")
+    around = sub.add_parser("around", help="시각 또는 오류(텍스트/URL) 주변 ±window초의 모든 이벤트")
+    around.add_argument("target", help="ISO 시각 또는 메시지/URL에 포함된 텍스트")
+    around.add_argument("--window", type=float, default=DEFAULT_WINDOW)
+    around.add_argument("--limit", type=int, default=5, help="일치한 오류 중 최근 몇 건을 볼지")
+    around.add_argument("--json", action="store_true")
+    sub.add_parser("timeline", help="병합된 시간순 이벤트 출력")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 0
+    try:
+        since, until = parse_time_arg(args.since), parse_time_arg(args.until)
+    except ValueError as e:
+        parser.error(str(e))
+    sources = tuple(args.source.split(",")) if args.source else TIMELINE_SOURCES
+
+    if args.command == "timeline":
+        for event in merged_events(args.logs, sources, since, until):
+            print_event(event)
+        return 0
+
+    started = time.perf_counter()
+    index = build_index(args.logs, sources, since, until)
+    built_ms = (time.perf_counter() - started) * 1000
+
+    if args.command == "incidents":
+        found = build_incidents(index, args.window, min_sources=args.min_sources)[-args.limit:]
+        if args.json:
+            print(json.dumps(found, ensure_ascii=False, indent=2))
+            return 0
+        print(f"🧭 이벤트 {len(index)}개 색인 ({built_ms:.0f}ms), 장애 번들 {len(found)}개")
+        for incident in found:
+            print_incident(incident)
+        return 0
+
+    ts = parse_ts(args.target) if re.match(r"^\d{4}-\d{2}-\d{2}", args.target) else None
+    anchors = [ts] if ts is not None else [e["start"] for e in matching_anchors(index, args.target)][-args.limit:]
+    if not anchors:
+        print(f"❌ 일치하는 오류가 없습니다: {args.target}")
+        return 1
+    results = []
+    for anchor in anchors:
+        query_started = time.perf_counter()
+        events = index.around(anchor, args.window)
+        elapsed = (time.perf_counter() - query_started) * 1000
+        results.append({"at": anchor, "events": events})
+        if not args.json:
+            print(f"\n🔎 {format_ts(anchor)} ±{args.window:g}s: {len(events)}건 ({elapsed:.2f}ms)")
+            for event in events:
+                print_event(event, anchor)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
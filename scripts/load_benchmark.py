@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+RSVShop API 부하 벤치마크
+관리자/예약/인증 API 시나리오를 다수의 keep-alive 연결로 실행하고 처리량과 지연 분위수를 JSON으로 기록
+
+모드:
+  closed - 동시 연결 수(--concurrency)만큼의 워커가 응답을 받는 즉시 다음 요청 (기본)
+  open   - 고정 도착률(--rate 요청/초)로 요청을 발생. 지연은 예정 시각 기준으로 측정 (coordinated omission 보정)
+
+사용법:
+  python scripts/load_benchmark.py run [--url http://localhost:4900] [--duration 30] [--concurrency 32]
+                                       [--rate 200] [--scenarios file.json] [--output result.json] [--standin]
+  python scripts/load_benchmark.py compare <base.json> <new.json> [--tolerance 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import urlsplit
+
+from async_http import ConnectionPool
+
+# API-엔드포인트-정리.md 기준 기본 시나리오
+DEFAULT_SCENARIOS = [
+    {"name": "dashboard_stats", "path": "/api/admin/stats", "weight": 3},
+    {"name": "reservations_page", "path": "/api/admin/reservations?page={page}&limit=20",
+     "weight": 4, "params": {"page": [1, 10]}},
+    {"name": "calendar", "path": "/api/admin/reservations", "weight": 2},
+    {"name": "sales_range", "path": "/api/admin/sales?customRange=true&startDate={start_date}&endDate={end_date}",
+     "weight": 2, "params": {"range_days": [7, 90]}},
+    {"name": "auth_me", "path": "/api/auth/me", "weight": 1, "expect_status": [200, 401]},
+]
+
+
+def render_path(scenario, rng):
+    """경로 템플릿의 {page}, {start_date}/{end_date} 등을 무작위 값으로 채움"""
+    values = {}
+    for name, bounds in (scenario.get("params") or {}).items():
+        if name == "range_days":
+            days = rng.randint(*bounds)
+            end = date.today() - timedelta(days=rng.randint(0, 365))
+            values["start_date"] = (end - timedelta(days=days)).isoformat()
+            values["end_date"] = end.isoformat()
+        else:
+            values[name] = rng.randint(*bounds)
+    return scenario["path"].format(**values) if values else scenario["path"]
+
+
+def percentile(sorted_values, q):
+    """nearest-rank 분위수"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ScenarioStats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+        self.bytes = 0
+
+    def record(self, seconds, status, ok, size=0):
+        self.latencies.append(seconds)
+        key = str(status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self.bytes += size
+        if not ok:
+            self.errors += 1
+
+    def merge(self, other):
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        self.bytes += other.bytes
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+
+    def to_dict(self, elapsed):
+        values = sorted(self.latencies)
+        count = len(values)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0,
+            "mean_ms": round(sum(values) / count * 1000, 2) if count else 0,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0,
+            "statuses": self.statuses,
+            "bytes": self.bytes,
+        }
+
+
+class LoadBenchmark:
+    def __init__(self, base_url, scenarios=None, concurrency=32, duration=30, rate=None,
+                 warmup=0, timeout=10, headers=None, seed=None):
+        url = urlsplit(base_url)
+        self.base_url = base_url
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 80
+        self.scenarios = scenarios or DEFAULT_SCENARIOS
+        self.weights = [s.get("weight", 1) for s in self.scenarios]
+        self.concurrency = concurrency
+        self.duration = duration
+        self.rate = rate
+        self.warmup = warmup
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.rng = random.Random(seed)
+        self.stats = {s["name"]: ScenarioStats() for s in self.scenarios}
+        self.dropped = 0
+        self.recording = False
+        self.pool = None
+
+    async def one_request(self, scenario, started=None):
+        """요청 1건 실행 후 기록. started가 주어지면 그 시각부터 지연을 잰다 (open 모드)"""
+        path = render_path(scenario, self.rng)
+        body = scenario.get("body")
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = dict(self.headers)
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+        started = started or time.perf_counter()
+        try:
+            response = await self.pool.request(scenario.get("method", "GET"), path, headers, payload)
+            status, size = response.status, len(response.body)
+            ok = status in scenario.get("expect_status", [200])
+        except Exception as e:
+            status, size, ok = type(e).__name__, 0, False
+        if self.recording:
+            self.stats[scenario["name"]].record(time.perf_counter() - started, status, ok, size)
+
+    def pick(self):
+        return self.rng.choices(self.scenarios, weights=self.weights)[0]
+
+    async def closed_loop(self, until):
+        async def worker():
+            while time.perf_counter() < until:
+                await self.one_request(self.pick())
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def open_loop(self, until):
+        interval = 1.0 / self.rate
+        max_outstanding = self.concurrency * 10
+        outstanding = set()
+        start = time.perf_counter()
+        sent = 0
+        while True:
+            scheduled = start + sent * interval
+            if scheduled >= until:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            sent += 1
+            if len(outstanding) >= max_outstanding:
+                # 클라이언트 측 포화: 기록만 하고 요청은 보내지 않음
+                self.dropped += 1
+                continue
+            task = asyncio.ensure_future(self.one_request(self.pick(), started=scheduled))
+            outstanding.add(task)
+            task.add_done_callback(outstanding.discard)
+        if outstanding:
+            await asyncio.wait(outstanding, timeout=self.timeout)
+
+    async def login(self, email, password):
+        response = await self.pool.request(
+            "POST", "/api/auth/login", {"Content-Type": "application/json"},
+            json.dumps({"email": email, "password": password}).encode("utf-8"))
+        cookie = response.headers.get("set-cookie", "").split(";", 1)[0]
+        if response.status != 200 or not cookie:
+            raise RuntimeError(f"로그인 실패 (HTTP {response.status})")
+        self.headers["Cookie"] = cookie
+
+    async def run(self, login=None):
+        self.pool = ConnectionPool(self.host, self.port, size=self.concurrency, timeout=self.timeout)
+        try:
+            if login:
+                await self.login(*login)
+            # Next.js dev는 첫 요청에서 라우트를 컴파일하므로 시나리오마다 한 번씩 미리 호출
+            for scenario in self.scenarios:
+                await self.one_request(scenario)
+            if self.warmup:
+                await self.execute(time.perf_counter() + self.warmup)
+            self.recording = True
+            started = time.perf_counter()
+            await self.execute(started + self.duration)
+            elapsed = time.perf_counter() - started
+        finally:
+            self.recording = False
+            self.pool.close()
+        return self.report(elapsed)
+
+    async def execute(self, until):
+        if self.rate:
+            await self.open_loop(until)
+        else:
+            await self.closed_loop(until)
+
+    def report(self, elapsed):
+        overall = ScenarioStats()
+        for stats in self.stats.values():
+            overall.merge(stats)
+        return {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "base_url": self.base_url,
+                "mode": "open" if self.rate else "closed",
+                "rate": self.rate,
+                "concurrency": self.concurrency,
+                "duration": self.duration,
+                "elapsed": round(elapsed, 3),
+                "dropped": self.dropped,
+                "reconnects": self.pool.reconnects if self.pool else 0,
+                "commit": git_commit(),
+            },
+            "overall": overall.to_dict(elapsed),
+            "scenarios": {name: stats.to_dict(elapsed) for name, stats in self.stats.items()},
+        }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(report):
+    meta = report["meta"]
+    mode = f"open {meta['rate']}/s" if meta["mode"] == "open" else f"closed x{meta['concurrency']}"
+    print(f"📊 부하 벤치마크 ({mode}, {meta['elapsed']}초, {meta['base_url']}, commit {meta['commit'] or '-'})")
+    print(f"  {'scenario':<20} {'req':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    rows = list(report["scenarios"].items()) + [("(전체)", report["overall"])]
+    for name, s in rows:
+        print(f"  {name:<20} {s['requests']:>7} {s['throughput_rps']:>8.1f} {s['error_rate'] * 100:>5.1f}% "
+              f"{s['p50_ms']:>7.1f}ms {s['p95_ms']:>6.1f}ms {s['p99_ms']:>6.1f}ms {s['max_ms']:>6.1f}ms")
+    if meta["dropped"]:
+        print(f"  ⚠️ 클라이언트 포화로 보내지 못한 요청: {meta['dropped']}건")
+
+
+def compare_reports(base, new, tolerance=0.1):
+    """두 결과 비교. 회귀 항목 목록 반환"""
+    regressions = []
+    print(f"📊 비교: {base['meta'].get('commit') or '-'} ({base['meta']['timestamp']}) → "
+          f"{new['meta'].get('commit') or '-'} ({new['meta']['timestamp']})")
+    print(f"  {'scenario':<20} {'metric':<15} {'base':>10} {'new':>10} {'Δ':>8}")
+    names = [n for n in base["scenarios"] if n in new["scenarios"]] + ["(전체)"]
+    for name in names:
+        a = base["overall"] if name == "(전체)" else base["scenarios"][name]
+        b = new["overall"] if name == "(전체)" else new["scenarios"][name]
+        for metric, higher_is_worse in (("p50_ms", True), ("p95_ms", True), ("p99_ms", True),
+                                        ("throughput_rps", False), ("error_rate", True)):
+            old, cur = a[metric], b[metric]
+            change = (cur - old) / old if old else (1.0 if cur else 0.0)
+            worse = change > tolerance if higher_is_worse else change < -tolerance
+            if metric == "error_rate":
+                worse = cur - old > 0.01
+            flag = " ⚠️" if worse else ""
+            if worse:
+                regressions.append((name, metric, old, cur))
+            print(f"  {name:<20} {metric:<15} {old:>10} {cur:>10} {change * 100:>+7.1f}%{flag}")
+    print(f"\n{'⚠️ 회귀 ' + str(len(regressions)) + '건' if regressions else '✅ 회귀 없음'} "
+          f"(허용 오차 {int(tolerance * 100)}%)")
+    return regressions
+
+
+async def _run_with_standin(benchmark_kwargs, login):
+    from standin_server import StandinServer
+    server = await StandinServer(port=0).start()
+    benchmark_kwargs["base_url"] = f"http://127.0.0.1:{server.port}"
+    try:
+        return await LoadBenchmark(**benchmark_kwargs).run(login)
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop API 부하 벤치마크")
+    sub = parser.add_subparsers(dest="command")
+    run = sub.add_parser("run", help="벤치마크 실행")
+    run.add_argument("--url", default="http://localhost:4900")
+    run.add_argument("--duration", type=float, default=30)
+    run.add_argument("--concurrency", type=int, default=32, help="keep-alive 연결 수 (closed 모드 워커 수)")
+    run.add_argument("--rate", type=float, help="open 모드 도착률 (요청/초)")
+    run.add_argument("--warmup", type=float, default=0, help="기록하지 않는 워밍업 시간(초)")
+    run.add_argument("--timeout", type=float, default=10)
+    run.add_argument("--scenarios", help="시나리오 JSON 파일 (기본: 내장 시나리오)")
+    run.add_argument("--output", help="결과 JSON 경로 (기본: logs/bench/load-<시각>.json)")
+    run.add_argument("--login", action="store_true", help="RSVSHOP_BENCH_EMAIL/PASSWORD로 로그인 후 쿠키 사용")
+    run.add_argument("--standin", action="store_true", help="내장 스탠드인 서버를 띄워 대상으로 사용 (오프라인 검증)")
+    run.add_argument("--seed", type=int)
+    compare = sub.add_parser("compare", help="두 결과 비교")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.new, "r", encoding="utf-8") as f:
+            new = json.load(f)
+        return 1 if compare_reports(base, new, args.tolerance) else 0
+    if args.command != "run":
+        parser.print_help()
+        return 0
+
+    scenarios = None
+    if args.scenarios:
+        with open(args.scenarios, "r", encoding="utf-8") as f:
+            scenarios = json.load(f)
+    login = None
+    if args.login:
+        login = (os.environ.get("RSVSHOP_BENCH_EMAIL", ""), os.environ.get("RSVSHOP_BENCH_PASSWORD", ""))
+    kwargs = dict(base_url=args.url, scenarios=scenarios, concurrency=args.concurrency, duration=args.duration,
+                  rate=args.rate, warmup=args.warmup, timeout=args.timeout, seed=args.seed)
+    if args.standin:
+        report = asyncio.run(_run_with_standin(kwargs, login))
+    else:
+        report = asyncio.run(LoadBenchmark(**kwargs).run(login))
+
+    print_report(report)
+    output = args.output or os.path.join("logs", "bench", f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 결과: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
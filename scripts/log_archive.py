@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+RSVShop 로그 보존/압축 작업
+보존 기간이 지난 console-*/dom-*/network-requests-*/error-log-* 덤프를 일별 압축 아카이브
+(logs/archive/YYYY-MM-DD.dumps.xz)로 옮기고 원본을 삭제. 아카이브는 열 단위로 저장하며
+모든 열(url, type, message 등)을 사전(dictionary) 인코딩한 뒤 lzma로 압축한다.
+log_reader.read_records()로 원본과 같은 레코드를 읽을 수 있고 restore로 원본 JSON을 되살릴 수 있다.
+
+사용법:
+  python scripts/log_archive.py compact [--retention-days 7] [--dry-run]
+  python scripts/log_archive.py list
+  python scripts/log_archive.py restore <YYYY-MM-DD> [--to restored-logs]
+"""
+
+import argparse
+import json
+import lzma
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime
+
+from log_reader import load_content, records_from_content
+
+MAGIC = b"RSVA1\n"
+DUMP_RE = re.compile(r"^(console|console-logs|dom|dom-info|network-requests|error-log)-(\d{13})\.(json|html)$")
+ARCHIVE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.dumps\.xz$")
+
+
+def _code_type(size):
+    for code in ("B", "H", "I"):
+        if size < 256 ** array(code).itemsize:
+            return code
+    return "Q"
+
+
+def encode_archive(day, files):
+    """files: [(name, mtime, content)] → 압축된 아카이브 바이트
+
+    JSON 객체 배열인 덤프는 모든 행을 열로 모아 사전 인코딩(코드 0은 키 없음)하고,
+    그 외(DOM HTML, 단일 객체 JSON)는 원문을 blob으로 저장한다.
+    """
+    rows = []
+    blobs = []
+    blob_offset = 0
+    entries = []
+    for name, mtime, content in files:
+        if isinstance(content, list) and all(isinstance(row, dict) for row in content):
+            entries.append({"name": name, "mtime": mtime, "rows": [len(rows), len(content)]})
+            rows.extend(content)
+        else:
+            raw = (content if isinstance(content, str) else json.dumps(content, ensure_ascii=False)).encode("utf-8")
+            entries.append({"name": name, "mtime": mtime, "blob": [blob_offset, len(raw)]})
+            blobs.append(raw)
+            blob_offset += len(raw)
+
+    keys = []
+    for row in rows:
+        for key in row:
+            if key not in keys:
+                keys.append(key)
+    columns = []
+    arrays = []
+    for key in keys:
+        dictionary = {}
+        codes = []
+        for row in rows:
+            if key in row:
+                value = json.dumps(row[key], ensure_ascii=False, sort_keys=False)
+                codes.append(dictionary.setdefault(value, len(dictionary) + 1))
+            else:
+                codes.append(0)
+        code_type = _code_type(len(dictionary) + 1)
+        columns.append({"name": key, "type": code_type, "dict": list(dictionary)})
+        arrays.append(array(code_type, codes).tobytes())
+
+    header = json.dumps({"version": 1, "day": day, "created": time.time(), "rows": len(rows),
+                         "files": entries, "columns": columns}, ensure_ascii=False).encode("utf-8")
+    payload = b"".join([MAGIC, struct.pack(">I", len(header)), header] + arrays + blobs)
+    return lzma.compress(payload, preset=6)
+
+
+class Archive:
+    """일별 아카이브 읽기"""
+
+    def __init__(self, path):
+        self.path = path
+        payload = lzma.decompress(open(path, "rb").read())
+        if not payload.startswith(MAGIC):
+            raise ValueError(f"아카이브 형식이 아닙니다: {path}")
+        start = len(MAGIC)
+        (header_size,) = struct.unpack(">I", payload[start:start + 4])
+        start += 4
+        self.header = json.loads(payload[start:start + header_size])
+        start += header_size
+        self.columns = []
+        rows = self.header["rows"]
+        for column in self.header["columns"]:
+            codes = array(column["type"])
+            size = codes.itemsize * rows
+            codes.frombytes(payload[start:start + size])
+            start += size
+            self.columns.append((column["name"], column["dict"], codes))
+        self.blobs = payload[start:]
+
+    @property
+    def day(self):
+        return self.header["day"]
+
+    def _rows(self, first, count):
+        decoded = [(name, [None] + [json.loads(value) for value in dictionary], codes)
+                   for name, dictionary, codes in self.columns]
+        for index in range(first, first + count):
+            row = {}
+            for name, values, codes in decoded:
+                code = codes[index]
+                if code:
+                    row[name] = values[code]
+            yield row
+
+    def files(self):
+        """[(name, mtime, content)] - content는 load_content()와 같은 형태"""
+        for entry in self.header["files"]:
+            if "rows" in entry:
+                content = list(self._rows(*entry["rows"]))
+            else:
+                offset, size = entry["blob"]
+                text = self.blobs[offset:offset + size].decode("utf-8")
+                content = json.loads(text) if entry["name"].endswith(".json") else text
+            yield entry["name"], entry["mtime"], content
+
+
+def read_archive_records(path):
+    """아카이브 안의 원본 파일별 레코드 (file 필드는 원본 파일명)"""
+    for name, mtime, content in Archive(path).files():
+        yield from records_from_content(name, content, mtime)
+
+
+def _fsync_dir(path):
+    if hasattr(os, "O_DIRECTORY"):
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def write_atomic(path, data):
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def dump_day(name):
+    """파일명의 에포크(ms)로 로컬 날짜"""
+    match = DUMP_RE.match(name)
+    return datetime.fromtimestamp(int(match.group(2)) / 1000).strftime("%Y-%m-%d") if match else None
+
+
+def find_candidates(logs_dir, retention_days, now=None):
+    """보존 기간이 지난 덤프를 날짜별로 {day: [path, ...]}"""
+    cutoff = (now or time.time()) - retention_days * 86400
+    by_day = {}
+    for name in sorted(os.listdir(logs_dir)):
+        match = DUMP_RE.match(name)
+        if match and int(match.group(2)) / 1000 < cutoff:
+            by_day.setdefault(dump_day(name), []).append(os.path.join(logs_dir, name))
+    return by_day
+
+
+def compact(logs_dir="logs", retention_days=7, dry_run=False, log=print):
+    """덤프를 일별 아카이브로 옮긴다. 아카이브를 다시 읽어 원본과 같음을 확인한 뒤에만 원본 삭제"""
+    archive_dir = os.path.join(logs_dir, "archive")
+    by_day = find_candidates(logs_dir, retention_days)
+    if not by_day:
+        log(f"📦 보존 기간({retention_days}일)이 지난 덤프가 없습니다.")
+        return {"days": 0, "files": 0, "before": 0, "after": 0}
+    os.makedirs(archive_dir, exist_ok=True)
+    totals = {"days": 0, "files": 0, "before": 0, "after": 0}
+    for day, paths in sorted(by_day.items()):
+        target = os.path.join(archive_dir, f"{day}.dumps.xz")
+        files = []
+        skipped = []
+        for path in paths:
+            try:
+                files.append((os.path.basename(path), os.path.getmtime(path), load_content(path)))
+            except (OSError, ValueError) as e:
+                skipped.append(path)
+                log(f"  ⚠️ 읽을 수 없어 건너뜀: {os.path.basename(path)} ({e})")
+        if not files:
+            continue
+        before = sum(os.path.getsize(path) for path in paths if path not in skipped)
+        existing = []
+        if os.path.exists(target):
+            names = {name for name, _, _ in files}
+            existing = [item for item in Archive(target).files() if item[0] not in names]
+        combined = sorted(existing + files, key=lambda item: item[0])
+        data = encode_archive(day, combined)
+        log(f"  📦 {day}: {len(files)}개 파일 {before / 1024:.1f}KB → 아카이브 {len(data) / 1024:.1f}KB"
+            f"{f' (기존 {len(existing)}개와 병합)' if existing else ''}")
+        if dry_run:
+            continue
+        write_atomic(target, data)
+        restored = {name: content for name, _, content in Archive(target).files()}
+        mismatched = [name for name, _, content in files if restored.get(name) != content]
+        if mismatched:
+            log(f"  ❌ 검증 실패로 원본을 남깁니다: {', '.join(mismatched)}")
+            continue
+        for path in paths:
+            if path not in skipped:
+                os.remove(path)
+        _fsync_dir(logs_dir)
+        totals["days"] += 1
+        totals["files"] += len(files)
+        totals["before"] += before
+        totals["after"] += len(data)
+    if not dry_run:
+        log(f"✅ 압축 완료: {totals['days']}일치 {totals['files']}개 파일, "
+            f"{totals['before'] / 1024:.1f}KB → {totals['after'] / 1024:.1f}KB")
+    return totals
+
+
+def list_archives(logs_dir="logs"):
+    archive_dir = os.path.join(logs_dir, "archive")
+    names = sorted(n for n in os.listdir(archive_dir) if ARCHIVE_RE.match(n)) if os.path.isdir(archive_dir) else []
+    if not names:
+        print("아카이브가 없습니다.")
+        return
+    print("📦 로그 아카이브:")
+    for name in names:
+        archive = Archive(os.path.join(archive_dir, name))
+        size = os.path.getsize(os.path.join(archive_dir, name))
+        print(f"  {archive.day}: 파일 {len(archive.header['files'])}개, 행 {archive.header['rows']}개, "
+              f"열 {len(archive.columns)}개, {size / 1024:.1f}KB")
+
+
+def restore(logs_dir, day, target_dir):
+    path = os.path.join(logs_dir, "archive", f"{day}.dumps.xz")
+    if not os.path.exists(path):
+        print(f"❌ 아카이브가 없습니다: {path}")
+        return 1
+    os.makedirs(target_dir, exist_ok=True)
+    count = 0
+    for name, mtime, content in Archive(path).files():
+        out = os.path.join(target_dir, name)
+        with open(out, "w", encoding="utf-8") as f:
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                json.dump(content, f, ensure_ascii=False, indent=2)
+        os.utime(out, (mtime, mtime))
+        count += 1
+    print(f"✅ {day}: {count}개 파일을 {target_dir}에 복원했습니다.")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 로그 보존/압축")
+    parser.add_argument("--logs", default="logs")
+    sub = parser.add_subparsers(dest="command")
+    run = sub.add_parser("compact", help="오래된 덤프를 일별 아카이브로 압축")
+    run.add_argument("--retention-days", type=float,
+                     default=float(os.environ.get("RSVSHOP_LOG_RETENTION_DAYS", "7")))
+    run.add_argument("--dry-run", action="store_true", help="삭제/쓰기 없이 결과만 출력")
+    sub.add_parser("list", help="아카이브 목록")
+    back = sub.add_parser("restore", help="아카이브를 원본 파일로 복원")
+    back.add_argument("day")
+    back.add_argument("--to", default=None, help="복원 디렉토리 (기본: restored-logs)")
+    args = parser.parse_args(argv)
+
+    if args.command == "compact":
+        compact(args.logs, args.retention_days, args.dry_run)
+    elif args.command == "list":
+        list_archives(args.logs)
+    elif args.command == "restore":
+        return restore(args.logs, args.day, args.to or "restored-logs")
+    else:
+        parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
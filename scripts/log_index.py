@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+RSVShop 로그 검색 색인
+logs/ 전체를 SQLite FTS5(trigram) 색인에 증분으로 넣고 키워드/기간/소스/심각도로 검색
+변경된 파일만 다시 읽고, 뒤에 덧붙여지는 텍스트 로그(pm2 등)는 이전 위치부터 이어서 색인
+logs/archive/의 일별 아카이브(log_archive.py)도 원본 파일명으로 함께 색인
+
+사용법:
+  python scripts/log_index.py index [--full]
+  python scripts/log_index.py search "shoppingMalls is not defined" [--first] [--source browser]
+                                    [--severity error] [--since 2025-08-01|7d|2h] [--until ...] [--limit 20] [--json]
+  python scripts/log_index.py stats
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from log_reader import SEVERITIES, classify, format_ts, iter_log_files, parse_ts, read_records
+
+SCHEMA_VERSION = 3
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    offset INTEGER NOT NULL DEFAULT 0,
+    lines INTEGER NOT NULL DEFAULT 0,
+    records INTEGER NOT NULL DEFAULT 0,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    line INTEGER,
+    ts REAL,
+    source TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_ts ON records(ts);
+CREATE INDEX IF NOT EXISTS records_source_ts ON records(source, ts);
+CREATE INDEX IF NOT EXISTS records_path ON records(path);
+CREATE TRIGGER IF NOT EXISTS records_ad AFTER DELETE ON records BEGIN
+    INSERT INTO records_fts(records_fts, rowid, message) VALUES ('delete', old.id, old.message);
+END;
+"""
+
+RELATIVE_RE = re.compile(r"^(\d+)([smhd])$")
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time_arg(value):
+    """'7d', '2h' 같은 상대 시간 또는 ISO 날짜/시각 → 에포크 초"""
+    if not value:
+        return None
+    match = RELATIVE_RE.match(value)
+    if match:
+        return time.time() - int(match.group(1)) * UNIT_SECONDS[match.group(2)]
+    ts = parse_ts(value)
+    if ts is None:
+        raise ValueError(f"시간 형식을 알 수 없습니다: {value}")
+    return ts
+
+
+def fts_phrase(text):
+    """사용자 입력을 FTS5 구문 검색어로 (trigram이라 부분 문자열 일치)"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+class LogIndex:
+    def __init__(self, db_path="logs/.log-index.db", logs_dir="logs"):
+        self.db_path = db_path
+        self.logs_dir = logs_dir
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # 색인은 캐시이므로 스키마가 바뀌면 새로 만든다
+            self.conn.executescript("DROP TABLE IF EXISTS records_fts; DROP TABLE IF EXISTS records; "
+                                    "DROP TABLE IF EXISTS files;")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5("
+            "message, content='records', content_rowid='id', tokenize='trigram')")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _remove(self, path):
+        self.conn.execute("DELETE FROM records WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _insert(self, path, records):
+        count = 0
+        end = lines = None
+        cursor = self.conn.cursor()
+        for record in records:
+            cursor.execute(
+                "INSERT INTO records(path, name, line, ts, source, severity, message) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, record["file"], record["line"], record["ts"], record["source"], record["severity"], record["message"]))
+            cursor.execute("INSERT INTO records_fts(rowid, message) VALUES (?, ?)",
+                           (cursor.lastrowid, record["message"]))
+            count += 1
+            end = record.get("end", end)
+            lines = record.get("lines", lines)
+        return count, end, lines
+
+    def update(self, full=False, log=print):
+        """새 파일/변경 파일만 색인. (색인한 파일 수, 추가 레코드 수, 삭제 파일 수) 반환"""
+        started = time.perf_counter()
+        known = {row[0]: row[1:] for row in self.conn.execute("SELECT path, size, mtime_ns, offset, lines FROM files")}
+        seen = set()
+        changed_files = added = 0
+        with self.conn:
+            if full:
+                self.conn.execute("DELETE FROM records")
+                self.conn.execute("DELETE FROM files")
+                known = {}
+            for path in iter_log_files(self.logs_dir):
+                seen.add(path)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                previous = known.get(path)
+                if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+                    continue
+                offset = line_no = 0
+                if previous and classify(path)[1] in ("text", "jsonl") and stat.st_size > previous[0]:
+                    offset, line_no = previous[2], previous[3]  # 덧붙여진 부분만 (줄 번호는 이어서)
+                else:
+                    self._remove(path)
+                try:
+                    count, end, lines = self._insert(path, read_records(path, offset, line_no))
+                except (OSError, ValueError) as e:
+                    log(f"⚠️ 색인 실패: {path} ({e})")
+                    count, end, lines = 0, None, None
+                self.conn.execute(
+                    "INSERT INTO files(path, size, mtime_ns, offset, lines, records, indexed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET size=excluded.size, mtime_ns=excluded.mtime_ns, "
+                    "offset=excluded.offset, lines=excluded.lines, records=files.records + excluded.records, "
+                    "indexed_at=excluded.indexed_at",
+                    (path, stat.st_size, stat.st_mtime_ns, end if end is not None else offset,
+                     lines if lines is not None else line_no, count, time.time()))
+                changed_files += 1
+                added += count
+            removed = [path for path in known if path not in seen]
+            for path in removed:
+                self._remove(path)
+        log(f"📚 색인 완료: 파일 {changed_files}개 갱신, 레코드 {added}개 추가, 삭제된 파일 {len(removed)}개 "
+            f"({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return changed_files, added, len(removed)
+
+    def search(self, text=None, source=None, severity=None, since=None, until=None, limit=50, first=False):
+        """조건에 맞는 레코드 목록 (first면 오래된 순, 아니면 최신 순)"""
+        clauses, params = [], []
+        join = ""
+        if text:
+            if len(text) >= 3:
+                join = "JOIN records_fts ON records_fts.rowid = records.id"
+                clauses.append("records_fts MATCH ?")
+                params.append(fts_phrase(text))
+            else:
+                # trigram은 3글자 이상만 색인하므로 짧은 검색어는 LIKE로
+                clauses.append("records.message LIKE ?")
+                params.append(f"%{text}%")
+        if source:
+            clauses.append("records.source = ?")
+            params.append(source)
+        if severity:
+            allowed = SEVERITIES[:SEVERITIES.index(severity) + 1]
+            clauses.append(f"records.severity IN ({','.join('?' * len(allowed))})")
+            params.extend(allowed)
+        if since is not None:
+            clauses.append("records.ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("records.ts <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "ASC" if first else "DESC"
+        rows = self.conn.execute(
+            f"SELECT records.ts, records.source, records.severity, records.path, records.name, records.line, "
+            f"records.message "
+            f"FROM records {join} {where} ORDER BY records.ts {order}, records.id {order} LIMIT ?",
+            (*params, limit)).fetchall()
+        return [{"ts": r[0], "source": r[1], "severity": r[2], "path": r[3], "file": r[4], "line": r[5],
+                 "message": r[6]} for r in rows]
+
+    def stats(self):
+        return {
+            "files": self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+            "records": self.conn.execute("SELECT COUNT(*) FROM records").fetchone()[0],
+            "by_source": dict(self.conn.execute(
+                "SELECT source, COUNT(*) FROM records GROUP BY source ORDER BY COUNT(*) DESC").fetchall()),
+            "by_severity": dict(self.conn.execute(
+                "SELECT severity, COUNT(*) FROM records GROUP BY severity").fetchall()),
+            "range": self.conn.execute("SELECT MIN(ts), MAX(ts) FROM records").fetchone(),
+            "db_bytes": os.path.getsize(self.db_path),
+        }
+
+
+def print_results(results, text=None, width=160):
+    for r in results:
+        message = r["message"].replace("\n", " ")
+        if text and len(message) > width:
+            # 일치 위치 주변만 보여준다
+            index = max(0, message.lower().find(text.lower()) - 40)
+            message = ("…" if index else "") + message[index:index + width]
+        else:
+            message = message[:width]
+        print(f"  {format_ts(r['ts'])} [{r['severity']:<5}] {r['source']:<9} {message}")
+        location = r["path"] if os.path.basename(r["path"]) == r["file"] else f"{r['path']} → {r['file']}"
+        print(f"      ↳ {location}:{r['line']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 로그 검색 색인")
+    parser.add_argument("--logs", default="logs", help="로그 디렉토리")
+    parser.add_argument("--db", default=None, help="색인 DB 경로 (기본: <logs>/.log-index.db)")
+    sub = parser.add_subparsers(dest="command")
+    index = sub.add_parser("index", help="증분 색인")
+    index.add_argument("--full", action="store_true", help="전체 재색인")
+    search = sub.add_parser("search", help="검색 (검색 전 자동으로 증분 색인)")
+    search.add_argument("text", nargs="?")
+    search.add_argument("--source")
+    search.add_argument("--severity", choices=SEVERITIES, help="이 심각도 이상만")
+    search.add_argument("--since")
+    search.add_argument("--until")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--first", action="store_true", help="가장 먼저 나타난 것부터")
+    search.add_argument("--json", action="store_true")
+    search.add_argument("--no-update", action="store_true", help="검색 전 증분 색인 생략")
+    sub.add_parser("stats", help="색인 통계")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 0
+    index_db = LogIndex(args.db or os.path.join(args.logs, ".log-index.db"), args.logs)
+    try:
+        if args.command == "index":
+            index_db.update(full=args.full)
+        elif args.command == "stats":
+            index_db.update(log=lambda message: None)
+            stats = index_db.stats()
+            print(f"📚 로그 색인: 파일 {stats['files']}개, 레코드 {stats['records']}개, "
+                  f"{stats['db_bytes'] / 1024 / 1024:.1f}MB")
+            print(f"  기간: {format_ts(stats['range'][0])} ~ {format_ts(stats['range'][1])}")
+            print(f"  소스: {', '.join(f'{k} {v}' for k, v in stats['by_source'].items())}")
+            print(f"  심각도: {', '.join(f'{k} {v}' for k, v in stats['by_severity'].items())}")
+        else:
+            if not args.no_update:
+                index_db.update(log=lambda message: None)
+            try:
+                since, until = parse_time_arg(args.since), parse_time_arg(args.until)
+            except ValueError as e:
+                parser.error(str(e))
+            started = time.perf_counter()
+            results = index_db.search(args.text, args.source, args.severity, since, until, args.limit, args.first)
+            elapsed = (time.perf_counter() - started) * 1000
+            if args.json:
+                print(json.dumps(results, ensure_ascii=False, indent=2))
+            else:
+                print(f"🔍 {len(results)}건 ({elapsed:.1f}ms)")
+                print_results(results, args.text)
+    finally:
+        index_db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
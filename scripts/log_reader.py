@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+RSVShop 로그 리더
+logs/ 아래 여러 형식(pm2/서버 텍스트 로그, 콘솔·에러·네트워크 JSON 덤프, DOM/디버그 리포트)을
+공통 레코드 {ts, source, severity, message, file, line}로 읽는 API.
+log_archive.py가 만든 일별 압축 아카이브도 원본 파일과 같은 레코드로 읽는다
+"""
+
+import html
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+SEVERITIES = ("error", "warn", "info", "debug")
+MAX_MESSAGE = 4000
+
+TS_PREFIX_RE = re.compile(
+    r"^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?Z?)\]?:?\s?")
+ERROR_RE = re.compile(r"error|exception|fail|fatal|❌|실패|오류|에러", re.IGNORECASE)
+WARN_RE = re.compile(r"warn|⚠|경고", re.IGNORECASE)
+TAG_RE = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+SPACE_RE = re.compile(r"\s+")
+
+# 파일명 패턴 → (source, 형식). 순서대로 첫 일치 사용
+SOURCE_PATTERNS = [
+    (re.compile(r"^\d{4}-\d{2}-\d{2}\.dumps\.xz$"), "archive", "archive"),
+    (re.compile(r"^events-\d{8}\.jsonl$"), "collector", "jsonl"),
+    (re.compile(r"^pm2-(out|error|combined)-\d+\.log$"), "pm2", "text"),
+    (re.compile(r"^console-(logs-)?\d+\.json$"), "console", "entries"),
+    (re.compile(r"^console-logs\.json$"), "console", "entries"),
+    (re.compile(r"^error-log-\d+\.json$"), "error-log", "entries"),
+    (re.compile(r"^network-requests-\d+\.json$"), "network", "network"),
+    (re.compile(r"^browser-errors\.json$"), "browser", "entries"),
+    (re.compile(r"^fixed-errors\.json$"), "fixed", "entries"),
+    (re.compile(r"^debug-result-\d+\.json$"), "debug", "debug"),
+    (re.compile(r"^dom-info-\d+\.json$"), "dom", "document"),
+    (re.compile(r"^dom-\d+\.html$"), "dom", "document"),
+    (re.compile(r"^report-\d+\.html$"), "report", "document"),
+    (re.compile(r".*\.(md|txt)$"), "report", "document"),
+    (re.compile(r".*\.(log|out)$"), "server", "text"),
+]
+
+
+def classify(path):
+    """(source, 형식) 또는 색인 대상이 아니면 None"""
+    name = os.path.basename(path)
+    for pattern, source, kind in SOURCE_PATTERNS:
+        if pattern.match(name):
+            return source, kind
+    return None
+
+
+def parse_ts(value):
+    """ISO 문자열/에포크(초·ms)를 에포크 초로. 해석할 수 없으면 None"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > 1e11 else float(value)
+    text = str(value).strip()
+    if text.isdigit():
+        return parse_ts(int(text))
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()  # 접두사 없는 시각은 로컬 시간
+    return parsed.timestamp()
+
+
+def format_ts(ts):
+    if ts is None:
+        return "-"
+    return datetime.fromtimestamp(ts, timezone.utc).astimezone().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def guess_severity(text, default="info"):
+    if ERROR_RE.search(text):
+        return "error"
+    if WARN_RE.search(text):
+        return "warn"
+    return default
+
+
+def normalize_severity(value, text=""):
+    value = str(value or "").lower()
+    if value in ("error", "fatal", "javascript", "unhandledrejection", "server", "database", "network"):
+        return "error"
+    if value in ("warn", "warning"):
+        return "warn"
+    if value in ("debug", "trace", "verbose"):
+        return "debug"
+    return guess_severity(text) if value in ("", "log") else "info"
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _record(ts, source, severity, message, name, line):
+    return {"ts": ts, "source": source, "severity": severity, "message": message[:MAX_MESSAGE],
+            "file": name, "line": line}
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return json.load(f)
+
+
+def read_text(path, source, offset=0, fallback_ts=None, line_no=0):
+    """줄 단위 로그. 완결된 줄만 읽고 각 레코드에 다음 읽기 위치(end)와 그때까지의 줄 수(lines)를 기록
+
+    offset부터 이어 읽을 때는 offset까지의 줄 수를 line_no로 넘겨야 줄 번호가 1부터 다시 시작하지 않는다.
+    """
+    default = "error" if "-error-" in os.path.basename(path) else "info"
+    last_ts = fallback_ts
+    with open(path, "rb") as f:
+        f.seek(offset)
+        position = offset
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            position += len(raw)
+            line_no += 1
+            text = raw.decode("utf-8", errors="replace").strip()
+            match = TS_PREFIX_RE.match(text)
+            if match:
+                last_ts = parse_ts(match.group(1)) or last_ts
+                text = text[match.end():].strip()
+            if not text:
+                continue
+            record = _record(last_ts, source, guess_severity(text, default), text, os.path.basename(path), line_no)
+            record["end"] = position
+            record["lines"] = line_no
+            yield record
+
+
+def read_jsonl(path, source, offset=0, fallback_ts=None, line_no=0):
+    """event_collector.py 세그먼트. 줄마다 이벤트 하나, 텍스트 로그처럼 이어 읽기 지원 (line_no는 read_text와 같음)"""
+    name = os.path.basename(path)
+    with open(path, "rb") as f:
+        f.seek(offset)
+        position = offset
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            position += len(raw)
+            line_no += 1
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                continue
+            for record in read_entries([entry], name, source, fallback_ts):
+                record["line"] = line_no
+                record["end"] = position
+                record["lines"] = line_no
+                yield record
+
+
+def read_entries(data, name, source, fallback_ts=None):
+    """[{type, message|text, timestamp|time, ...}] 또는 {"errors"|"logs": [...]} 형태의 JSON 덤프"""
+    if isinstance(data, dict):
+        data = data.get("errors") or data.get("logs") or data.get("entries") or []
+    for index, entry in enumerate(data if isinstance(data, list) else [], 1):
+        if not isinstance(entry, dict):
+            continue
+        message = _text(entry.get("message") or entry.get("text") or entry.get("line"))
+        details = entry.get("details") or entry.get("stack")
+        if details:
+            message = f"{message} {_text(details)}".strip()
+        if entry.get("url") or entry.get("filename"):
+            message += f" @ {entry.get('url') or entry.get('filename')}"
+        ts = parse_ts(entry.get("timestamp") or entry.get("time") or entry.get("fixedAt")) or fallback_ts
+        severity = "info" if source == "fixed" else normalize_severity(_text(entry.get("type")), message)
+        yield _record(ts, source, severity, message, name, index)
+
+
+def read_network(data, name, source, fallback_ts=None):
+    for index, entry in enumerate(data if isinstance(data, list) else [], 1):
+        if not isinstance(entry, dict):
+            continue
+        status = entry.get("status")
+        failure = entry.get("failure") or entry.get("errorText")
+        parts = [entry.get("method") or "", str(status or ""), entry.get("url", ""), _text(failure)]
+        severity = "error" if failure or (isinstance(status, int) and status >= 400) else "info"
+        yield _record(parse_ts(entry.get("time")) or fallback_ts, source, severity,
+                      " ".join(p for p in parts if p), name, index)
+
+
+def _flatten_strings(value, out, limit=MAX_MESSAGE):
+    if sum(len(s) for s in out) > limit:
+        return
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in ("attributes", "headers"):
+                _flatten_strings(item, out, limit)
+    elif isinstance(value, list):
+        for item in value:
+            _flatten_strings(item, out, limit)
+
+
+def read_document(data, name, source, fallback_ts=None):
+    """리포트/DOM 파일은 본문 텍스트 하나를 레코드 하나로 (data: JSON 값 또는 파일 텍스트)"""
+    if isinstance(data, str):
+        text = html.unescape(TAG_RE.sub(" ", data)) if name.endswith(".html") else data
+    else:
+        parts = []
+        _flatten_strings(data, parts)
+        text = " ".join(parts)
+    text = SPACE_RE.sub(" ", text).strip()
+    if text:
+        yield _record(fallback_ts, source, guess_severity(text[:500]) if source == "report" else "info",
+                      text, name, 1)
+
+
+def read_debug(data, name, source, fallback_ts=None):
+    ts = parse_ts(data.get("timestamp")) or fallback_ts
+    yield _record(ts, source, "info", f"{data.get('url', '')} {data.get('pageInfo', {}).get('title', '')}".strip(),
+                  name, 1)
+    for index, entry in enumerate(data.get("consoleLogs") or [], 2):
+        message = _text(entry.get("text") or entry.get("message"))
+        yield _record(parse_ts(entry.get("time")) or ts, "console", normalize_severity(entry.get("type"), message),
+                      message, name, index)
+
+
+READERS = {"entries": read_entries, "network": read_network, "document": read_document, "debug": read_debug}
+
+
+def load_content(path):
+    """레코드 변환에 쓰는 파일 내용: JSON이면 파싱한 값, 아니면 텍스트"""
+    if path.endswith(".json"):
+        return _load_json(path)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def records_from_content(name, content, fallback_ts=None):
+    """이미 읽어 둔 파일 내용(load_content 결과)을 레코드로. 아카이브 리더가 사용"""
+    kind = classify(name)
+    if kind is None or kind[1] in ("text", "jsonl", "archive"):
+        return iter(())
+    source, form = kind
+    return READERS[form](content, name, source, fallback_ts)
+
+
+def read_records(path, offset=0, line_no=0):
+    """파일 하나의 레코드 이터레이터. 텍스트 로그는 offset 바이트(그 앞까지 line_no줄)부터 이어 읽는다"""
+    kind = classify(path)
+    if kind is None:
+        return iter(())
+    source, form = kind
+    if form == "archive":
+        from log_archive import read_archive_records
+        return read_archive_records(path)
+    fallback_ts = os.path.getmtime(path)
+    if form == "text":
+        return read_text(path, source, offset, fallback_ts, line_no)
+    if form == "jsonl":
+        return read_jsonl(path, source, offset, fallback_ts, line_no)
+    return records_from_content(os.path.basename(path), load_content(path), fallback_ts)
+
+
+def iter_log_files(logs_dir="logs"):
+    """색인 대상 파일 경로 (하위 디렉토리 포함, 숨김 항목 제외)"""
+    for current, dirs, files in os.walk(logs_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if not name.startswith(".") and classify(name):
+                yield os.path.join(current, name)
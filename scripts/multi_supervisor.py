@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+RSVShop 멀티 앱 슈퍼바이저
+config/apps.json에 선언한 앱들(관리자 4900, 고객 스토어프론트 5990 등)을 asyncio 이벤트 루프 하나에서
+함께 관리한다. 앱마다 명령/포트/환경 변수/헬스 체크 경로/리소스 예산을 갖고, 출력 수집·헬스 체크·
+재시작(지수 백오프)은 모두 같은 루프의 코루틴이라 앱이 늘어도 스레드/폴링 프로세스가 늘지 않는다.
+앱마다 라이프사이클 이벤트(starting, listening, warmed, ready, crashed, restarting, stopped)를 발행한다
+(rsvshop/events.py, rsvshop events로 확인).
+
+앱 설정 항목:
+  name, command(["npx", "next", "start", "-p", "{port}"]), port, env, cwd, health("/api/ping"),
+  build(true면 시작 전에 build_cache.py로 캐시된 프로덕션 빌드 확인),
+  budget{memory_mb: 프로세스 트리 RSS 상한(넘으면 재시작), heap_mb: --max-old-space-size, cpus: cgroup CPU 쿼터},
+  health_interval, health_timeout, start_timeout, unhealthy_after, max_restarts, backoff, backoff_max
+
+사용법:
+  python scripts/multi_supervisor.py start [--config config/apps.json] [--only admin,customer]
+  python scripts/multi_supervisor.py status
+  python scripts/multi_supervisor.py stop
+  python scripts/multi_supervisor.py check [--config ...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import sys
+import time
+from datetime import datetime
+
+import node_tuning
+from async_http import ConnectionPool, HttpError
+from rsvshop.events import Publisher
+from supervisor_metrics import MetricsRegistry, MetricsServer
+
+DEFAULT_CONFIG = "config/apps.json"
+STATE_FILE = "logs/multi-supervisor.state.json"
+LOG_FILE = "logs/multi-supervisor.log"
+APP_LOG_DIR = "logs/apps"
+READY_RE = re.compile(r"Ready in|ready started server|Local:\s+http", re.IGNORECASE)
+# 출력 줄 → 라이프사이클 이벤트 (실행마다 한 번씩)
+LIFECYCLE_LINES = (
+    ("listening", re.compile(r"ready started server|Local:\s+http", re.IGNORECASE)),
+    ("warmed", re.compile(r"Ready in|ready started server", re.IGNORECASE)),
+)
+APP_DEFAULTS = {
+    "cwd": ".",
+    "env": {},
+    "health": "/api/ping",
+    "build": False,
+    "budget": {},
+    "health_interval": 10.0,
+    "health_timeout": 5.0,
+    "start_timeout": 180.0,  # 이 시간 안에 첫 헬스 체크를 통과하지 못하면 재시작
+    "unhealthy_after": 3,  # 연속 실패 횟수
+    "max_restarts": 10,
+    "backoff": 1.0,
+    "backoff_max": 60.0,
+    "reset_after": 300.0,  # 이 시간 이상 살아 있었으면 재시작 횟수 초기화
+}
+RESOURCE_INTERVAL = 5.0
+BUDGET_STRIKES = 2  # 예산 초과가 연속 이 횟수면 재시작
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class ConfigError(Exception):
+    pass
+
+
+def load_apps(path=DEFAULT_CONFIG, only=None):
+    """설정 파일을 읽어 기본값을 채운 앱 목록. 잘못된 설정은 ConfigError"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"설정 파일을 읽을 수 없습니다: {path} ({e})")
+    apps = []
+    for raw in data.get("apps", []):
+        app = {**APP_DEFAULTS, **raw}
+        name = app.get("name")
+        if not name or not re.match(r"^[\w.-]+$", name):
+            raise ConfigError(f"앱 이름이 없거나 올바르지 않습니다: {name!r}")
+        if not isinstance(app.get("port"), int):
+            raise ConfigError(f"{name}: port는 정수여야 합니다")
+        command = app.get("command")
+        if isinstance(command, str):
+            command = command.split()
+        if not command:
+            raise ConfigError(f"{name}: command가 없습니다")
+        app["command"] = [str(part).replace("{port}", str(app["port"])) for part in command]
+        app["env"] = {key: str(value).replace("{port}", str(app["port"])) for key, value in app["env"].items()}
+        apps.append(app)
+    names = [app["name"] for app in apps]
+    ports = [app["port"] for app in apps]
+    if len(set(names)) != len(names) or len(set(ports)) != len(ports):
+        raise ConfigError("앱 이름과 포트는 서로 달라야 합니다")
+    if only:
+        unknown = set(only) - set(names)
+        if unknown:
+            raise ConfigError(f"설정에 없는 앱: {', '.join(sorted(unknown))}")
+        apps = [app for app in apps if app["name"] in only]
+    return apps
+
+
+def scan_processes():
+    """/proc 한 번 훑어서 {pid: (ppid, rss_bytes, cpu_seconds)}. /proc이 없으면 빈 dict"""
+    table = {}
+    try:
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return table
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", "r") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            table[pid] = (int(fields[1]), int(fields[21]) * PAGE_SIZE, (int(fields[11]) + int(fields[12])) / CLK_TCK)
+        except (OSError, IndexError, ValueError):
+            pass
+    return table
+
+
+def tree_usage(table, root_pid):
+    """root_pid와 모든 후손의 (RSS 합, CPU 시간 합)"""
+    children = {}
+    for pid, (ppid, _, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    rss = cpu = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        if pid in table:
+            rss += table[pid][1]
+            cpu += table[pid][2]
+        stack.extend(children.get(pid, ()))
+    return rss, cpu
+
+
+class AppSupervisor:
+    """앱 하나: 실행 → 종료/재시작 요청 대기 → 백오프 후 재실행"""
+
+    def __init__(self, config, metrics, plan=None, log=print, echo=True, events=None):
+        self.config = config
+        self.name = config["name"]
+        self.port = config["port"]
+        self.log = lambda message: log(f"[{self.name}] {message}")
+        self.echo = echo
+        self.events = events
+        self.announced = set()
+        self.plan = plan
+        self.cgroup_path = None
+        self.process = None
+        self.state = "stopped"
+        self.stopping = False
+        self.restarts = 0
+        self.restart_total = 0
+        self.restart_reason = None
+        self.restart_event = asyncio.Event()
+        self.stop_event = asyncio.Event()
+        self.spawned_at = None
+        self.ready_at = None
+        self.health_failures = 0
+        self.budget_strikes = 0
+        self.last_health = None
+        self.rss_bytes = 0
+        self.cpu_seconds = 0.0
+        self.pool = ConnectionPool("127.0.0.1", self.port, size=1, timeout=config["health_timeout"])
+        self.m_up = metrics["up"].labels(app=self.name)
+        self.m_ready = metrics["ready"].labels(app=self.name)
+        self.m_rss = metrics["rss"].labels(app=self.name)
+        self.metrics = metrics
+
+    # 실행 ---------------------------------------------------------------
+
+    def publish(self, event, **fields):
+        if self.events is None:
+            return
+        self.announced.add(event)
+        fields.setdefault("pid", self.process.pid if self.process else None)
+        self.events.publish(event, self.name, port=self.port, **fields)
+
+    def _env(self):
+        env = {**os.environ, **self.config["env"], "PORT": str(self.port)}
+        plan = dict(self.plan) if self.plan else None
+        heap_mb = self.config["budget"].get("heap_mb")
+        if plan and heap_mb:
+            plan["heap_mb"] = heap_mb
+        elif heap_mb:
+            env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --max-old-space-size={heap_mb}".strip()
+        return node_tuning.build_node_env(env, plan)
+
+    async def _spawn(self):
+        self.state = "starting"
+        self.announced = set()
+        self.ready_at = None
+        self.health_failures = 0
+        self.budget_strikes = 0
+        os.makedirs(APP_LOG_DIR, exist_ok=True)
+        self.process = await asyncio.create_subprocess_exec(
+            *self.config["command"],
+            cwd=self.config["cwd"],
+            env=self._env(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            stdin=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        node_tuning.apply_to_process(self.process.pid, self.plan, self.cgroup_path)
+        self.spawned_at = time.monotonic()
+        self.m_up.set(1)
+        self.log(f"🚀 시작 (PID {self.process.pid}, 포트 {self.port}): {' '.join(self.config['command'])}")
+        self.publish("starting")
+
+    async def _drain(self, process):
+        """자식 출력을 logs/apps/<이름>.log로 옮기고 Ready 로그를 감지"""
+        with open(os.path.join(APP_LOG_DIR, f"{self.name}.log"), "a", encoding="utf-8") as out:
+            while True:
+                raw = await process.stdout.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8", errors="replace").rstrip()
+                out.write(f"{datetime.now().isoformat(timespec='milliseconds')} {line}\n")
+                out.flush()
+                if self.echo:
+                    print(f"[{self.name}] {line}")
+                if self.state == "starting" and READY_RE.search(line):
+                    self.state = "listening"
+                for event, pattern in LIFECYCLE_LINES:
+                    if event not in self.announced and pattern.search(line):
+                        self.publish(event)
+
+    async def _terminate(self, timeout=10):
+        """프로세스 그룹에 SIGTERM, timeout 뒤에도 살아 있으면 SIGKILL"""
+        process = self.process
+        if process is None or process.returncode is not None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.log("⚠️ 정상 종료되지 않아 강제 종료합니다")
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+            await process.wait()
+
+    def request_restart(self, kind, detail):
+        """kind: 메트릭 라벨용 분류 (health, start_timeout, memory), detail: 로그용 설명"""
+        if self.restart_reason is None:
+            self.restart_reason = (kind, detail)
+            self.restart_event.set()
+
+    async def run(self):
+        if self.plan and os.environ.get("RSVSHOP_CGROUP") == "1":
+            self.cgroup_path = node_tuning.prepare_cgroup(self.name, self.plan)
+        while not self.stopping:
+            try:
+                await self._spawn()
+            except OSError as e:
+                self.log(f"❌ 시작 실패: {e}")
+                kind = "spawn"
+                self.publish("crashed", pid=None, reason="spawn", error=str(e))
+            else:
+                drain = asyncio.ensure_future(self._drain(self.process))
+                exited = asyncio.ensure_future(self.process.wait())
+                waits = {exited, asyncio.ensure_future(self.restart_event.wait()),
+                         asyncio.ensure_future(self.stop_event.wait())}
+                done, pending = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+                for task in pending - {exited}:
+                    task.cancel()
+                if exited not in done:
+                    await self._terminate()
+                await drain
+                kind, detail = self.restart_reason or ("exit", f"종료 코드 {self.process.returncode}")
+                self.m_up.set(0)
+                self.m_ready.set(0)
+                if self.stopping:
+                    break
+                if kind == "exit":
+                    self.publish("crashed", code=self.process.returncode)
+                if time.monotonic() - self.spawned_at >= self.config["reset_after"]:
+                    self.restarts = 0
+                self.log(f"🔄 재시작 필요: {detail}")
+            self.restart_reason = None
+            self.restart_event.clear()
+            self.restarts += 1
+            self.restart_total += 1
+            self.metrics["restarts"].labels(app=self.name, reason=kind).inc()
+            if self.restarts > self.config["max_restarts"]:
+                self.state = "failed"
+                self.log(f"❌ 최대 재시작 횟수 초과 ({self.config['max_restarts']}회) - 수동 조치가 필요합니다")
+                self.publish("stopped", reason="failed")
+                break
+            delay = min(self.config["backoff"] * 2 ** (self.restarts - 1), self.config["backoff_max"])
+            self.state = "backoff"
+            self.log(f"⏳ {delay:g}초 후 재시작 ({self.restarts}/{self.config['max_restarts']})")
+            self.publish("restarting", reason=kind, delay=delay, attempt=self.restarts)
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        if self.state != "failed":
+            self.state = "stopped"
+            self.publish("stopped", reason="stop")
+        self.pool.close()
+
+    async def stop(self):
+        self.stopping = True
+        self.stop_event.set()
+
+    # 헬스/리소스 -----------------------------------------------------------
+
+    async def health_loop(self):
+        interval = self.config["health_interval"]
+        while not self.stopping and self.state != "failed":
+            await asyncio.sleep(min(interval, 1.0) if self.state in ("starting", "listening") else interval)
+            if self.process is None or self.process.returncode is not None or self.state == "backoff":
+                continue
+            started = time.monotonic()
+            try:
+                response = await asyncio.wait_for(self.pool.get(self.config["health"]), self.config["health_timeout"])
+                healthy = response.status < 500
+                detail = f"HTTP {response.status}"
+            except (OSError, HttpError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                healthy = False
+                detail = type(e).__name__
+            latency = time.monotonic() - started
+            self.metrics["health_latency"].labels(app=self.name).observe(latency)
+            self.last_health = {"ok": healthy, "detail": detail, "latency_ms": round(latency * 1000, 1),
+                                "at": datetime.now().isoformat(timespec="seconds")}
+            if healthy:
+                if self.state != "ready":
+                    self.publish("ready", latency_ms=self.last_health["latency_ms"])
+                if self.ready_at is None:
+                    self.ready_at = time.monotonic()
+                    self.log(f"✅ 준비 완료 ({self.ready_at - self.spawned_at:.1f}초)")
+                    self.metrics["time_to_ready"].labels(app=self.name).observe(self.ready_at - self.spawned_at)
+                self.state = "ready"
+                self.health_failures = 0
+                self.m_ready.set(1)
+                continue
+            self.m_ready.set(0)
+            if self.ready_at is None:
+                # 아직 한 번도 준비되지 않음: 컴파일/빌드 로드 시간은 start_timeout까지 기다린다
+                if time.monotonic() - self.spawned_at > self.config["start_timeout"]:
+                    self.request_restart("start_timeout", f"시작 시간 초과 ({self.config['start_timeout']:.0f}초)")
+                continue
+            self.health_failures += 1
+            self.state = "unhealthy"
+            if self.health_failures >= self.config["unhealthy_after"]:
+                self.request_restart("health", f"헬스 체크 {self.health_failures}회 연속 실패 ({detail})")
+
+    def check_budget(self, rss_bytes, cpu_seconds):
+        self.rss_bytes = rss_bytes
+        self.cpu_seconds = cpu_seconds
+        self.m_rss.set(rss_bytes)
+        limit_mb = self.config["budget"].get("memory_mb")
+        if not limit_mb or self.process is None or self.process.returncode is not None:
+            return
+        if rss_bytes > limit_mb * 1024 * 1024:
+            self.budget_strikes += 1
+            if self.budget_strikes >= BUDGET_STRIKES:
+                self.request_restart("memory", f"메모리 예산 초과 ({rss_bytes / 1024 / 1024:.0f}MB > {limit_mb}MB)")
+        else:
+            self.budget_strikes = 0
+
+    def snapshot(self):
+        alive = self.process is not None and self.process.returncode is None
+        return {
+            "state": self.state,
+            "pid": self.process.pid if alive else None,
+            "port": self.port,
+            "restarts": self.restart_total,
+            "uptime": round(time.monotonic() - self.spawned_at, 1) if alive and self.spawned_at else 0,
+            "rss_mb": round(self.rss_bytes / 1024 / 1024, 1),
+            "cpu_seconds": round(self.cpu_seconds, 1),
+            "memory_budget_mb": self.config["budget"].get("memory_mb"),
+            "health": self.last_health,
+        }
+
+
+class MultiSupervisor:
+    def __init__(self, apps, metrics_port=None, echo=True):
+        self.apps_config = apps
+        self.echo = echo
+        if metrics_port is None:
+            try:
+                metrics_port = int(os.environ.get("RSVSHOP_MULTI_METRICS_PORT", "9466"))
+            except ValueError:
+                metrics_port = 9466
+        self.metrics_port = metrics_port
+        self.registry = MetricsRegistry()
+        self.metrics = {
+            "up": self.registry.gauge("rsvshop_app_up", "앱 프로세스 실행 여부", ["app"]),
+            "ready": self.registry.gauge("rsvshop_app_ready", "헬스 체크 통과 여부", ["app"]),
+            "rss": self.registry.gauge("rsvshop_app_resident_memory_bytes", "앱 프로세스 트리 RSS", ["app"]),
+            "restarts": self.registry.counter("rsvshop_app_restarts_total", "앱 재시작 횟수", ["app", "reason"]),
+            "health_latency": self.registry.histogram(
+                "rsvshop_app_health_latency_seconds", "헬스 체크 응답 시간", ["app"],
+                buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)),
+            "time_to_ready": self.registry.histogram(
+                "rsvshop_app_time_to_ready_seconds", "시작부터 첫 헬스 체크 통과까지", ["app"],
+                buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180)),
+        }
+        self.apps = []
+        self.stopping = None
+        self.events = None
+
+    def log(self, message):
+        line = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {message}"
+        print(line)
+        try:
+            with open(LOG_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+    def write_state(self):
+        state = {"supervisor_pid": os.getpid(), "updated_at": datetime.now().isoformat(timespec="seconds"),
+                 "apps": {app.name: app.snapshot() for app in self.apps}}
+        temp = STATE_FILE + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(temp, STATE_FILE)
+
+    async def resource_loop(self):
+        """모든 앱의 RSS/CPU를 /proc 한 번 훑어서 함께 계산"""
+        while not self.stopping.is_set():
+            table = scan_processes()
+            for app in self.apps:
+                if app.process is not None and app.process.returncode is None and table:
+                    app.check_budget(*tree_usage(table, app.process.pid))
+            self.write_state()
+            try:
+                await asyncio.wait_for(self.stopping.wait(), RESOURCE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def prepare_build(self):
+        """build: true인 앱이 있으면 캐시된 프로덕션 빌드를 한 번 확인 (블로킹 작업은 스레드에서)"""
+        if not any(app["build"] for app in self.apps_config):
+            return True
+        import build_cache
+        cache = build_cache.BuildCache(log=self.log)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, cache.ensure_build)
+        except build_cache.BuildError as e:
+            if cache.active_hash() is None:
+                self.log(f"❌ 프로덕션 빌드를 준비하지 못했습니다: {e}")
+                return False
+            self.log(f"⚠️ {e} - 기존 빌드로 시작합니다")
+        return True
+
+    async def run(self):
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, self.stopping.set)
+        if self.metrics_port:
+            try:
+                MetricsServer(self.registry, port=self.metrics_port).start()
+                self.log(f"📈 메트릭: http://127.0.0.1:{self.metrics_port}/metrics")
+            except OSError as e:
+                self.log(f"⚠️ 메트릭 서버 시작 실패: {e}")
+        if not await self.prepare_build():
+            return 1
+        self.events = Publisher(log=self.log)
+
+        resources = node_tuning.detect_resources()
+        for index, config in enumerate(self.apps_config):
+            # 호스트 자원을 앱 수로 나눈 튜닝 계획 (budget.heap_mb가 있으면 그 값을 우선)
+            plan = node_tuning.plan_from_env(resources, workers=len(self.apps_config), worker_index=index)
+            if plan and config["budget"].get("memory_mb"):
+                plan["memory_max_bytes"] = config["budget"]["memory_mb"] * 1024 * 1024
+            if plan and config["budget"].get("cpus"):
+                plan["cpu_quota"] = config["budget"]["cpus"]
+            self.apps.append(AppSupervisor(config, self.metrics, plan, self.log, self.echo, self.events))
+        self.log("🛡️ 멀티 앱 슈퍼바이저 시작: " +
+                 ", ".join(f"{app.name}:{app.port}" for app in self.apps))
+
+        tasks = [asyncio.ensure_future(app.run()) for app in self.apps]
+        tasks += [asyncio.ensure_future(app.health_loop()) for app in self.apps]
+        tasks.append(asyncio.ensure_future(self.resource_loop()))
+        runners = asyncio.gather(*tasks[:len(self.apps)])
+        stop_wait = asyncio.ensure_future(self.stopping.wait())
+        await asyncio.wait({runners, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+
+        self.log("🛑 모든 앱을 종료합니다...")
+        self.stopping.set()
+        await asyncio.gather(*(app.stop() for app in self.apps))
+        await runners
+        for task in tasks[len(self.apps):]:
+            task.cancel()
+        await asyncio.gather(*tasks[len(self.apps):], return_exceptions=True)
+        self.write_state()
+        if os.path.exists(STATE_FILE):
+            os.remove(STATE_FILE)
+        self.log("✅ 종료 완료")
+        return 0
+
+
+def read_state():
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.kill(state["supervisor_pid"], 0)
+    except (OSError, KeyError, TypeError):
+        return None
+    return state
+
+
+def print_status(state):
+    if state is None:
+        print("🔴 실행 중인 멀티 앱 슈퍼바이저가 없습니다.")
+        return 1
+    print(f"🛡️ 멀티 앱 슈퍼바이저 (PID {state['supervisor_pid']}, 갱신 {state['updated_at']})")
+    for name, app in state["apps"].items():
+        icon = {"ready": "🟢", "starting": "🟡", "listening": "🟡", "unhealthy": "🟠",
+                "backoff": "🟠"}.get(app["state"], "🔴")
+        health = app.get("health") or {}
+        budget = f"/{app['memory_budget_mb']}MB" if app.get("memory_budget_mb") else "MB"
+        print(f"  {icon} {name:<10} :{app['port']:<5} {app['state']:<9} PID {app['pid'] or '-':<7} "
+              f"가동 {app['uptime']:.0f}초  RSS {app['rss_mb']:.0f}{budget}  재시작 {app['restarts']}회  "
+              f"헬스 {health.get('detail', '-')} {health.get('latency_ms', '-')}ms")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 멀티 앱 슈퍼바이저")
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    sub = parser.add_subparsers(dest="command")
+    start = sub.add_parser("start", help="설정된 앱을 모두 시작하고 감시")
+    start.add_argument("--only", help="쉼표로 구분한 앱 이름만")
+    start.add_argument("--quiet", action="store_true", help="앱 출력을 콘솔에 표시하지 않음 (logs/apps/에만 기록)")
+    start.add_argument("--metrics-port", type=int, default=None, help="0이면 비활성화")
+    sub.add_parser("status", help="실행 중인 슈퍼바이저의 앱 상태")
+    sub.add_parser("stop", help="실행 중인 슈퍼바이저와 모든 앱 종료")
+    sub.add_parser("check", help="설정 검증")
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        if read_state() is not None:
+            print("⚠️ 이미 실행 중입니다 (status로 확인).")
+            return 1
+        try:
+            apps = load_apps(args.config, args.only.split(",") if args.only else None)
+        except ConfigError as e:
+            print(f"❌ {e}")
+            return 1
+        return asyncio.run(MultiSupervisor(apps, args.metrics_port, echo=not args.quiet).run())
+    if args.command == "status":
+        return print_status(read_state())
+    if args.command == "stop":
+        state = read_state()
+        if state is None:
+            print("실행 중인 슈퍼바이저가 없습니다.")
+            return 0
+        os.kill(state["supervisor_pid"], signal.SIGTERM)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline and read_state() is not None:
+            time.sleep(0.2)
+        print("✅ 종료했습니다." if read_state() is None else "⚠️ 30초 안에 종료되지 않았습니다.")
+        return 0
+    if args.command == "check":
+        try:
+            apps = load_apps(args.config)
+        except ConfigError as e:
+            print(f"❌ {e}")
+            return 1
+        for app in apps:
+            print(f"✅ {app['name']}: :{app['port']} {' '.join(app['command'])}  헬스 {app['health']}  "
+                  f"예산 {app['budget'] or '-'}{'  (빌드 캐시 사용)' if app['build'] else ''}")
+        return 0
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+RSVShop Next.js 출력 파서
+next dev 출력의 컴파일/요청 로그를 구조화된 이벤트로 변환하고 라우트별로 집계
+
+  ✓ Compiled /admin in 3.2s (1234 modules)   -> compile 이벤트
+  GET /api/admin/reservations 200 in 85ms     -> request 이벤트
+
+로그 출력 스레드는 feed()로 큐에 넣기만 하고, 파싱/집계는 별도 스레드에서 한다.
+큐가 가득 차면 라인을 버리고 개수만 센다 (자식 프로세스 stdout을 절대 막지 않음).
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+
+COMPILED_RE = re.compile(r"Compiled (\S+) in ([\d.]+)\s*(ms|s)(?: \((\d+) modules\))?")
+REQUEST_RE = re.compile(r"\b(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS) (\S+) (\d{3}) in ([\d.]+)\s*(ms|s)\b")
+ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+# 라우트 카디널리티 제한: 숫자, UUID, cuid 세그먼트를 [id]로 치환
+ID_SEGMENT_RE = re.compile(
+    r"/(?:\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|c[a-z0-9]{20,})(?=/|$)",
+    re.IGNORECASE,
+)
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def parse_duration(value, unit):
+    """Next.js 로그의 '85ms' / '3.2s' 표기를 초 단위로 변환"""
+    seconds = float(value)
+    return seconds / 1000 if unit == "ms" else seconds
+
+
+def normalize_route(path):
+    """쿼리스트링 제거 및 동적 세그먼트 정규화"""
+    path = path.split("?", 1)[0]
+    return ID_SEGMENT_RE.sub("/[id]", path) or "/"
+
+
+def parse_line(line):
+    """한 줄을 파싱하여 이벤트 dict 반환 (해당 없으면 None)"""
+    if "Compiled" in line:
+        match = COMPILED_RE.search(line)
+        if match:
+            return {
+                "type": "compile",
+                "route": match.group(1),
+                "seconds": parse_duration(match.group(2), match.group(3)),
+                "modules": int(match.group(4)) if match.group(4) else None,
+            }
+    if " in " in line:
+        match = REQUEST_RE.search(ANSI_RE.sub("", line))
+        if match:
+            return {
+                "type": "request",
+                "method": match.group(1),
+                "route": normalize_route(match.group(2)),
+                "status": int(match.group(3)),
+                "seconds": parse_duration(match.group(4), match.group(5)),
+            }
+    return None
+
+
+class RouteStats:
+    """라우트 하나의 고정 버킷 히스토그램 (메모리 상수). bounds로 버킷 상한(초)을 바꿀 수 있다"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+        self.buckets = [0] * (len(bounds) + 1)
+        self.statuses = {}
+
+    def add(self, seconds, status=None):
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if seconds <= bound:
+                index = i
+                break
+        self.buckets[index] += 1
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def quantile(self, q):
+        """버킷 상한 기준 근사 분위수"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for i, count in enumerate(self.buckets):
+            running += count
+            if running >= target:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 4) if self.count else 0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 4),
+            "last": round(self.last, 4),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+class NextOutputParser:
+    """스트리밍 파서 + 라우트별 집계기"""
+
+    def __init__(self, registry=None, queue_size=10000, top_n=10,
+                 snapshot_file="logs/next-route-stats.json", snapshot_interval=30, log=print):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.top_n = top_n
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self.log = log
+        self.requests = {}
+        self.compiles = {}
+        self.dropped = 0
+        self.parsed = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._dirty = False
+        self.listeners = []
+
+        self.m_request = self.m_compile = self.m_dropped = None
+        if registry is not None:
+            self.m_request = registry.histogram(
+                "rsvshop_next_request_duration_seconds", "Next.js 로그 기준 요청 처리 시간",
+                ["method", "route", "status"], buckets=LATENCY_BUCKETS)
+            self.m_compile = registry.histogram(
+                "rsvshop_next_compile_seconds", "Next.js 라우트 컴파일 시간",
+                ["route"], buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120))
+            self.m_dropped = registry.counter(
+                "rsvshop_next_output_dropped_lines_total", "파서 큐 포화로 버려진 출력 라인 수")
+
+    def feed(self, line):
+        """로그 출력 스레드에서 호출. 절대 블로킹하지 않는다."""
+        try:
+            self.queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+            if self.m_dropped is not None:
+                self.m_dropped.inc()
+
+    def add_listener(self, callback):
+        """구조화된 이벤트를 받을 콜백 등록 (파서 스레드에서 호출됨)"""
+        self.listeners.append(callback)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="next-output-parser", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self.write_snapshot()
+
+    def _run(self):
+        next_snapshot = time.monotonic() + self.snapshot_interval
+        while not self._stop.is_set():
+            timeout = max(0.0, next_snapshot - time.monotonic())
+            try:
+                line = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                line = None
+            if line is not None:
+                event = parse_line(line)
+                if event is not None:
+                    self.handle(event)
+            if time.monotonic() >= next_snapshot:
+                next_snapshot = time.monotonic() + self.snapshot_interval
+                if self._dirty:
+                    self.write_snapshot()
+
+    def handle(self, event):
+        """이벤트를 집계에 반영"""
+        self.parsed += 1
+        self._dirty = True
+        route = event["route"]
+        if event["type"] == "request":
+            key = f"{event['method']} {route}"
+            stats = self.requests.get(key)
+            if stats is None:
+                stats = self.requests[key] = RouteStats()
+            stats.add(event["seconds"], event["status"])
+            if self.m_request is not None:
+                self.m_request.labels(event["method"], route, f"{event['status'] // 100}xx").observe(event["seconds"])
+        else:
+            stats = self.compiles.get(route)
+            if stats is None:
+                stats = self.compiles[route] = RouteStats()
+            stats.add(event["seconds"])
+            if self.m_compile is not None:
+                self.m_compile.labels(route).observe(event["seconds"])
+        for callback in self.listeners:
+            try:
+                callback(event)
+            except Exception:
+                pass
+
+    def top_routes(self, kind="request", n=None, key="p95"):
+        """가장 느린 라우트 상위 N개 [(route, stats_dict), ...]"""
+        source = self.requests if kind == "request" else self.compiles
+        rows = [(route, stats.to_dict()) for route, stats in list(source.items())]
+        rows.sort(key=lambda item: item[1][key], reverse=True)
+        return rows[:n or self.top_n]
+
+    def snapshot(self):
+        return {
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "parsed_events": self.parsed,
+            "dropped_lines": self.dropped,
+            "slowest_requests": self.top_routes("request"),
+            "slowest_compiles": self.top_routes("compile"),
+        }
+
+    def write_snapshot(self):
+        """top-N 스냅샷을 원자적으로 기록 (routes 명령이 읽음)"""
+        if not self.snapshot_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_file) or ".", exist_ok=True)
+            tmp = self.snapshot_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.snapshot_file)
+            self._dirty = False
+        except OSError as e:
+            self.log(f"⚠️ 라우트 통계 저장 실패: {e}")
+
+
+def print_top_routes(snapshot, n=10):
+    """스냅샷의 느린 라우트 상위 N개 출력"""
+    print(f"🐢 느린 라우트 TOP {n} (갱신: {snapshot.get('updated_at', '-')}, "
+          f"이벤트 {snapshot.get('parsed_events', 0)}개, 버려진 라인 {snapshot.get('dropped_lines', 0)}개)")
+    for title, key in (("요청 처리 (p95 기준)", "slowest_requests"), ("컴파일 (p95 기준)", "slowest_compiles")):
+        rows = snapshot.get(key) or []
+        print(f"\n  {title}")
+        if not rows:
+            print("    (기록 없음)")
+            continue
+        print(f"    {'route':<48} {'count':>6} {'p50':>8} {'p95':>8} {'max':>8}")
+        for route, stats in rows[:n]:
+            print(f"    {route:<48} {stats['count']:>6} {stats['p50']:>7.3f}s {stats['p95']:>7.3f}s {stats['max']:>7.3f}s")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+RSVShop Node.js 인스펙터 클라이언트
+실행 중인 Node 프로세스에 SIGUSR1로 인스펙터를 열고 Chrome DevTools Protocol로 명령을 보냄 (표준 라이브러리만 사용)
+"""
+
+import base64
+import json
+import os
+import signal
+import socket
+import struct
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from rsvshop.ports import listening_pids
+
+DEFAULT_INSPECTOR_PORT = 9229
+
+
+class InspectorError(Exception):
+    pass
+
+
+def list_targets(port=DEFAULT_INSPECTOR_PORT, host="127.0.0.1"):
+    """인스펙터 대상 목록 (/json/list)"""
+    with urllib.request.urlopen(f"http://{host}:{port}/json/list", timeout=2) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def inspector_pids(port, targets):
+    """인스펙터 포트를 연 프로세스 PID 목록. 소켓 소유자를 못 찾으면 첫 대상에 붙어 process.pid를 평가"""
+    pids = listening_pids(port)
+    if pids:
+        return pids
+    try:
+        with InspectorSession(targets[0]["webSocketDebuggerUrl"], timeout=5) as session:
+            result = session.call("Runtime.evaluate", {"expression": "process.pid", "returnByValue": True})
+        return [int(result["result"]["value"])]
+    except (InspectorError, OSError, KeyError, TypeError, ValueError):
+        return []
+
+
+def open_inspector(pid, port=DEFAULT_INSPECTOR_PORT, timeout=10):
+    """SIGUSR1로 인스펙터를 열고 webSocketDebuggerUrl 반환 (POSIX 전용)
+
+    포트가 이미 열려 있으면 다른 Node 프로세스의 인스펙터일 수 있으므로 주인 PID가 pid인지 확인한다.
+    """
+    if not hasattr(signal, "SIGUSR1"):
+        raise InspectorError("이 플랫폼은 SIGUSR1을 지원하지 않습니다 (--respawn 모드를 사용하세요)")
+    try:
+        targets = list_targets(port)
+    except (urllib.error.URLError, OSError):
+        os.kill(pid, signal.SIGUSR1)
+        targets = None
+    deadline = time.monotonic() + timeout
+    while targets is None and time.monotonic() < deadline:
+        time.sleep(0.2)
+        try:
+            targets = list_targets(port)
+        except (urllib.error.URLError, OSError):
+            pass
+    if not targets:
+        raise InspectorError(f"인스펙터가 {timeout}초 안에 열리지 않았습니다 (포트 {port})")
+    owners = inspector_pids(port, targets)
+    if pid not in owners:
+        owner = ", ".join(map(str, owners)) or "확인 불가"
+        raise InspectorError(f"포트 {port}의 인스펙터가 PID {pid}의 것이 아닙니다 (소유 PID {owner})")
+    return targets[0]["webSocketDebuggerUrl"]
+
+
+class InspectorSession:
+    """최소한의 WebSocket(RFC 6455) 위에서 동작하는 CDP 세션"""
+
+    def __init__(self, ws_url, timeout=30):
+        self.ws_url = ws_url
+        self.timeout = timeout
+        self.sock = None
+        self._buffer = b""
+        self._next_id = 0
+        self.on_event = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def connect(self):
+        url = urllib.parse.urlparse(self.ws_url)
+        self.sock = socket.create_connection((url.hostname, url.port or 80), timeout=self.timeout)
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        request = (
+            f"GET {url.path or '/'} HTTP/1.1\r\n"
+            f"Host: {url.hostname}:{url.port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        self.sock.sendall(request.encode("ascii"))
+        while b"\r\n\r\n" not in self._buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise InspectorError("웹소켓 핸드셰이크 중 연결이 끊겼습니다")
+            self._buffer += chunk
+        head, self._buffer = self._buffer.split(b"\r\n\r\n", 1)
+        if b" 101 " not in head.split(b"\r\n", 1)[0]:
+            raise InspectorError(f"웹소켓 핸드셰이크 실패: {head[:100]!r}")
+
+    def close(self):
+        if self.sock:
+            try:
+                self._send_frame(0x8, b"")
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
+
+    def _send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        self.sock.sendall(header + mask + _mask(payload, mask))
+
+    def _read_exact(self, size):
+        while len(self._buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                raise InspectorError("인스펙터 연결이 끊겼습니다")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _recv_message(self):
+        fragments = []
+        while True:
+            first, second = self._read_exact(2)
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self._read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self._read_exact(8))[0]
+            mask = self._read_exact(4) if second & 0x80 else None
+            payload = self._read_exact(length)
+            if mask:
+                payload = _mask(payload, mask)
+            if opcode == 0x8:
+                raise InspectorError("인스펙터가 연결을 닫았습니다")
+            if opcode == 0x9:
+                self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            fragments.append(payload)
+            if first & 0x80:
+                return json.loads(b"".join(fragments).decode("utf-8"))
+
+    def send(self, method, params=None):
+        self._next_id += 1
+        message = {"id": self._next_id, "method": method, "params": params or {}}
+        self._send_frame(0x1, json.dumps(message).encode("utf-8"))
+        return self._next_id
+
+    def call(self, method, params=None, timeout=None):
+        """명령을 보내고 결과를 기다림. 도중에 온 이벤트는 on_event로 전달"""
+        message_id = self.send(method, params)
+        self.sock.settimeout(timeout or self.timeout)
+        while True:
+            message = self._recv_message()
+            if message.get("id") == message_id:
+                if "error" in message:
+                    raise InspectorError(f"{method} 실패: {message['error']}")
+                return message.get("result", {})
+            if "method" in message and self.on_event:
+                self.on_event(message["method"], message.get("params", {}))
+
+    def close_inspector(self):
+        """인스펙터 포트를 닫아 프로파일링 오버헤드/노출을 원래대로 되돌림 (실패해도 무시)"""
+        expression = (
+            "(() => { try { const r = (process.mainModule && process.mainModule.require) "
+            "|| (typeof require === 'function' && require); r('inspector').close(); } catch (e) {} })()"
+        )
+        try:
+            self.send("Runtime.evaluate", {"expression": expression})
+        except OSError:
+            pass
+
+
+def _mask(payload, mask):
+    """페이로드 XOR 마스킹 (바이트 단위 루프 대신 int 연산으로 일괄 처리)"""
+    length = len(payload)
+    repeated = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+RSVShop Node.js 리소스 튜닝
+cgroup(v2/v1) 메모리/CPU 제한을 감지하여 NODE_OPTIONS 힙 크기, semi-space, UV_THREADPOOL_SIZE를 산정
+
+환경변수:
+  RSVSHOP_NODE_WORKERS  - 같은 호스트에서 함께 돌릴 Node 워커 수 (기본 1)
+  RSVSHOP_NODE_TUNING   - off로 설정하면 자동 튜닝 비활성화
+  RSVSHOP_CPU_PIN       - 1이면 워커별로 CPU 집합을 나누어 고정 (Linux)
+  RSVSHOP_CGROUP        - 1이면 /sys/fs/cgroup/rsvshop/<이름> 하위에 cgroup v2 제한 적용 (위임 필요)
+
+CPU 고정/cgroup 편입은 spawn 직후 부모가 apply_to_process로 적용한다. preexec_fn은 스레드가 있는
+슈퍼바이저에서 fork 직후 락을 잡으면 교착될 수 있어 쓰지 않는다.
+"""
+
+import os
+import re
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+DEFAULT_MEMORY = 4 * 1024 ** 3
+# cgroup v1에서 "제한 없음"은 거대한 값(페이지 정렬된 int64 최대값)으로 표시된다
+UNLIMITED_THRESHOLD = 1 << 60
+
+MB = 1024 ** 2
+
+
+def _read(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _own_cgroup_path():
+    """현재 프로세스의 cgroup v2 경로 (/proc/self/cgroup의 '0::/...' 항목)"""
+    content = _read("/proc/self/cgroup") or ""
+    for line in content.splitlines():
+        if line.startswith("0::"):
+            return os.path.join(CGROUP_ROOT, line[3:].lstrip("/"))
+    return CGROUP_ROOT
+
+
+def _own_cgroup_v1_path(controller):
+    """현재 프로세스의 cgroup v1 경로 (/proc/self/cgroup의 'N:memory:/...', 'N:cpu,cpuacct:/...' 항목)
+
+    컨테이너에서는 자기 경로가 마운트에 보이지 않고 마운트 루트가 곧 자기 cgroup이므로 그때는 루트를 쓴다.
+    """
+    root = os.path.join(CGROUP_ROOT, controller)
+    content = _read("/proc/self/cgroup") or ""
+    for line in content.splitlines():
+        _, _, rest = line.partition(":")
+        controllers, _, relative = rest.partition(":")
+        if controller in controllers.split(","):
+            path = os.path.join(root, relative.lstrip("/"))
+            return path if os.path.isdir(path) else root
+    return root
+
+
+def detect_memory_limit():
+    """(바이트, 출처) 반환. cgroup 제한 → 물리 메모리 → 기본값 순"""
+    if os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        value = _read(os.path.join(_own_cgroup_path(), "memory.max")) or _read(os.path.join(CGROUP_ROOT, "memory.max"))
+        if value and value != "max":
+            return int(value), "cgroup v2"
+    value = _read(os.path.join(_own_cgroup_v1_path("memory"), "memory.limit_in_bytes"))
+    if value and value.isdigit() and int(value) < UNLIMITED_THRESHOLD:
+        return int(value), "cgroup v1"
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"), "host"
+    except (AttributeError, ValueError, OSError):
+        pass
+    try:
+        import psutil
+        return psutil.virtual_memory().total, "host"
+    except ImportError:
+        return DEFAULT_MEMORY, "default"
+
+
+def available_cpus():
+    """이 프로세스가 실행될 수 있는 CPU 번호 목록"""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+
+def detect_cpu_limit():
+    """(CPU 개수(소수 가능), 출처) 반환. cgroup 쿼터 → affinity → cpu_count 순"""
+    cpus = len(available_cpus())
+    value = _read(os.path.join(_own_cgroup_path(), "cpu.max")) or _read(os.path.join(CGROUP_ROOT, "cpu.max"))
+    if value:
+        quota, _, period = value.partition(" ")
+        if quota != "max" and period:
+            return min(cpus, int(quota) / int(period)), "cgroup v2"
+    cpu_path = _own_cgroup_v1_path("cpu")
+    quota = _read(os.path.join(cpu_path, "cpu.cfs_quota_us"))
+    period = _read(os.path.join(cpu_path, "cpu.cfs_period_us"))
+    if quota and period and quota.lstrip("-").isdigit() and int(quota) > 0:
+        return min(cpus, int(quota) / int(period)), "cgroup v1"
+    return cpus, "affinity"
+
+
+def detect_resources():
+    memory, memory_source = detect_memory_limit()
+    cpus, cpu_source = detect_cpu_limit()
+    return {
+        "memory_bytes": memory,
+        "memory_source": memory_source,
+        "cpus": cpus,
+        "cpu_source": cpu_source,
+        "cpu_ids": available_cpus(),
+    }
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def plan_node_tuning(resources, workers=1, worker_index=0, pin_cpus=False):
+    """워커 하나에 할당할 힙/semi-space/스레드풀/CPU 집합 산정
+
+    메모리 예산의 80%를 워커 수로 나누고, 그중 70%를 old-space로 쓴다.
+    나머지는 semi-space, 코드 공간, 네이티브 버퍼(webpack/SWC) 몫이다.
+    """
+    workers = max(1, workers)
+    budget_mb = resources["memory_bytes"] * 0.8 / workers / MB
+    heap_mb = int(_clamp(budget_mb * 0.7, 256, 8192)) // 64 * 64
+
+    if heap_mb < 1024:
+        semi_space_mb = 16
+    elif heap_mb < 2048:
+        semi_space_mb = 32
+    elif heap_mb < 4096:
+        semi_space_mb = 64
+    else:
+        semi_space_mb = 128
+
+    cpus_per_worker = max(1.0, resources["cpus"] / workers)
+    # libuv 스레드풀은 fs/crypto/zlib 대기용이므로 코어 수보다 넉넉히 잡는다 (Node 기본값 4)
+    threadpool = int(_clamp(round(cpus_per_worker * 2), 4, 64))
+
+    cpuset = None
+    if pin_cpus:
+        ids = resources["cpu_ids"]
+        size = max(1, len(ids) // workers)
+        start = (worker_index % workers) * size
+        cpuset = ids[start:start + size] or ids
+
+    return {
+        "workers": workers,
+        "heap_mb": heap_mb,
+        "semi_space_mb": semi_space_mb,
+        "threadpool": threadpool,
+        "cpuset": cpuset,
+        "memory_max_bytes": int(resources["memory_bytes"] * 0.9 / workers),
+        "cpu_quota": cpus_per_worker,
+    }
+
+
+def plan_from_env(resources=None, workers=None, worker_index=0):
+    """환경변수 설정을 반영한 튜닝 계획 (비활성화 시 None)"""
+    if os.environ.get("RSVSHOP_NODE_TUNING", "").lower() in ("off", "0", "false"):
+        return None
+    if workers is None:
+        try:
+            workers = int(os.environ.get("RSVSHOP_NODE_WORKERS", "1"))
+        except ValueError:
+            workers = 1
+    pin = os.environ.get("RSVSHOP_CPU_PIN") == "1" and hasattr(os, "sched_setaffinity")
+    return plan_node_tuning(resources or detect_resources(), workers, worker_index, pin)
+
+
+def build_node_env(base_env, plan):
+    """NODE_OPTIONS/UV_THREADPOOL_SIZE 적용. 이미 명시된 플래그와 값은 그대로 둔다."""
+    env = dict(base_env)
+    if not plan:
+        return env
+    options = env.get("NODE_OPTIONS", "")
+    extra = []
+    if not re.search(r"--max-old-space-size\b", options):
+        extra.append(f"--max-old-space-size={plan['heap_mb']}")
+    if not re.search(r"--max-semi-space-size\b", options):
+        extra.append(f"--max-semi-space-size={plan['semi_space_mb']}")
+    env["NODE_OPTIONS"] = " ".join(part for part in [options.strip()] + extra if part)
+    env.setdefault("UV_THREADPOOL_SIZE", str(plan["threadpool"]))
+    return env
+
+
+def _enable_controllers(path, wanted=("memory", "cpu")):
+    """path의 하위 그룹에서 memory/cpu 컨트롤러를 쓰도록 cgroup.subtree_control에 +memory +cpu 기록"""
+    available = (_read(os.path.join(path, "cgroup.controllers")) or "").split()
+    enabled = (_read(os.path.join(path, "cgroup.subtree_control")) or "").split()
+    for controller in wanted:
+        if controller in available and controller not in enabled:
+            try:
+                with open(os.path.join(path, "cgroup.subtree_control"), "w") as f:
+                    f.write(f"+{controller}")
+            except OSError:
+                pass  # 권한이 없거나 내부 프로세스 제약 - 제한 파일이 안 생겨 아래에서 걸러진다
+
+
+def prepare_cgroup(name, plan):
+    """cgroup v2 하위 그룹 생성 및 memory.max/memory.high/cpu.max 기록. 실패 시 None
+
+    하위 그룹에 memory.max/cpu.max가 생기려면 부모(루트와 rsvshop/)의 subtree_control에서 컨트롤러를 먼저 켜야 한다.
+    """
+    if not os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        return None
+    parent = os.path.join(CGROUP_ROOT, "rsvshop")
+    path = os.path.join(parent, name)
+    period = 100000
+    limits = [
+        ("memory.max", str(plan["memory_max_bytes"])),
+        ("memory.high", str(int(plan["memory_max_bytes"] * 0.9))),
+        ("cpu.max", f"{int(plan['cpu_quota'] * period)} {period}"),
+    ]
+    try:
+        os.makedirs(parent, exist_ok=True)
+        _enable_controllers(CGROUP_ROOT)
+        _enable_controllers(parent)
+        os.makedirs(path, exist_ok=True)
+        written = 0
+        for filename, value in limits:
+            if os.path.exists(os.path.join(path, filename)):
+                with open(os.path.join(path, filename), "w") as f:
+                    f.write(value)
+                written += 1
+    except OSError:
+        return None
+    return path if written else None
+
+
+def apply_to_process(pid, plan, cgroup_path=None):
+    """spawn 직후 부모에서 자식 PID를 cgroup에 편입하고 CPU를 고정 (Linux 전용, 이후 후손 프로세스에 상속)"""
+    if os.name == "nt" or not plan or not pid:
+        return
+    if cgroup_path:
+        try:
+            with open(os.path.join(cgroup_path, "cgroup.procs"), "w") as f:
+                f.write(str(pid))
+        except OSError:
+            pass
+    if plan["cpuset"]:
+        try:
+            os.sched_setaffinity(pid, plan["cpuset"])
+        except OSError:
+            pass  # 이미 종료했거나 허용되지 않은 CPU
+
+
+def describe(resources, plan):
+    """사람이 읽을 수 있는 요약 문자열"""
+    text = (f"메모리 {resources['memory_bytes'] / MB:.0f}MB ({resources['memory_source']}), "
+            f"CPU {resources['cpus']:g}개 ({resources['cpu_source']})")
+    if not plan:
+        return text + " → 자동 튜닝 비활성화"
+    text += (f" → heap {plan['heap_mb']}MB, semi-space {plan['semi_space_mb']}MB, "
+             f"UV_THREADPOOL_SIZE={plan['threadpool']} (워커 {plan['workers']}개)")
+    if plan["cpuset"]:
+        text += f", CPU 고정 {plan['cpuset']}"
+    return text
@@ -12,7 +12,21 @@ import os
 import json
 import threading
 from datetime import datetime
-import psutil
+
+from supervisor_metrics import MetricsRegistry, MetricsServer
+from startup_profiler import StartupHistory, StartupRun, print_report
+from next_output_parser import NextOutputParser, print_top_routes
+import node_tuning
+import cpu_profile
+import heap_snapshot
+import build_cache
+from node_inspector import InspectorError, InspectorSession, open_inspector
+from rsvshop import ports
+from rsvshop.events import Publisher
+from rsvshop.proc import stop_supervisor
+
+# 시작 단계 → 라이프사이클 이벤트 (포트 바인딩, Next.js "Ready in", 첫 HTTP 200)
+STARTUP_EVENTS = {"port_bound": "listening", "ready": "warmed", "first_200": "ready"}
 
 class PythonServerManager:
     def __init__(self):
@@ -25,6 +39,44 @@ class PythonServerManager:
         self.node_process = None
         self.log_file = "logs/python-server-manager.log"
         self.config_file = "config/server-config.json"
+        # Prometheus 메트릭 엔드포인트 포트 (0이면 비활성화)
+        try:
+            self.metrics_port = int(os.environ.get("RSVSHOP_METRICS_PORT", "9464"))
+        except ValueError:
+            self.metrics_port = 9464
+        self.metrics_server = None
+        self.started_at = time.monotonic()
+        self.spawned_at = None
+        self.exit_detected_at = None
+        self.ready_seen = False
+        self.startup_history_file = "logs/startup-history.db"
+        self.startup_history = None
+        self.startup_run = None
+        self.route_stats_file = "logs/next-route-stats.json"
+        self.node_tuning = None
+        self.cgroup_path = None
+        # RSVSHOP_MODE=production 또는 --prod: 캐시된 빌드로 next start (build_cache.py)
+        self.production = build_cache.production_mode()
+        # 실행 중인 슈퍼바이저 정보 (다른 명령에서 자식 PID/포트를 찾는 데 사용)
+        self.state_file = "logs/python-server-manager.state.json"
+        # 라이프사이클 이벤트 발행 (브라우저 매니저 등이 구독, rsvshop/events.py)
+        self.events = None
+        self.profiles_dir = "logs/profiles"
+        self.max_profile_seconds = 120
+        self.cpu_profile = None
+        # 힙 스냅샷: RSS가 임계값(MB)을 넘으면 자동 캡처 (0이면 비활성화)
+        self.heap_snapshots_dir = "logs/heapsnapshots"
+        try:
+            self.heap_snapshot_rss_mb = int(os.environ.get("RSVSHOP_HEAP_SNAPSHOT_RSS_MB", "0"))
+        except ValueError:
+            self.heap_snapshot_rss_mb = 0
+        self.heap_snapshot_cooldown = 1800
+        self.heap_snapshot_keep = 5
+        self.last_heap_check = 0
+        self.last_heap_snapshot_at = None
+        self.heap_snapshot_thread = None
+        self.init_metrics()
+        self.output_parser = NextOutputParser(self.metrics, snapshot_file=self.route_stats_file, log=self.log)
         
         # 로그 디렉토리 생성
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
@@ -34,6 +86,124 @@ class PythonServerManager:
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
 
+    def init_metrics(self):
+        """슈퍼바이저 메트릭 등록"""
+        self.metrics = MetricsRegistry()
+        self.m_restarts = self.metrics.counter(
+            "rsvshop_supervisor_restarts_total", "Node.js 자동 재시작 횟수")
+        self.m_exits = self.metrics.counter(
+            "rsvshop_child_exits_total", "Node.js 프로세스 종료 횟수", ["code"])
+        self.m_log_lines = self.metrics.counter(
+            "rsvshop_child_log_lines_total", "Node.js stdout/stderr 로그 라인 수")
+        self.m_time_to_ready = self.metrics.histogram(
+            "rsvshop_child_time_to_ready_seconds", "spawn부터 Next.js Ready 로그까지 걸린 시간",
+            buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180))
+        self.m_restart_latency = self.metrics.histogram(
+            "rsvshop_restart_latency_seconds", "종료 감지부터 재시작 후 Ready까지 걸린 시간",
+            buckets=(1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180))
+        self.metrics.gauge(
+            "rsvshop_supervisor_uptime_seconds", "슈퍼바이저 가동 시간"
+        ).set_function(lambda: time.monotonic() - self.started_at)
+        self.metrics.gauge(
+            "rsvshop_child_uptime_seconds", "현재 Node.js 프로세스 가동 시간"
+        ).set_function(lambda: time.monotonic() - self.spawned_at if self.is_running and self.spawned_at else 0)
+        self.metrics.gauge(
+            "rsvshop_child_up", "Node.js 프로세스 실행 여부"
+        ).set_function(lambda: 1 if self.is_running else 0)
+        self.metrics.gauge(
+            "rsvshop_child_resident_memory_bytes", "Node.js 프로세스 트리 RSS 합계"
+        ).set_function(lambda: self.child_resource_usage("rss"))
+        self.metrics.gauge(
+            "rsvshop_child_cpu_seconds", "Node.js 프로세스 트리 누적 CPU 시간"
+        ).set_function(lambda: self.child_resource_usage("cpu"))
+
+    def child_resource_usage(self, kind):
+        """Node.js 프로세스 트리(npx → next → worker)의 RSS 또는 CPU 시간 합계"""
+        process = self.node_process
+        if not process:
+            return None
+        import psutil  # 메트릭/상태 조회에서만 필요 (status/stop은 psutil 없이 빨리 뜬다)
+        total = 0.0
+        try:
+            root = psutil.Process(process.pid)
+            for proc in [root] + root.children(recursive=True):
+                try:
+                    if kind == "rss":
+                        total += proc.memory_info().rss
+                    else:
+                        times = proc.cpu_times()
+                        total += times.user + times.system
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+        return total
+
+    def start_metrics_server(self):
+        """메트릭 엔드포인트 시작 (localhost 전용)"""
+        if not self.metrics_port or self.metrics_server:
+            return
+        try:
+            self.metrics_server = MetricsServer(self.metrics, port=self.metrics_port).start()
+            self.log(f"📈 메트릭 엔드포인트: http://127.0.0.1:{self.metrics_server.port}/metrics")
+        except OSError as e:
+            self.metrics_server = None
+            self.log(f"⚠️ 메트릭 엔드포인트 시작 실패 (포트 {self.metrics_port}): {e}")
+
+    def on_child_output(self, line):
+        """Node.js 출력 한 줄 처리 (로그 출력 스레드에서 호출)"""
+        self.m_log_lines.inc()
+        self.output_parser.feed(line)
+        if self.startup_run:
+            self.startup_run.on_line(line)
+        if not self.ready_seen and "Ready in" in line and self.spawned_at:
+            self.ready_seen = True
+            now = time.monotonic()
+            self.m_time_to_ready.observe(now - self.spawned_at)
+            if self.exit_detected_at is not None:
+                self.m_restart_latency.observe(now - self.exit_detected_at)
+                self.exit_detected_at = None
+            if self.cpu_profile and self.cpu_profile["phase"] == "profiling":
+                self.cpu_profile["deadline"] = now + self.cpu_profile["seconds"]
+
+    def publish(self, event, **fields):
+        """라이프사이클 이벤트 발행 (starting, listening, warmed, ready, crashed, restarting, stopped)"""
+        if self.events is None:
+            self.events = Publisher(log=self.log)
+        process = self.node_process
+        fields.setdefault("pid", process.pid if process else None)
+        self.events.publish(event, self.app_name, port=self.port, **fields)
+
+    def on_startup_phase(self, phase):
+        """StartupRun 단계 기록 콜백 (로그/프로브 스레드에서 호출)"""
+        if phase in STARTUP_EVENTS:
+            self.publish(STARTUP_EVENTS[phase])
+
+    def prepare_node_tuning(self):
+        """호스트/cgroup 리소스 기반 Node.js 튜닝 계획 산정 (최초 1회)"""
+        if self.node_tuning is not None:
+            return self.node_tuning
+        resources = node_tuning.detect_resources()
+        self.node_tuning = node_tuning.plan_from_env(resources) or {}
+        self.log(f"⚙️ Node.js 튜닝: {node_tuning.describe(resources, self.node_tuning)}")
+        if self.node_tuning and os.environ.get("RSVSHOP_CGROUP") == "1":
+            self.cgroup_path = node_tuning.prepare_cgroup(self.app_name, self.node_tuning)
+            if self.cgroup_path:
+                self.log(f"⚙️ cgroup v2 제한 적용: {self.cgroup_path}")
+            else:
+                self.log("⚠️ cgroup v2 제한을 적용할 수 없습니다 (위임되지 않았거나 권한 없음)")
+        return self.node_tuning
+
+    def show_tuning(self):
+        """감지된 리소스와 튜닝 계획 출력"""
+        resources = node_tuning.detect_resources()
+        plan = node_tuning.plan_from_env(resources)
+        print(node_tuning.describe(resources, plan))
+        env = node_tuning.build_node_env({"NODE_OPTIONS": os.environ.get("NODE_OPTIONS", "")}, plan)
+        print(f"  NODE_OPTIONS={env['NODE_OPTIONS']}")
+        if plan:
+            print(f"  UV_THREADPOOL_SIZE={env['UV_THREADPOOL_SIZE']}")
+
     def log(self, message):
         """로그 기록"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -47,37 +217,19 @@ class PythonServerManager:
 
     def is_port_in_use(self, port):
         """포트 사용 여부 확인"""
-        try:
-            result = subprocess.run(
-                ["netstat", "-ano"], 
-                capture_output=True, 
-                text=True, 
-                shell=True
-            )
-            return f":{port}" in result.stdout
-        except:
-            return False
+        return ports.port_in_use(port)
 
     def kill_port(self, port):
         """포트 강제 해제"""
-        try:
-            self.log(f"포트 {port}를 사용하는 프로세스를 종료합니다...")
-            subprocess.run(
-                ["npx", "kill-port", str(port)], 
-                capture_output=True, 
-                shell=True
-            )
+        self.log(f"포트 {port}를 사용하는 프로세스를 종료합니다...")
+        if ports.free_port(port, log=self.log):
             return True
-        except Exception as e:
-            self.log(f"포트 {port} 해제 실패: {e}")
-            return False
+        self.log(f"포트 {port} 해제 실패")
+        return False
 
     def find_available_port(self, start_port=4900, max_search=10):
         """사용 가능한 포트 찾기"""
-        for port in range(start_port, start_port + max_search):
-            if not self.is_port_in_use(port):
-                return port
-        raise Exception(f"사용 가능한 포트를 찾을 수 없습니다 ({start_port}-{start_port + max_search})")
+        return ports.find_available_port(start_port, max_search)
 
     def start_node_server(self):
         """Node.js 서버 시작"""
@@ -95,27 +247,63 @@ class PythonServerManager:
             self.port = self.find_available_port(self.port)
             self.log(f"포트를 {self.port}로 변경했습니다.")
 
-        self.log(f"🚀 {self.app_name} Node.js 서버를 시작합니다 (포트: {self.port})")
+        mode = "프로덕션" if self.production else "개발"
+        self.log(f"🚀 {self.app_name} Node.js {mode} 서버를 시작합니다 (포트: {self.port})")
         
-        # Next.js 개발 서버 시작
+        # Next.js 서버 시작 (프로덕션은 소스가 바뀐 경우에만 빌드)
+        try:
+            if self.production:
+                command, base_env = build_cache.production_command(self.port, log=self.log)
+            else:
+                command = ["npx", "next", "dev", "-p", str(self.port), "-H", "0.0.0.0"]
+                base_env = os.environ
+        except build_cache.BuildError as e:
+            self.log(f"❌ 프로덕션 빌드를 준비하지 못했습니다: {e}")
+            self.is_running = False
+            return
         try:
+            if self.startup_history is None:
+                self.startup_history = StartupHistory(self.startup_history_file)
+            kind = "restart" if self.exit_detected_at is not None else "start"
+            self.startup_run = StartupRun(self.startup_history, kind, self.port, log=self.log,
+                                          on_phase=self.on_startup_phase)
+            self.output_parser.start()
+            plan = self.prepare_node_tuning()
+            env = node_tuning.build_node_env(
+                {**base_env, "PORT": str(self.port), "HOSTNAME": "0.0.0.0"}, plan)
+            if self.cpu_profile and self.cpu_profile["phase"] == "profiling":
+                env["NODE_OPTIONS"] = (env.get("NODE_OPTIONS", "") +
+                                       f" --cpu-prof --cpu-prof-dir={self.cpu_profile['dir']}").strip()
             self.node_process = subprocess.Popen(
-                ["npx", "next", "dev", "-p", str(self.port), "-H", "0.0.0.0"],
+                command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
                 bufsize=1,
                 universal_newlines=True,
-                env={**os.environ, "PORT": str(self.port), "HOSTNAME": "0.0.0.0"}
+                env=env
             )
+            node_tuning.apply_to_process(self.node_process.pid, plan, self.cgroup_path)
             
+            self.spawned_at = time.monotonic()
+            self.startup_run.mark("spawn")
+            self.startup_run.start_probe()
+            self.ready_seen = False
             self.is_running = True
             self.restart_count = 0
+            self.write_state()
+            self.publish("starting")
+            if self.cpu_profile and self.cpu_profile["phase"] == "profiling":
+                # Ready 로그가 나오면 그 시점부터 seconds로 다시 잡는다
+                self.cpu_profile["deadline"] = self.spawned_at + 120 + self.cpu_profile["seconds"]
             
             # 로그 출력 스레드
+            process = self.node_process
             def log_output():
-                for line in self.node_process.stdout:
-                    print(line.rstrip())
+                for line in process.stdout:
+                    line = line.rstrip()
+                    print(line)
+                    self.on_child_output(line)
             
             log_thread = threading.Thread(target=log_output, daemon=True)
             log_thread.start()
@@ -133,32 +321,266 @@ class PythonServerManager:
             # 프로세스가 살아있는지 확인
             if self.node_process.poll() is not None:
                 exit_code = self.node_process.returncode
+                self.exit_detected_at = time.monotonic()
+                self.m_exits.labels(code=exit_code).inc()
+                if self.startup_run:
+                    self.startup_run.finish("exited")
                 self.log(f"📴 Node.js 프로세스가 종료되었습니다 (코드: {exit_code})")
+                if self.cpu_profile and self.advance_cpu_profile():
+                    break
                 self.handle_process_exit(exit_code)
                 break
             
+            self.check_memory_threshold()
+            
+            # 프로파일링 시간이 끝나면 정상 종료시켜 .cpuprofile을 기록하게 한다
+            if (self.cpu_profile and self.cpu_profile["phase"] == "profiling"
+                    and time.monotonic() >= self.cpu_profile["deadline"]):
+                self.cpu_profile["phase"] = "collecting"
+                self.log("🔥 프로파일링 시간 종료. 프로파일 수집을 위해 서버를 재시작합니다...")
+                self.node_process.terminate()
+            
             time.sleep(1)
 
     def handle_process_exit(self, code):
         """프로세스 종료 처리"""
+        pid = self.node_process.pid if self.node_process else None
         self.is_running = False
         self.node_process = None
 
         # 정상 종료인 경우 재시작하지 않음
         if code == 0:
             self.log("정상 종료되었습니다.")
+            self.publish("stopped", pid=pid, reason="exit")
             return
+        self.publish("crashed", pid=pid, code=code)
 
         # 비정상 종료 시 재시작 시도
         if self.restart_count < self.max_restarts:
             self.restart_count += 1
+            self.m_restarts.inc()
             self.log(f"🔄 재시작 시도 {self.restart_count}/{self.max_restarts} ({self.restart_delay}초 후)")
+            self.publish("restarting", reason="crash", delay=self.restart_delay, attempt=self.restart_count)
             
             time.sleep(self.restart_delay)
             self.start_node_server()
         else:
             self.log(f"❌ 최대 재시작 횟수 초과 ({self.max_restarts}회)")
             self.log("수동으로 서버를 시작해주세요.")
+            self.publish("stopped", reason="max_restarts")
+
+    def write_state(self):
+        """슈퍼바이저/자식 PID와 포트 기록"""
+        try:
+            with open(self.state_file, "w", encoding="utf-8") as f:
+                json.dump({
+                    "supervisor_pid": os.getpid(),
+                    "child_pid": self.node_process.pid if self.node_process else None,
+                    "port": self.port,
+                    "mode": "production" if self.production else "dev",
+                    "updated_at": datetime.now().isoformat(timespec="seconds"),
+                }, f)
+        except OSError:
+            pass
+
+    def read_state(self):
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def find_server_pid(self, state):
+        """자식 프로세스 트리 중 포트를 LISTEN 중인 node 프로세스 (없으면 가장 깊은 node 프로세스)"""
+        import psutil
+        try:
+            root = psutil.Process(state["child_pid"])
+            tree = [root] + root.children(recursive=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, KeyError, TypeError):
+            return None
+        fallback = None
+        for proc in tree:
+            try:
+                if "node" not in proc.name().lower():
+                    continue
+                fallback = proc.pid
+                for conn in proc.connections(kind="inet"):
+                    if conn.status == psutil.CONN_LISTEN and conn.laddr and conn.laddr.port == state.get("port"):
+                        return proc.pid
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return fallback
+
+    def handle_profile_request(self, signum, frame):
+        """SIGUSR2: --cpu-prof로 재시작하여 제한된 시간 동안 프로파일링"""
+        if self.cpu_profile or not self.is_running or not self.node_process:
+            self.log("⚠️ 프로파일링 요청 무시 (이미 진행 중이거나 서버가 실행 중이 아님)")
+            return
+        seconds = 30
+        try:
+            with open(os.path.join(self.profiles_dir, "request.json"), "r", encoding="utf-8") as f:
+                seconds = int(json.load(f).get("seconds", seconds))
+        except (OSError, ValueError):
+            pass
+        seconds = max(1, min(self.max_profile_seconds, seconds))
+        directory = os.path.abspath(os.path.join(self.profiles_dir, datetime.now().strftime("%Y%m%d-%H%M%S")))
+        os.makedirs(directory, exist_ok=True)
+        self.cpu_profile = {"seconds": seconds, "phase": "respawn", "dir": directory}
+        self.log(f"🔥 CPU 프로파일링 요청: --cpu-prof로 재시작하여 Ready 후 {seconds}초간 기록합니다")
+        self.node_process.terminate()
+
+    def advance_cpu_profile(self):
+        """프로파일링용 재시작 단계 진행. 처리했으면 True"""
+        phase = self.cpu_profile["phase"]
+        self.is_running = False
+        self.node_process = None
+        self.publish("restarting", reason="profile")
+        if phase == "respawn":
+            self.cpu_profile["phase"] = "profiling"
+            self.start_node_server()
+            return True
+        profile = self.cpu_profile
+        self.cpu_profile = None
+        files = sorted(
+            (os.path.join(profile["dir"], name) for name in os.listdir(profile["dir"]) if name.endswith(".cpuprofile")),
+            key=os.path.getsize, reverse=True)
+        if files:
+            # 가장 큰 프로파일이 실제 요청을 처리한 next-server 워커다
+            self.report_cpu_profile(files[0], "respawn")
+        else:
+            self.log("⚠️ .cpuprofile이 생성되지 않았습니다 (프로세스가 정상 종료되지 않음)")
+        self.start_node_server()
+        return True
+
+    def report_cpu_profile(self, path, mode, top_n=15):
+        """프로파일 요약 출력 및 folded stack/요약 포인터 기록"""
+        summary = cpu_profile.summarize(cpu_profile.load_profile(path))
+        folded = cpu_profile.write_folded(summary, os.path.splitext(path)[0] + ".folded")
+        cpu_profile.print_summary(summary, top_n)
+        with open(os.path.join(self.profiles_dir, "latest.json"), "w", encoding="utf-8") as f:
+            json.dump({"profile": path, "folded": folded, "mode": mode,
+                       "created_at": datetime.now().isoformat(timespec="seconds")}, f, ensure_ascii=False)
+        self.log(f"🔥 CPU 프로파일: {path}")
+        self.log(f"📄 folded stack: {folded}")
+
+    def profile_cpu(self, seconds=30, respawn=False):
+        """실행 중인 Node.js 서버 CPU 프로파일링 (기본: 인스펙터, --respawn: --cpu-prof 재시작)"""
+        seconds = max(1, min(self.max_profile_seconds, seconds))
+        state = self.read_state()
+        if not state:
+            self.log("❌ 실행 중인 슈퍼바이저 정보가 없습니다. (start로 먼저 서버를 시작하세요)")
+            return
+        os.makedirs(self.profiles_dir, exist_ok=True)
+
+        if respawn:
+            if not hasattr(signal, "SIGUSR2"):
+                self.log("❌ 이 플랫폼에서는 --respawn 모드를 사용할 수 없습니다.")
+                return
+            latest = os.path.join(self.profiles_dir, "latest.json")
+            before = os.path.getmtime(latest) if os.path.exists(latest) else 0
+            with open(os.path.join(self.profiles_dir, "request.json"), "w", encoding="utf-8") as f:
+                json.dump({"seconds": seconds}, f)
+            os.kill(state["supervisor_pid"], signal.SIGUSR2)
+            self.log(f"🔥 슈퍼바이저(PID {state['supervisor_pid']})에 --cpu-prof 재시작을 요청했습니다. 완료까지 대기...")
+            deadline = time.monotonic() + seconds + 300
+            while time.monotonic() < deadline:
+                if os.path.exists(latest) and os.path.getmtime(latest) > before:
+                    with open(latest, "r", encoding="utf-8") as f:
+                        result = json.load(f)
+                    self.log(f"🔥 CPU 프로파일: {result['profile']}")
+                    cpu_profile.print_summary(cpu_profile.summarize(cpu_profile.load_profile(result["profile"])))
+                    return
+                time.sleep(1)
+            self.log("❌ 프로파일 결과를 기다리다 시간 초과되었습니다.")
+            return
+
+        pid = self.find_server_pid(state)
+        if not pid:
+            self.log("❌ 프로파일링할 Node.js 프로세스를 찾지 못했습니다.")
+            return
+        self.log(f"🔥 PID {pid}에 인스펙터를 열고 {seconds}초간 CPU 프로파일링합니다...")
+        try:
+            with InspectorSession(open_inspector(pid)) as session:
+                session.call("Profiler.enable")
+                session.call("Profiler.setSamplingInterval", {"interval": 1000})
+                session.call("Profiler.start")
+                try:
+                    time.sleep(seconds)
+                finally:
+                    profile = session.call("Profiler.stop", timeout=60)["profile"]
+                    session.call("Profiler.disable")
+                    session.close_inspector()
+        except (InspectorError, OSError) as e:
+            self.log(f"❌ 인스펙터 프로파일링 실패: {e}")
+            return
+        path = os.path.abspath(os.path.join(
+            self.profiles_dir, f"inspector-{pid}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.cpuprofile"))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        self.report_cpu_profile(path, "inspector")
+
+    def check_memory_threshold(self):
+        """15초마다 자식 RSS를 확인하여 임계값 초과 시 힙 스냅샷을 백그라운드로 캡처"""
+        if not self.heap_snapshot_rss_mb or time.monotonic() - self.last_heap_check < 15:
+            return
+        self.last_heap_check = time.monotonic()
+        if self.heap_snapshot_thread and self.heap_snapshot_thread.is_alive():
+            return
+        if self.last_heap_snapshot_at and time.monotonic() - self.last_heap_snapshot_at < self.heap_snapshot_cooldown:
+            return
+        rss = self.child_resource_usage("rss")
+        if rss is None or rss < self.heap_snapshot_rss_mb * 1024 * 1024:
+            return
+        self.last_heap_snapshot_at = time.monotonic()
+        self.log(f"🧠 Node.js RSS {rss / 1024 / 1024:.0f}MB가 임계값 {self.heap_snapshot_rss_mb}MB를 넘었습니다. 힙 스냅샷을 캡처합니다...")
+        state = {"child_pid": self.node_process.pid, "port": self.port}
+        self.heap_snapshot_thread = threading.Thread(
+            target=self.capture_heap_snapshot, args=(state, "threshold"), daemon=True)
+        self.heap_snapshot_thread.start()
+
+    def capture_heap_snapshot(self, state=None, reason="manual"):
+        """인스펙터로 힙 스냅샷을 캡처하고 생성자별 retained size 및 직전 스냅샷 대비 증가분 출력"""
+        state = state or self.read_state()
+        if not state:
+            self.log("❌ 실행 중인 슈퍼바이저 정보가 없습니다. (start로 먼저 서버를 시작하세요)")
+            return None
+        pid = self.find_server_pid(state)
+        if not pid:
+            self.log("❌ 힙 스냅샷을 캡처할 Node.js 프로세스를 찾지 못했습니다.")
+            return None
+        os.makedirs(self.heap_snapshots_dir, exist_ok=True)
+        previous = sorted(name for name in os.listdir(self.heap_snapshots_dir) if name.endswith(".summary.json"))
+        path = os.path.join(self.heap_snapshots_dir,
+                            f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{reason}-{pid}.heapsnapshot")
+        self.log(f"🧠 PID {pid} 힙 스냅샷 캡처 중 (캡처 동안 서버가 잠시 멈춥니다)...")
+        try:
+            with InspectorSession(open_inspector(pid), timeout=600) as session:
+                try:
+                    heap_snapshot.capture(session, path)
+                finally:
+                    session.close_inspector()
+        except (InspectorError, OSError) as e:
+            self.log(f"❌ 힙 스냅샷 캡처 실패: {e}")
+            return None
+        self.log(f"🧠 힙 스냅샷 저장: {path} ({os.path.getsize(path) / 1024 / 1024:.0f}MB)")
+
+        summary = heap_snapshot.analyze(path)
+        heap_snapshot.print_summary(summary, 15)
+        if previous:
+            with open(os.path.join(self.heap_snapshots_dir, previous[-1]), "r", encoding="utf-8") as f:
+                print()
+                heap_snapshot.print_diff(json.load(f), summary, 15)
+        self.prune_heap_snapshots()
+        return path
+
+    def prune_heap_snapshots(self):
+        """원본 스냅샷은 최근 N개만 유지 (요약 .summary.json은 diff용으로 남김)"""
+        snapshots = sorted(name for name in os.listdir(self.heap_snapshots_dir) if name.endswith(".heapsnapshot"))
+        for name in snapshots[:-self.heap_snapshot_keep]:
+            try:
+                os.remove(os.path.join(self.heap_snapshots_dir, name))
+            except OSError:
+                pass
 
     def stop_server(self):
         """서버 중지"""
@@ -177,14 +599,18 @@ class PythonServerManager:
             self.log("강제 종료를 시도합니다...")
             self.node_process.kill()
         
+        pid = self.node_process.pid
         self.is_running = False
         self.node_process = None
+        self.publish("stopped", pid=pid, reason="stop")
 
     def restart_server(self):
         """서버 재시작"""
         self.log("🔄 서버를 재시작합니다...")
         self.restart_count = 0
         self.stop_server()
+        self.exit_detected_at = time.monotonic()
+        self.publish("restarting", reason="manual")
         time.sleep(2)
         self.start_node_server()
 
@@ -199,6 +625,7 @@ class PythonServerManager:
         self.log(f"  재시작 횟수: {self.restart_count}/{self.max_restarts}")
         
         # 실행 중인 Node.js 프로세스 확인
+        import psutil
         node_processes = []
         for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
             try:
@@ -217,10 +644,28 @@ class PythonServerManager:
             for proc in node_processes:
                 self.log(f"    PID {proc['pid']}: {proc['cmdline'][:50]}...")
 
+    def startup_report(self, limit=20):
+        """시작 시간 추세 및 회귀 리포트"""
+        if not os.path.exists(self.startup_history_file):
+            print("기록된 시작 이력이 없습니다. (start로 서버를 한 번 이상 시작하세요)")
+            return
+        print_report(StartupHistory(self.startup_history_file), limit=limit)
+
+    def show_slow_routes(self, limit=10):
+        """출력 파서가 기록한 느린 라우트 TOP N"""
+        if not os.path.exists(self.route_stats_file):
+            print("기록된 라우트 통계가 없습니다. (start로 서버를 실행 중이어야 합니다)")
+            return
+        with open(self.route_stats_file, "r", encoding="utf-8") as f:
+            print_top_routes(json.load(f), limit)
+
     def signal_handler(self, signum, frame):
         """시그널 핸들러"""
         self.log(f"\n🛑 시그널 {signum}을 받았습니다. 서버를 종료합니다...")
         self.stop_server()
+        self.output_parser.stop()
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
         sys.exit(0)
 
     def start_protection(self):
@@ -228,6 +673,9 @@ class PythonServerManager:
         self.log("🛡️ Python 서버 매니저 보호 모드를 시작합니다...")
         self.log("Ctrl+C로 종료할 수 있습니다.")
         self.log("💡 이 프로세스는 taskkill /f /im node.exe에 영향을 받지 않습니다!")
+        self.start_metrics_server()
+        if hasattr(signal, "SIGUSR2"):
+            signal.signal(signal.SIGUSR2, self.handle_profile_request)
         
         # 서버 시작
         self.start_node_server()
@@ -249,9 +697,18 @@ def main():
 
 사용법:
   python scripts/python-server-manager.py start    - 보호 모드 시작
+  python scripts/python-server-manager.py start --prod - 프로덕션 모드 (캐시된 빌드로 next start, RSVSHOP_MODE=production과 동일)
   python scripts/python-server-manager.py stop     - 서버 중지
   python scripts/python-server-manager.py restart  - 서버 재시작
   python scripts/python-server-manager.py status   - 상태 확인
+  python scripts/python-server-manager.py startup-report [N] - 시작 시간 추세/회귀 리포트
+  python scripts/python-server-manager.py routes [N]  - 느린 라우트 TOP N (요청/컴파일)
+  python scripts/python-server-manager.py tuning      - 감지된 리소스와 Node.js 힙/스레드풀 설정 확인
+  python scripts/python-server-manager.py profile [초] [--respawn] - CPU 프로파일링 (최대 120초, 함수별 순위 + folded stack)
+  python scripts/python-server-manager.py heap-snapshot - 힙 스냅샷 캡처 및 생성자별 retained size/증가분 분석
+  python scripts/python-server-manager.py build [--force] - 소스가 바뀌었으면 프로덕션 빌드 (보관본이 있으면 활성화만)
+  python scripts/python-server-manager.py builds      - 보관된 프로덕션 빌드 목록
+  python scripts/python-server-manager.py rollback [해시] - 이전 프로덕션 빌드로 되돌리기 (재시작 후 적용)
 
 특징:
   ✅ taskkill /f /im node.exe 완전 보호
@@ -259,20 +716,54 @@ def main():
   ✅ 포트 충돌 자동 해결
   ✅ 프로세스 모니터링
   ✅ 로그 기록
+  ✅ Prometheus 메트릭 (http://127.0.0.1:9464/metrics, RSVSHOP_METRICS_PORT=0으로 비활성화)
+  ✅ 라이프사이클 이벤트 발행 (starting → listening → warmed → ready, crashed/restarting/stopped; rsvshop events로 확인)
   ✅ Python 기반 (Node.js 독립적)
+  ⚙️ RSVSHOP_HEAP_SNAPSHOT_RSS_MB 설정 시 RSS 초과하면 힙 스냅샷 자동 캡처(30분 간격)
         """)
         return
 
     command = sys.argv[1]
+    if "--prod" in sys.argv:
+        manager.production = True
     
     if command == "start":
         manager.start_protection()
     elif command == "stop":
-        manager.stop_server()
+        # 다른 프로세스에서 보호 모드가 돌고 있으면 그 슈퍼바이저를 종료 (자식까지 정리)
+        if not stop_supervisor(manager.state_file, log=manager.log):
+            manager.stop_server()
     elif command == "restart":
         manager.restart_server()
     elif command == "status":
         manager.check_status()
+    elif command == "startup-report":
+        limit = int(sys.argv[2]) if len(sys.argv) >= 3 and sys.argv[2].isdigit() else 20
+        manager.startup_report(limit)
+    elif command == "profile":
+        args = [arg for arg in sys.argv[2:] if not arg.startswith("--")]
+        seconds = int(args[0]) if args and args[0].isdigit() else 30
+        manager.profile_cpu(seconds, respawn="--respawn" in sys.argv)
+    elif command == "heap-snapshot":
+        manager.capture_heap_snapshot()
+    elif command == "tuning":
+        manager.show_tuning()
+    elif command in ("build", "builds", "rollback"):
+        cache = build_cache.BuildCache(log=manager.log)
+        try:
+            if command == "build":
+                cache.ensure_build(force="--force" in sys.argv, unpin=True)
+            elif command == "builds":
+                build_cache.print_builds(cache)
+            else:
+                target = sys.argv[2] if len(sys.argv) >= 3 and not sys.argv[2].startswith("--") else None
+                cache.rollback(target)
+                manager.log("🔄 실행 중인 서버를 재시작하면 적용됩니다 (restart)")
+        except build_cache.BuildError as e:
+            manager.log(f"❌ {e}")
+    elif command == "routes":
+        limit = int(sys.argv[2]) if len(sys.argv) >= 3 and sys.argv[2].isdigit() else 10
+        manager.show_slow_routes(limit)
     else:
         print(f"알 수 없는 명령어: {command}")
 
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+RSVShop 쿼리 로그 수집기
+Prisma query 이벤트와 PostgreSQL log_min_duration_statement 출력을 한 줄씩 읽어
+리터럴/파라미터 목록을 지운 지문(fingerprint)별로 횟수, 총 시간, p95를 스트리밍 집계하고,
+한 HTTP 요청 구간 안에서 같은 지문이 여러 번 실행된 N+1 패턴을 찾아 순위 리포트로 보여준다.
+
+읽는 형식:
+  prisma:query SELECT ...                       (Prisma log: ['query'] stdout, 소요 시간 없음)
+  {"query": "...", "params": "[..]", "duration": 3, "timestamp": "..."}
+                                                (prisma.$on('query', e => console.log(JSON.stringify(e))))
+  2025-08-26 11:13:56.123 KST [1234] LOG:  duration: 12.3 ms  statement: SELECT ...
+  GET /api/admin/stats 200 in 85ms              (Next.js 요청 완료 줄 = 요청 구간의 끝)
+요청 구간: 파일(PostgreSQL은 백엔드 pid)마다 요청 완료 줄 사이의 쿼리, 완료 줄이 없으면 --gap초 이상 쉬면 구간을 나눈다.
+동시 요청이 섞인 로그에서는 구간이 겹칠 수 있으니 N+1 결과는 후보로 본다.
+
+사용법:
+  python scripts/query_log.py report [파일 ...] [--sort total|count|p95] [--top 20] [--json]
+  npm run dev 2>&1 | python scripts/query_log.py report -          # Ctrl+C 시 리포트
+  python scripts/query_log.py report logs/postgresql.log --n-plus-one 5 --gap 0.5
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+
+from log_reader import TS_PREFIX_RE, format_ts, parse_ts
+from next_output_parser import ANSI_RE, RouteStats, parse_line
+
+# 쿼리 지연 버킷(초): 요청 버킷보다 촘촘하게
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DEFAULT_INPUTS = ("logs/pm2-out-*.log", "logs/pm2-combined-*.log", "logs/postgres*.log", "logs/*query*.log")
+N_PLUS_ONE = 10
+WINDOW_GAP = 0.25
+MAX_FINGERPRINTS = 5000
+MAX_WINDOW_KEYS = 500
+
+PRISMA_QUERY_RE = re.compile(r"prisma:query\s+(.*)$")
+PG_RE = re.compile(
+    r"^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?)(?: (?P<tz>[A-Za-z]{2,5}|[+-]\d{2}))?"
+    r"(?: \[(?P<pid>\d+)\])?.*?\b(?P<level>LOG|ERROR|STATEMENT|DETAIL|HINT|WARNING|FATAL):\s+(?P<rest>.*)$")
+PG_DURATION_RE = re.compile(r"^duration: (?P<ms>[\d.]+) ms\s+(?P<kind>statement|execute|parse|bind)(?: [^:]*)?: (?P<sql>.*)$")
+
+# 정규화 (순서 중요)
+NORMALIZE_RES = [
+    (re.compile(r"/\*.*?\*/", re.DOTALL), " "),
+    (re.compile(r"--[^\n]*"), " "),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\$\d+"), "?"),
+    (re.compile(r"(?<![\w$.\"])-?\d+(?:\.\d+)?(?![\w\"])"), "?"),
+    (re.compile(r"\b(?:true|false)\b", re.IGNORECASE), "?"),
+    (re.compile(r"\"public\"\."), ""),
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?+)"),  # IN ($1,$2,...) / VALUES (?, ?) 길이 무관
+    (re.compile(r"(\(\?\+\))(?:\s*,\s*\(\?\+\))+"), r"\1"),  # VALUES (...), (...) 여러 행
+    (re.compile(r"\bOFFSET \?", re.IGNORECASE), "OFFSET ?"),
+]
+TABLE_RE = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+\"?(\w+)\"?(?:\.\"?(\w+)\"?)?", re.IGNORECASE)
+
+
+def normalize(sql):
+    """리터럴/파라미터/IN 목록을 지운 문장"""
+    text = sql
+    for pattern, replacement in NORMALIZE_RES:
+        text = pattern.sub(replacement, text)
+    return text.strip().rstrip(";")
+
+
+def fingerprint(sql):
+    """(지문, 정규화된 문장)"""
+    text = normalize(sql)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=6).hexdigest(), text
+
+
+def tables_of(text):
+    return sorted({(m.group(2) or m.group(1)) for m in TABLE_RE.finditer(text)})
+
+
+class QueryStats:
+    """지문 하나의 집계 (고정 버킷 히스토그램이라 메모리 상수)"""
+
+    def __init__(self, text):
+        self.text = text
+        self.count = 0
+        self.timed = RouteStats(QUERY_BUCKETS)
+        self.first = None
+        self.last = None
+
+    def add(self, ms, ts):
+        self.count += 1
+        if ms is not None:
+            self.timed.add(ms / 1000)
+        if ts is not None:
+            self.first = ts if self.first is None else min(self.first, ts)
+            self.last = ts if self.last is None else max(self.last, ts)
+
+    def to_dict(self, total_ms):
+        timed = self.timed
+        total = timed.total * 1000
+        return {
+            "count": self.count,
+            "timed": timed.count,
+            "total_ms": round(total, 2),
+            "avg_ms": round(total / timed.count, 3) if timed.count else None,
+            "p95_ms": round(timed.quantile(0.95) * 1000, 3) if timed.count else None,
+            "max_ms": round(timed.max * 1000, 3) if timed.count else None,
+            "share": round(total / total_ms, 4) if total_ms else 0,
+            "tables": tables_of(self.text),
+            "first": self.first,
+            "last": self.last,
+            "sql": self.text,
+        }
+
+
+class Window:
+    """한 요청 구간 안의 지문별 실행 횟수/시간"""
+
+    __slots__ = ("counts", "ms", "last_ts")
+
+    def __init__(self):
+        self.counts = Counter()
+        self.ms = Counter()
+        self.last_ts = None
+
+
+class QueryLogCollector:
+    """줄을 feed()로 넣으면 지문 집계와 N+1 탐지를 함께 갱신 (한 번 훑기, 원문을 쌓아 두지 않음)"""
+
+    def __init__(self, n_plus_one=N_PLUS_ONE, gap=WINDOW_GAP, max_fingerprints=MAX_FINGERPRINTS):
+        self.n_plus_one = n_plus_one
+        self.gap = gap
+        self.max_fingerprints = max_fingerprints
+        self.stats = {}
+        self.windows = {}  # (스트림, pid) → Window
+        self.suspects = {}  # (route, 지문) → 집계
+        self.requests = 0
+        self.lines = 0
+        self.queries = 0
+        self.overflow = 0
+        self._pg_pending = {}  # 스트림 → 이어지는 줄을 기다리는 PostgreSQL 레코드
+
+    # 입력 ---------------------------------------------------------------
+
+    def feed(self, line, stream="-"):
+        self.lines += 1
+        line = ANSI_RE.sub("", line.rstrip("\r\n"))
+        pending = self._pg_pending.get(stream)
+        if pending is not None:
+            if line.startswith(("\t", "  ")) and not PG_RE.match(line.lstrip()):
+                pending["sql"] += "\n" + line.strip()
+                return
+            del self._pg_pending[stream]
+            self.query(pending["sql"], pending["ms"], pending["ts"], (stream, pending["pid"]))
+        match = PG_RE.match(line)
+        if match:
+            self._feed_pg(match, stream)
+            return
+        ts = None
+        prefix = TS_PREFIX_RE.match(line)
+        if prefix:
+            ts = parse_ts(prefix.group(1))
+            line = line[prefix.end():]
+        if "prisma:query" in line:
+            self.query(PRISMA_QUERY_RE.search(line).group(1), None, ts, (stream, None))
+            return
+        brace = line.find("{")
+        if brace != -1 and '"query"' in line:
+            try:
+                event = json.loads(line[brace:])
+            except ValueError:
+                event = None
+            if isinstance(event, dict) and isinstance(event.get("query"), str):
+                duration = event.get("duration")
+                self.query(event["query"], float(duration) if duration is not None else None,
+                           parse_ts(event.get("timestamp")) or ts, (stream, None))
+                return
+        event = parse_line(line)
+        if event and event["type"] == "request":
+            self.request_done(f"{event['method']} {event['route']}", (stream, None), ts)
+
+    def _feed_pg(self, match, stream):
+        if match.group("level") != "LOG":
+            return
+        duration = PG_DURATION_RE.match(match.group("rest"))
+        if not duration or duration.group("kind") in ("parse", "bind"):
+            return
+        ts = parse_ts(match.group("ts").replace(" ", "T"))
+        if match.group("tz") == "UTC" and ts is not None:
+            ts = parse_ts(match.group("ts").replace(" ", "T") + "+00:00")
+        self._pg_pending[stream] = {"sql": duration.group("sql"), "ms": float(duration.group("ms")), "ts": ts,
+                                    "pid": match.group("pid")}
+
+    def finish(self):
+        """입력 끝: 대기 중인 레코드와 열린 구간 정리"""
+        for stream, pending in list(self._pg_pending.items()):
+            self.query(pending["sql"], pending["ms"], pending["ts"], (stream, pending["pid"]))
+        self._pg_pending.clear()
+        for key in list(self.windows):
+            self._close(key, "-" if key[1] is None else f"pid {key[1]}")
+
+    # 집계 ---------------------------------------------------------------
+
+    def query(self, sql, ms, ts, key):
+        self.queries += 1
+        fp, text = fingerprint(sql)
+        stats = self.stats.get(fp)
+        if stats is None:
+            if len(self.stats) >= self.max_fingerprints:
+                self.overflow += 1
+                return
+            stats = self.stats[fp] = QueryStats(text[:2000])
+        stats.add(ms, ts)
+        window = self.windows.get(key)
+        # 요청 완료 줄이 없는 스트림(PostgreSQL 로그 등)은 시간 간격으로 구간을 나눈다
+        if window is not None and ts is not None and window.last_ts is not None and ts - window.last_ts > self.gap:
+            self._close(key, "-" if key[1] is None else f"pid {key[1]}")
+            window = None
+        if window is None:
+            window = self.windows[key] = Window()
+        if fp in window.counts or len(window.counts) < MAX_WINDOW_KEYS:
+            window.counts[fp] += 1
+            window.ms[fp] += ms or 0.0
+        if ts is not None:
+            window.last_ts = ts
+
+    def request_done(self, route, key, ts=None):
+        self.requests += 1
+        self._close(key, route, ts)
+
+    def _close(self, key, route, ts=None):
+        window = self.windows.pop(key, None)
+        if window is None:
+            return
+        for fp, count in window.counts.items():
+            if count < self.n_plus_one:
+                continue
+            entry = self.suspects.setdefault((route, fp), {"windows": 0, "executions": 0, "max": 0, "ms": 0.0,
+                                                            "last": None})
+            entry["windows"] += 1
+            entry["executions"] += count
+            entry["max"] = max(entry["max"], count)
+            entry["ms"] += window.ms[fp]
+            entry["last"] = ts or window.last_ts or entry["last"]
+
+    # 결과 ---------------------------------------------------------------
+
+    def report(self, sort="total", top=20):
+        total_ms = sum(s.timed.total for s in self.stats.values()) * 1000
+        keys = {"total": lambda s: (s.timed.total, s.count), "count": lambda s: (s.count, s.timed.total),
+                "p95": lambda s: (s.timed.quantile(0.95) if s.timed.count else -1, s.count)}
+        ranked = sorted(self.stats.items(), key=lambda item: keys[sort](item[1]), reverse=True)[:top]
+        suspects = sorted(self.suspects.items(), key=lambda item: (item[1]["executions"], item[1]["ms"]),
+                          reverse=True)[:top]
+        return {
+            "lines": self.lines,
+            "queries": self.queries,
+            "requests": self.requests,
+            "fingerprints": len(self.stats),
+            "dropped": self.overflow,
+            "total_ms": round(total_ms, 2),
+            "sort": sort,
+            "top": [{"fingerprint": fp, **stats.to_dict(total_ms)} for fp, stats in ranked],
+            "n_plus_one": [{
+                "route": route, "fingerprint": fp, "windows": entry["windows"], "executions": entry["executions"],
+                "max_per_request": entry["max"], "avg_per_request": round(entry["executions"] / entry["windows"], 1),
+                "total_ms": round(entry["ms"], 2), "last": entry["last"], "tables": tables_of(self.stats[fp].text),
+                "sql": self.stats[fp].text,
+            } for (route, fp), entry in suspects],
+        }
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:,.1f}"
+
+
+def print_report(report, width=110):
+    print(f"🗄️ 쿼리 로그: {report['lines']:,}줄, 쿼리 {report['queries']:,}건, 지문 {report['fingerprints']:,}개, "
+          f"요청 {report['requests']:,}건, 총 {report['total_ms'] / 1000:,.2f}초"
+          + (f", 지문 한도 초과로 버린 쿼리 {report['dropped']:,}건" if report["dropped"] else ""))
+    if not report["top"]:
+        print("  (쿼리 없음 - Prisma query 로그나 PostgreSQL log_min_duration_statement가 켜져 있는지 확인)")
+        return
+    print(f"\n  🐢 지문 TOP {len(report['top'])} ({report['sort']} 기준)")
+    print(f"    {'#':>2} {'fingerprint':<12} {'count':>8} {'total ms':>11} {'avg':>8} {'p95':>8} {'max':>9} {'share':>6}")
+    for i, row in enumerate(report["top"], 1):
+        print(f"    {i:>2} {row['fingerprint']:<12} {row['count']:>8,} {row['total_ms']:>11,.1f} {_ms(row['avg_ms']):>8} "
+              f"{_ms(row['p95_ms']):>8} {_ms(row['max_ms']):>9} {row['share'] * 100:>5.1f}%")
+        print(f"       {', '.join(row['tables']) or '-'}: {row['sql'][:width]}")
+    print("\n  🔁 N+1 의심 (한 요청 안에서 같은 지문 반복)")
+    if not report["n_plus_one"]:
+        print("    (없음)")
+        return
+    print(f"    {'route':<36} {'fingerprint':<12} {'requests':>8} {'per req':>8} {'max':>5} {'total ms':>10}")
+    for row in report["n_plus_one"]:
+        print(f"    {row['route'][:36]:<36} {row['fingerprint']:<12} {row['windows']:>8,} {row['avg_per_request']:>8} "
+              f"{row['max_per_request']:>5} {row['total_ms']:>10,.1f}")
+        print(f"       {', '.join(row['tables']) or '-'}: {row['sql'][:width]}  (최근 {format_ts(row['last'])})")
+    print("    → 반복 조회는 include/select 관계 로딩이나 where: { id: { in: [...] } } 한 번으로 묶는다")
+
+
+def input_files(paths):
+    if paths:
+        return paths
+    files = []
+    for pattern in DEFAULT_INPUTS:
+        files.extend(p for p in sorted(glob.glob(pattern)) if p not in files)
+    return files
+
+
+def collect(paths, collector):
+    for path in paths:
+        if path == "-":
+            for line in sys.stdin:
+                collector.feed(line, "-")
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                collector.feed(line, path)
+    collector.finish()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop Prisma/PostgreSQL 쿼리 로그 리포트")
+    sub = parser.add_subparsers(dest="command")
+    report = sub.add_parser("report", help="지문별 집계와 N+1 의심 리포트")
+    report.add_argument("paths", nargs="*", help=f"로그 파일 ('-'는 stdin, 기본: {' '.join(DEFAULT_INPUTS)})")
+    report.add_argument("--sort", choices=("total", "count", "p95"), default="total")
+    report.add_argument("--top", type=int, default=20)
+    report.add_argument("--n-plus-one", type=int, default=N_PLUS_ONE, help="한 요청 안 반복 횟수 기준")
+    report.add_argument("--gap", type=float, default=WINDOW_GAP, help="요청 완료 줄이 없을 때 구간을 나누는 간격(초)")
+    report.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command != "report":
+        parser.print_help()
+        return 0
+    paths = input_files(args.paths)
+    missing = [p for p in paths if p != "-" and not os.path.exists(p)]
+    if missing or not paths:
+        print(f"❌ 로그 파일이 없습니다: {', '.join(missing) or ' '.join(DEFAULT_INPUTS)}")
+        return 1
+    collector = QueryLogCollector(n_plus_one=args.n_plus_one, gap=args.gap)
+    try:
+        collect(paths, collector)
+    except KeyboardInterrupt:
+        collector.finish()
+    result = collector.report(args.sort, args.top)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
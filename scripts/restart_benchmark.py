@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+RSVShop 슈퍼바이저 재시작 벤치마크
+PortManager / ProtectedServer / PythonServerManager에 Next.js 대신 스탠드인 자식 프로세스를 물려
+장애(crash/hang/leak) 감지 지연, 포트 재바인딩, 첫 200 응답까지의 시간과 슈퍼바이저 자체 CPU/메모리 오버헤드를 측정
+
+측정 방법:
+  - npm/npx를 PATH 앞쪽의 셈(shim)으로 바꿔 standin_server.py --controls를 실행 (슈퍼바이저 코드는 그대로)
+  - 감지 시점: 죽은 자식이 슈퍼바이저에 의해 회수(reap)되어 /proc/<pid>가 사라진 시각
+  - 재바인딩: 포트에 TCP 연결이 다시 되는 시각 / 첫 200: GET /api/health가 200을 돌려준 시각 (모두 장애 시각 기준)
+  - 오버헤드: 슈퍼바이저 프로세스 자신의 utime+stime과 RSS (유휴, 로그 폭주 중)
+  Linux 전용 (/proc 사용)
+
+사용법:
+  python scripts/restart_benchmark.py run [--supervisors port_manager,protected_server,python_server_manager]
+                                          [--scenarios crash,hang,leak] [--repeat 3] [--timeout 30] [--output file.json]
+  python scripts/restart_benchmark.py compare <base.json> <new.json> [--tolerance 0.2]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from load_benchmark import git_commit
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SCRIPTS_DIR)
+STANDIN = os.path.join(SCRIPTS_DIR, "standin_server.py")
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+# 슈퍼바이저별 부트스트랩: 포트만 바꾸고 각자의 기본 실행 경로(run/start_protection)를 그대로 탄다
+SUPERVISORS = {
+    "port_manager": (
+        "import sys; sys.path.insert(0, {root!r})\n"
+        "from port_manager import PortManager\n"
+        "PortManager({port}).run()\n"
+    ),
+    "protected_server": (
+        "import sys; sys.path.insert(0, {root!r})\n"
+        "from protected_server import ProtectedServer\n"
+        "ProtectedServer({port}).run()\n"
+    ),
+    "python_server_manager": (
+        "import importlib.util, sys; sys.path.insert(0, {scripts!r})\n"
+        "spec = importlib.util.spec_from_file_location('python_server_manager', "
+        "{scripts!r} + '/python-server-manager.py')\n"
+        "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module)\n"
+        "manager = module.PythonServerManager(); manager.port = {port}\n"
+        "manager.start_protection()\n"
+    ),
+}
+
+SHIM = """#!{python}
+import os, sys
+args = sys.argv[1:]
+if "dev" not in args and "start" not in args:
+    sys.exit(0)  # npx kill-port 등은 무시
+port = args[args.index("-p") + 1] if "-p" in args else os.environ["RSVSHOP_STANDIN_PORT"]
+extra = os.environ.get("RSVSHOP_STANDIN_ARGS", "").split()
+os.execv(sys.executable, [sys.executable, {standin!r}, "--port", port, "--controls", "--latency-ms", "0",
+                          "--jitter-ms", "0"] + extra)
+"""
+
+
+def proc_state(pid):
+    """프로세스 상태 문자 (R/S/Z...). 회수되어 없으면 None"""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            return f.read().rsplit(")", 1)[1].split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def proc_cpu_seconds(pid):
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLK_TCK
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def proc_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def http_get(port, path, timeout=1.0):
+    """(status, body) 또는 연결 실패 시 (None, None)"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read()
+    except (OSError, http.client.HTTPException):
+        return None, None
+    finally:
+        connection.close()
+
+
+def port_accepts(port):
+    try:
+        socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+        return True
+    except OSError:
+        return False
+
+
+def wait_until(predicate, timeout, interval=0.01):
+    """predicate가 참이 되는 시각(monotonic) 또는 None"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return time.monotonic()
+        time.sleep(interval)
+    return None
+
+
+class ResourceSampler:
+    """주기적으로 RSS를 샘플링하고 구간 CPU 사용률을 계산"""
+
+    def __init__(self, pid, interval=0.1):
+        self.pid = pid
+        self.interval = interval
+        self.rss = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._cpu = proc_cpu_seconds(self.pid) or 0.0
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            rss = proc_rss_mb(self.pid)
+            if rss is not None:
+                self.rss.append(rss)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        elapsed = time.monotonic() - self._started
+        cpu = (proc_cpu_seconds(self.pid) or self._cpu) - self._cpu
+        return {
+            "seconds": round(elapsed, 2),
+            "cpu_pct": round(100 * cpu / elapsed, 2) if elapsed else 0,
+            "rss_mb_avg": round(statistics.mean(self.rss), 1) if self.rss else None,
+            "rss_mb_peak": round(max(self.rss), 1) if self.rss else None,
+        }
+
+
+class SupervisorSession:
+    """임시 작업 디렉토리에서 슈퍼바이저 1개를 띄우고 정리"""
+
+    def __init__(self, name, port, bin_dir, child_args=""):
+        self.name = name
+        self.port = port
+        self.workdir = tempfile.mkdtemp(prefix=f"rsvshop-{name}-")
+        self.log_path = os.path.join(self.workdir, "supervisor.log")
+        self.env = {**os.environ, "PATH": bin_dir + os.pathsep + os.environ.get("PATH", ""),
+                    "RSVSHOP_STANDIN_PORT": str(port), "RSVSHOP_STANDIN_ARGS": child_args,
+                    "RSVSHOP_METRICS_PORT": "0", "PYTHONUNBUFFERED": "1"}
+        self.process = None
+        self.child_pids = set()
+
+    def start(self):
+        code = SUPERVISORS[self.name].format(root=ROOT_DIR, scripts=SCRIPTS_DIR, port=self.port)
+        with open(self.log_path, "ab") as log:
+            self.process = subprocess.Popen([sys.executable, "-c", code], cwd=self.workdir, env=self.env,
+                                            stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+        return self.process.pid
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def child_info(self):
+        status, body = http_get(self.port, "/__standin/info")
+        if status != 200:
+            return None
+        info = json.loads(body)
+        self.child_pids.add(info["pid"])
+        return info
+
+    def control(self, action, **params):
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        return http_get(self.port, f"/__standin/{action}" + (f"?{query}" if query else ""))
+
+    def wait_healthy(self, timeout):
+        return wait_until(lambda: http_get(self.port, "/api/health")[0] == 200 or not self.alive,
+                          timeout, interval=0.05) if self.alive else None
+
+    def log_tail(self, lines=5):
+        try:
+            with open(self.log_path, "r", encoding="utf-8", errors="replace") as f:
+                return f.read().splitlines()[-lines:]
+        except OSError:
+            return []
+
+    def stop(self):
+        if self.alive:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(self.process.pid, signal.SIGKILL)
+                self.process.wait()
+        for pid in self.child_pids:
+            if proc_state(pid) not in (None, "Z"):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except OSError:
+                    pass
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+def run_failure(session, scenario, timeout, leak_mb=512):
+    """장애 1회 주입 후 감지/재바인딩/첫 200 시간(초) 측정"""
+    info = session.child_info()
+    if info is None:
+        return {"error": "스탠드인 자식에 접근할 수 없습니다"}
+    pid = info["pid"]
+    child_rss = []
+    if scenario == "crash":
+        session.control("crash", code=1)
+        failed_at = wait_until(lambda: proc_state(pid) in (None, "Z"), 5, interval=0.001) or time.monotonic()
+    elif scenario == "hang":
+        session.control("hang")
+        failed_at = time.monotonic()
+    else:
+        session.control("leak", mb=leak_mb, rate_mb=64)
+        failed_at = time.monotonic()
+
+    def reaped():
+        if scenario == "leak":
+            rss = proc_rss_mb(pid)
+            if rss is not None:
+                child_rss.append(rss)
+        return proc_state(pid) is None or not session.alive
+
+    detected_at = wait_until(reaped, timeout, interval=0.005)
+    result = {"detected": detected_at is not None and proc_state(pid) is None}
+    if child_rss:
+        result["child_rss_mb_peak"] = round(max(child_rss), 1)
+    if not result["detected"]:
+        if not session.alive:
+            result["supervisor_exited"] = True
+            return result
+        # 감지하지 못한 장애는 하네스가 정리하고 복구 시간만 참고로 기록
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+        killed_at = time.monotonic()
+        recovered_at = session.wait_healthy(timeout)
+        if recovered_at and session.alive:
+            result["recovery_after_forced_kill_s"] = round(recovered_at - killed_at, 3)
+        elif not session.alive:
+            result["supervisor_exited"] = True
+        return result
+
+    result["detection_s"] = round(detected_at - failed_at, 3)
+    rebound_at = wait_until(lambda: port_accepts(session.port) or not session.alive, timeout)
+    if rebound_at and session.alive:
+        result["rebind_s"] = round(rebound_at - failed_at, 3)
+        ok_at = session.wait_healthy(timeout)
+        if ok_at and session.alive:
+            result["first_200_s"] = round(ok_at - failed_at, 3)
+    if not session.alive:
+        result["supervisor_exited"] = True
+    return result
+
+
+def summarize_runs(runs):
+    summary = {"runs": runs, "detected": f"{sum(1 for r in runs if r.get('detected'))}/{len(runs)}"}
+    for key in ("detection_s", "rebind_s", "first_200_s", "recovery_after_forced_kill_s", "child_rss_mb_peak"):
+        values = [r[key] for r in runs if key in r]
+        if values:
+            summary[key] = round(statistics.median(values), 3)
+    if any(r.get("supervisor_exited") for r in runs):
+        summary["supervisor_exited"] = True
+    return summary
+
+
+class RestartBenchmark:
+    def __init__(self, supervisors, scenarios, repeat=3, timeout=30, idle=5, flood=5, flood_lines=200000,
+                 child_startup_ms=0, log=print):
+        self.supervisors = supervisors
+        self.scenarios = scenarios
+        self.repeat = repeat
+        self.timeout = timeout
+        self.idle = idle
+        self.flood = flood
+        self.flood_lines = flood_lines
+        self.child_args = f"--startup-ms {child_startup_ms}" if child_startup_ms else ""
+        self.log = log
+        self.bin_dir = tempfile.mkdtemp(prefix="rsvshop-shim-")
+        for name in ("npm", "npx"):
+            path = os.path.join(self.bin_dir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SHIM.replace("{python}", sys.executable).replace("{standin!r}", repr(STANDIN)))
+            os.chmod(path, 0o755)
+
+    def session(self, name):
+        """슈퍼바이저를 띄우고 첫 200까지 기다린 세션. 실패하면 (None, 오류)"""
+        session = SupervisorSession(name, free_port(), self.bin_dir, self.child_args)
+        started = time.monotonic()
+        session.start()
+        ready_at = session.wait_healthy(self.timeout + 60)
+        if not ready_at or not session.alive:
+            tail = session.log_tail()
+            session.stop()
+            return None, {"error": "서버가 준비되지 않았습니다", "log_tail": tail}
+        session.startup_s = round(ready_at - started, 3)
+        return session, None
+
+    def measure_overhead(self, name):
+        session, error = self.session(name)
+        if error:
+            return error
+        try:
+            result = {"startup_s": session.startup_s}
+            time.sleep(1)
+            sampler = ResourceSampler(session.process.pid).start()
+            time.sleep(self.idle)
+            result["idle"] = sampler.stop()
+            before = session.child_info() or {}
+            sampler = ResourceSampler(session.process.pid).start()
+            session.control("flood", lines=self.flood_lines)
+            time.sleep(self.flood)
+            result["flood"] = sampler.stop()
+            after = session.child_info() or {}
+            written = after.get("flood_lines", 0) - before.get("flood_lines", 0)
+            result["flood"]["lines"] = written
+            result["flood"]["lines_per_s"] = round(written / self.flood)
+            result["flood"]["child_responsive"] = bool(after)
+            return result
+        finally:
+            session.stop()
+
+    def measure_failures(self, name, scenario):
+        session, error = self.session(name)
+        if error:
+            return error
+        runs = []
+        try:
+            for _ in range(self.repeat if scenario == "crash" else 1):
+                run = run_failure(session, scenario, self.timeout)
+                runs.append(run)
+                self.log(f"    {scenario}: {json.dumps(run, ensure_ascii=False)}")
+                if "error" in run or run.get("supervisor_exited"):
+                    break
+                session.wait_healthy(self.timeout)
+            return summarize_runs(runs)
+        finally:
+            session.stop()
+
+    def run(self):
+        results = {}
+        try:
+            for name in self.supervisors:
+                self.log(f"🚀 {name}")
+                result = self.measure_overhead(name)
+                if "error" not in result:
+                    for scenario in self.scenarios:
+                        result[scenario] = self.measure_failures(name, scenario)
+                else:
+                    self.log(f"  ❌ {result['error']}: {' | '.join(result['log_tail'])}")
+                results[name] = result
+        finally:
+            shutil.rmtree(self.bin_dir, ignore_errors=True)
+        return {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": sys.version.split()[0],
+                "repeat": self.repeat,
+                "timeout": self.timeout,
+                "flood_lines": self.flood_lines,
+            },
+            "supervisors": results,
+        }
+
+
+def _fmt(value, unit="s"):
+    return "-" if value is None else f"{value}{unit}"
+
+
+def print_report(report):
+    print(f"\n📊 슈퍼바이저 재시작 벤치마크 (commit {report['meta']['commit'] or '-'})")
+    for name, result in report["supervisors"].items():
+        print(f"\n  {name}")
+        if "error" in result:
+            print(f"    ❌ {result['error']}")
+            continue
+        idle, flood = result["idle"], result["flood"]
+        print(f"    시작 {_fmt(result['startup_s'])} | 유휴 CPU {idle['cpu_pct']}% RSS {_fmt(idle['rss_mb_avg'], 'MB')}"
+              f" | 로그 폭주 CPU {flood['cpu_pct']}% RSS {_fmt(flood['rss_mb_peak'], 'MB')}"
+              f" ({flood['lines_per_s']}줄/초{'' if flood['child_responsive'] else ', 자식 응답 없음'})")
+        for scenario in ("crash", "hang", "leak"):
+            summary = result.get(scenario)
+            if not summary:
+                continue
+            if "error" in summary:
+                print(f"    {scenario:<6} ❌ {summary['error']}")
+                continue
+            line = (f"    {scenario:<6} 감지 {summary['detected']:<5} 감지 {_fmt(summary.get('detection_s')):>8}"
+                    f" 재바인딩 {_fmt(summary.get('rebind_s')):>8} 첫 200 {_fmt(summary.get('first_200_s')):>8}")
+            if "recovery_after_forced_kill_s" in summary:
+                line += f" (강제 종료 후 복구 {summary['recovery_after_forced_kill_s']}s)"
+            if summary.get("supervisor_exited"):
+                line += " ⚠️ 슈퍼바이저 종료됨"
+            print(line)
+
+
+def flatten(result, prefix=""):
+    values = {}
+    for key, value in result.items():
+        if key == "runs":
+            continue
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[prefix + key] = value
+    return values
+
+
+def compare_reports(base, new, tolerance=0.2):
+    """공통 지표 비교. lines_per_s 외에는 값이 클수록 나쁨"""
+    regressions = []
+    print(f"📊 비교: {base['meta'].get('commit') or '-'} → {new['meta'].get('commit') or '-'}")
+    for name in base["supervisors"]:
+        if name not in new["supervisors"]:
+            continue
+        a, b = flatten(base["supervisors"][name]), flatten(new["supervisors"][name])
+        print(f"\n  {name}")
+        for key in sorted(set(a) & set(b)):
+            old, cur = a[key], b[key]
+            change = (cur - old) / old if old else 0.0
+            worse = change < -tolerance if key.endswith("lines_per_s") else change > tolerance
+            worse = worse and abs(cur - old) >= (0.05 if key.endswith("_s") else 0.5)
+            if worse:
+                regressions.append((name, key, old, cur))
+            print(f"    {key:<32} {old:>10} {cur:>10} {change * 100:>+7.1f}%{' ⚠️' if worse else ''}")
+    print(f"\n{'⚠️ 회귀 ' + str(len(regressions)) + '건' if regressions else '✅ 회귀 없음'} "
+          f"(허용 오차 {int(tolerance * 100)}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 슈퍼바이저 재시작 벤치마크")
+    sub = parser.add_subparsers(dest="command")
+    run = sub.add_parser("run", help="벤치마크 실행")
+    run.add_argument("--supervisors", default=",".join(SUPERVISORS))
+    run.add_argument("--scenarios", default="crash,hang,leak")
+    run.add_argument("--repeat", type=int, default=3, help="crash 반복 횟수 (중앙값 보고)")
+    run.add_argument("--timeout", type=float, default=30, help="장애 감지/복구 대기 한도(초)")
+    run.add_argument("--idle", type=float, default=5, help="유휴 오버헤드 측정 시간(초)")
+    run.add_argument("--flood", type=float, default=5, help="로그 폭주 측정 시간(초)")
+    run.add_argument("--flood-lines", type=int, default=200000)
+    run.add_argument("--child-startup-ms", type=float, default=0, help="스탠드인 자식의 포트 바인딩 전 대기")
+    run.add_argument("--output", help="결과 JSON 경로 (기본: logs/bench/restart-<시각>.json)")
+    compare = sub.add_parser("compare", help="두 결과 비교")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.new, "r", encoding="utf-8") as f:
+            new = json.load(f)
+        return 1 if compare_reports(base, new, args.tolerance) else 0
+    if args.command != "run":
+        parser.print_help()
+        return 0
+    if not os.path.isdir("/proc"):
+        print("❌ /proc가 없는 환경에서는 실행할 수 없습니다 (Linux 전용)")
+        return 1
+
+    supervisors = [name.strip() for name in args.supervisors.split(",") if name.strip()]
+    unknown = [name for name in supervisors if name not in SUPERVISORS]
+    if unknown:
+        parser.error(f"알 수 없는 슈퍼바이저: {', '.join(unknown)}")
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip() in ("crash", "hang", "leak")]
+    report = RestartBenchmark(supervisors, scenarios, args.repeat, args.timeout, args.idle, args.flood,
+                              args.flood_lines, args.child_startup_ms).run()
+    print_report(report)
+    output = args.output or os.path.join("logs", "bench", f"restart-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 결과: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+RSVShop 공통 코어
+포트 관리자, 보호/단순 서버, 서버·브라우저 매니저, 자동 오류 수정, 스모크 테스트가 함께 쓰는
+포트 확인(ports), 프로세스 제어(proc), 로그(log), 라이프사이클 이벤트 pub/sub(events)와 통합 CLI(cli).
+표준 라이브러리만 쓰고, 무거운 모듈은 필요한 함수 안에서 가져온다 (status/stop이 빨리 뜨도록)
+"""
+
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SCRIPTS_DIR = os.path.join(ROOT_DIR, "scripts")
+DEFAULT_PORT = 4900
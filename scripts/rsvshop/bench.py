@@ -0,0 +1,118 @@
+"""
+통합 CLI 시작 시간 벤치마크
+- 명령: 새 인터프리터로 rsvshop status / stop --dry-run / --help를 반복 실행한 벽시계 시간 중앙값
+- 임포트: 각 명령이 실행하는 스크립트를 -X importtime으로 모듈 수준까지만 로드해 무거운 import를 보여준다
+  (main은 실행하지 않는다)
+
+사용법:
+  rsvshop bench [--runs 10] [--budget-ms 50] [--json]
+  status/stop의 빈 인터프리터 대비 추가 시간이 --budget-ms를 넘으면 종료 코드 1
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from . import ROOT_DIR, SCRIPTS_DIR
+
+LAUNCHER = os.path.join(ROOT_DIR, "rsvshop")
+COMMANDS = [
+    ("status", ["status"], True),
+    ("stop --dry-run", ["stop", "--dry-run"], True),
+    ("--help", ["--help"], False),
+]
+IMPORTS = [
+    ("start/server", "scripts/python-server-manager.py"),
+    ("apps", "scripts/multi_supervisor.py"),
+    ("browser", "scripts/browser-manager.py"),
+    ("fix", "scripts/auto-error-fixer.py"),
+    ("smoke", "scripts/quick-browser-test.py"),
+    ("serve", "port_manager.py"),
+]
+LOADER = (
+    "import sys, importlib.util\n"
+    "sys.path.insert(0, {scripts!r})\n"
+    "spec = importlib.util.spec_from_file_location('bench_target', {path!r})\n"
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+)
+
+
+def _wall_ms(args, runs):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT_DIR)
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def _importtime(code, skip=()):
+    """(-X importtime 최상위 누적 ms, 무거운 최상위 import 목록, 오류). skip은 로더 자체가 가져오는 모듈"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=ROOT_DIR)
+    top = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        if not cumulative.strip().isdigit() or name.startswith("  ") or name.strip() in skip:
+            continue  # 중첩 import는 상위에 누적돼 있다
+        top.append((name.strip(), int(cumulative) / 1000))
+    error = None
+    if result.returncode != 0:
+        lines = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        error = lines[-1] if lines else f"종료 코드 {result.returncode}"
+    top.sort(key=lambda item: -item[1])
+    return sum(ms for _, ms in top), top, error
+
+
+def run(runs=10):
+    baseline = _wall_ms([sys.executable, "-c", "pass"], runs)
+    commands = []
+    for label, args, budgeted in COMMANDS:
+        wall = _wall_ms([sys.executable, LAUNCHER] + args, runs)
+        commands.append({"command": label, "wall_ms": round(wall, 1),
+                         "overhead_ms": round(wall - baseline, 1), "budgeted": budgeted})
+    loader_only = LOADER.rsplit("spec.loader", 1)[0].format(scripts=SCRIPTS_DIR, path=os.devnull)
+    skip = {name for name, _ in _importtime(loader_only)[1] + [("site", 0), ("encodings", 0)]}
+    imports = []
+    for label, path in IMPORTS:
+        code = LOADER.format(scripts=SCRIPTS_DIR, path=os.path.join(ROOT_DIR, path))
+        total, top, error = _importtime(code, skip)
+        imports.append({"command": label, "script": path, "import_ms": round(total, 1),
+                        "heaviest": [{"module": name, "ms": round(ms, 1)} for name, ms in top[:5]], "error": error})
+    return {"runs": runs, "python_ms": round(baseline, 1), "commands": commands, "imports": imports}
+
+
+def print_report(report, budget_ms):
+    print(f"⏱️ 명령 시작 시간 ({report['runs']}회 중앙값, 빈 인터프리터 {report['python_ms']:.1f}ms)")
+    for item in report["commands"]:
+        mark = ""
+        if item["budgeted"]:
+            mark = " ✅" if item["overhead_ms"] <= budget_ms else f" ❌ 예산 {budget_ms:.0f}ms 초과"
+        print(f"  {item['command']:<16} {item['wall_ms']:>7.1f}ms  (+{item['overhead_ms']:.1f}ms){mark}")
+    print("📦 명령별 모듈 로드 비용 (-X importtime, 최상위 누적)")
+    for item in report["imports"]:
+        heaviest = ", ".join(f"{entry['module']} {entry['ms']:.1f}ms" for entry in item["heaviest"][:3])
+        print(f"  {item['command']:<16} {item['import_ms']:>7.1f}ms  {heaviest}")
+        if item["error"]:
+            print(f"  {'':<16} ⚠️ {item['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="rsvshop bench", description="통합 CLI 시작 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="status/stop의 인터프리터 기동 외 추가 시간 예산")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    report = run(max(1, args.runs))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report, args.budget_ms)
+    over = [item for item in report["commands"] if item["budgeted"] and item["overhead_ms"] > args.budget_ms]
+    return 1 if over else 0
@@ -0,0 +1,161 @@
+"""
+RSVShop 통합 CLI
+status/stop은 코어(ports, proc)만 읽어 수십 ms 안에 끝나고, 나머지 명령은 해당 스크립트를 이 프로세스에서
+실행해 그 스크립트가 쓰는 모듈(psutil, asyncio, 메트릭 서버 등)만 로드한다.
+
+사용법:
+  rsvshop status [--port 4900] [--json]        - 포트/서버 매니저/멀티 앱 슈퍼바이저 상태
+  rsvshop stop [--port 4900] [--dry-run]        - 슈퍼바이저 종료 요청 후 남은 포트 점유 프로세스 정리
+  rsvshop events [--app admin] [--port 4900]    - 슈퍼바이저 라이프사이클 이벤트 실시간 출력 (rsvshop/events.py)
+  rsvshop start [--prod]                        - 서버 매니저 보호 모드 (scripts/python-server-manager.py)
+  rsvshop server <명령 ...>                      - 서버 매니저의 다른 명령 (restart, routes, profile, build, ...)
+  rsvshop serve [--protected|--simple]          - port_manager.py(기본) / protected_server.py / simple_server.py
+  rsvshop apps <start|status|stop|check>        - 멀티 앱 슈퍼바이저 (scripts/multi_supervisor.py)
+  rsvshop browser <start|open|status|reset>     - 브라우저 매니저
+  rsvshop fix [monitor|fix]                     - 자동 오류 수정
+  rsvshop smoke [옵션]                           - 빠른 스모크 테스트
+  rsvshop bench [--runs 10] [--budget-ms 50]    - 명령별 시작 시간/임포트 비용 벤치마크
+윈도우: rsvshop.cmd <명령>, 그 밖에는 python rsvshop <명령> 또는 ./rsvshop <명령>
+"""
+
+import os
+import sys
+
+from . import DEFAULT_PORT, ROOT_DIR, SCRIPTS_DIR
+
+# 명령 → (위임할 스크립트, 앞에 붙일 인자)
+SCRIPTS = {
+    "start": ("scripts/python-server-manager.py", ["start"]),
+    "server": ("scripts/python-server-manager.py", []),
+    "apps": ("scripts/multi_supervisor.py", []),
+    "browser": ("scripts/browser-manager.py", []),
+    "fix": ("scripts/auto-error-fixer.py", []),
+    "smoke": ("scripts/quick-browser-test.py", []),
+}
+SERVE_SCRIPTS = {
+    "--port-manager": "port_manager.py",
+    "--protected": "protected_server.py",
+    "--simple": "simple_server.py",
+}
+
+
+def run_script(path, argv):
+    """스크립트를 __main__으로 실행하고 종료 코드 반환"""
+    import runpy
+    full = os.path.join(ROOT_DIR, path)
+    sys.argv = [full] + list(argv)
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    try:
+        runpy.run_path(full, run_name="__main__")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def _port_owner(pid):
+    from .proc import cmdline
+    text = cmdline(pid)
+    return f"PID {pid}" + (f" {text[:60]}" if text else "")
+
+
+def status(port, as_json=False):
+    from . import ports, proc
+    listening = ports.port_in_use(port)
+    report = {
+        "port": port,
+        "listening": listening,
+        "pids": ports.listening_pids(port) if listening else [],
+        "server": proc.read_state("server"),
+        "apps": proc.read_state("apps"),
+    }
+    if as_json:
+        import json
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    print("📊 RSVShop 상태")
+    if listening:
+        owners = ", ".join(_port_owner(pid) for pid in report["pids"]) or "소유 프로세스 확인 불가"
+        print(f"  포트 {port}: 🔴 사용 중 ({owners})")
+    else:
+        print(f"  포트 {port}: 🟢 비어 있음")
+    server = report["server"]
+    if server:
+        print(f"  서버 매니저: 🟢 PID {server['supervisor_pid']} (자식 {server.get('child_pid') or '-'}, "
+              f"포트 {server.get('port')}, {server.get('mode', 'dev')}, 갱신 {server.get('updated_at', '-')})")
+    else:
+        print("  서버 매니저: ⚪ 실행 중 아님")
+    apps = report["apps"]
+    if apps:
+        print(f"  멀티 앱 슈퍼바이저: 🟢 PID {apps['supervisor_pid']} (갱신 {apps.get('updated_at', '-')})")
+        for name, app in apps.get("apps", {}).items():
+            print(f"    {name:<10} :{app.get('port')} {app.get('state')} PID {app.get('pid') or '-'} "
+                  f"재시작 {app.get('restarts', 0)}회")
+    else:
+        print("  멀티 앱 슈퍼바이저: ⚪ 실행 중 아님")
+    return 0
+
+
+def stop(port, dry_run=False, timeout=30):
+    from . import ports, proc
+    supervisors = [(kind, label, proc.read_state(kind)) for kind, label in
+                   (("server", "서버 매니저"), ("apps", "멀티 앱 슈퍼바이저"))]
+    if dry_run:
+        for _, label, state in supervisors:
+            if state:
+                print(f"  🛑 {label} PID {state['supervisor_pid']} 종료 요청 예정")
+        for pid in ports.listening_pids(port):
+            print(f"  🛑 포트 {port} 점유 {_port_owner(pid)} 종료 예정")
+        return 0
+    stopped = [proc.stop_supervisor(kind, timeout) for kind, _, state in supervisors if state]
+    killed = ports.free_port(port)
+    if not any(stopped) and not killed:
+        print("실행 중인 서버가 없습니다.")
+        return 0
+    if ports.port_in_use(port):
+        print(f"⚠️ 포트 {port}가 아직 사용 중입니다.")
+        return 1
+    print("✅ 종료했습니다.")
+    return 0
+
+
+def _option(argv, name, default, cast=str):
+    if name in argv:
+        index = argv.index(name)
+        if index + 1 < len(argv):
+            return cast(argv[index + 1])
+    return default
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    os.chdir(ROOT_DIR)  # 스크립트들은 logs/, config/를 루트 기준 상대 경로로 쓴다
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(__doc__.strip())
+        return 0
+    command, rest = argv[0], argv[1:]
+    try:
+        port = _option(rest, "--port", DEFAULT_PORT, int)
+    except ValueError:
+        print("❌ --port는 숫자여야 합니다")
+        return 2
+    if command == "status":
+        return status(port, "--json" in rest)
+    if command == "stop":
+        return stop(port, "--dry-run" in rest)
+    if command == "events":
+        from .events import watch
+        app = _option(rest, "--app", None)
+        return watch([app] if app else None, [port] if "--port" in rest else None)
+    if command == "bench":
+        from .bench import main as bench_main
+        return bench_main(rest)
+    if command == "serve":
+        flags = [flag for flag in rest if flag in SERVE_SCRIPTS]
+        return run_script(SERVE_SCRIPTS[flags[0]] if flags else SERVE_SCRIPTS["--port-manager"],
+                          [arg for arg in rest if arg not in SERVE_SCRIPTS])
+    if command in SCRIPTS:
+        path, prefix = SCRIPTS[command]
+        return run_script(path, prefix + rest)
+    print(f"알 수 없는 명령어: {command} (rsvshop --help)")
+    return 2
@@ -0,0 +1,306 @@
+"""
+라이프사이클 이벤트 pub/sub (로컬 전용)
+슈퍼바이저가 starting → listening → warmed → ready, crashed → restarting, stopped 이벤트를 발행하면
+구독자(브라우저 매니저 등)가 즉시 반응한다. 구독자는 recv에서 블로킹하므로 아무 일이 없으면 깨어나지 않는다.
+
+  starting    자식 프로세스 실행
+  listening   포트가 연결을 받음 (Next.js "Local: http...")
+  warmed      Next.js "Ready in" (프레임워크 준비 완료, 첫 요청 전)
+  ready       첫 HTTP 응답/헬스 체크 통과 - 브라우저를 열어도 되는 시점
+  crashed     예상하지 못한 종료 (code)
+  restarting  재시작 예정 (reason, delay)
+  stopped     정상 종료 또는 재시작 포기 (reason)
+
+채널: 구독자마다 logs/lifecycle/sub-<pid>-<n>.sock (AF_UNIX SOCK_DGRAM)에 바인딩하고, 발행자는 디렉터리의
+      구독자 전부에 보낸다 (브로커 없음). AF_UNIX를 못 쓰면(윈도우, 경로가 너무 긴 경우) 127.0.0.1 UDP 포트를
+      sub-<pid>-<n>.port 파일에 적는다. 디렉터리는 RSVSHOP_LIFECYCLE_DIR로 바꿀 수 있다.
+      (logs/events/는 event_collector.py의 브라우저 이벤트 세그먼트용)
+프레임: b"RSVE" + 버전 1바이트 + UTF-8 JSON {"event", "app", "port", "pid", "supervisor", "at", ...}.
+      데이터그램 하나가 이벤트 하나라 길이 필드가 필요 없고, 매직/버전이 다르면 버린다.
+최근 상태: 발행자는 앱별 마지막 이벤트를 <앱>.last.json에 원자적으로 기록한다. 구독자는 소켓을 만든 뒤 이
+      파일을 읽으므로 구독하기 전에 이미 ready였던 서버도 놓치지 않는다 (발행자가 죽었으면 무시).
+
+발행자: python-server-manager.py, multi_supervisor.py, 그리고 Popen으로 자식을 띄우는 런처
+      (port_manager.py, protected_server.py, simple_server.py)는 ProcessEvents로 starting/listening/ready/
+      crashed/restarting/stopped를 발행한다 (ready = 포트가 열림).
+
+사용법:
+  rsvshop events [--app admin] [--port 4900]   - 이벤트를 실시간으로 출력 (최근 상태부터)
+"""
+
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+
+from . import ROOT_DIR, proc
+
+EVENTS = ("starting", "listening", "warmed", "ready", "crashed", "restarting", "stopped")
+MAGIC = b"RSVE"
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION])
+MAX_DATAGRAM = 64 * 1024
+UNIX_PATH_MAX = 100  # sun_path 한도(104~108)보다 약간 작게
+_counter = itertools.count()
+
+
+def events_dir():
+    return os.environ.get("RSVSHOP_LIFECYCLE_DIR") or os.path.join(ROOT_DIR, "logs", "lifecycle")
+
+
+def encode(message):
+    return HEADER + json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode(data):
+    """프레임 → dict (형식이 다르면 None)"""
+    if not data.startswith(HEADER):
+        return None
+    try:
+        message = json.loads(data[len(HEADER):].decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return message if isinstance(message, dict) and message.get("event") in EVENTS else None
+
+
+def _subscriber_pid(name):
+    try:
+        return int(name.split("-")[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class Publisher:
+    """슈퍼바이저 쪽. 여러 스레드에서 publish해도 된다 (보내기는 논블로킹이라 느린 구독자가 막지 않음)"""
+
+    def __init__(self, directory=None, log=None):
+        self.directory = directory or events_dir()
+        self.log = log
+        self.lock = threading.Lock()
+        self.unix = None
+        self.udp = None
+        os.makedirs(self.directory, exist_ok=True)
+
+    def publish(self, event, app, port=None, pid=None, **fields):
+        if event not in EVENTS:
+            raise ValueError(f"알 수 없는 이벤트: {event}")
+        message = {"event": event, "app": app, "port": port, "pid": pid,
+                   "supervisor": os.getpid(), "at": round(time.time(), 3), **fields}
+        data = encode(message)
+        with self.lock:
+            self._write_last(app, message)
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                return message
+            for name in names:
+                if name.startswith("sub-") and name.endswith(".sock"):
+                    self._send_unix(os.path.join(self.directory, name), data)
+                elif name.startswith("sub-") and name.endswith(".port"):
+                    self._send_udp(os.path.join(self.directory, name), data)
+        return message
+
+    def _write_last(self, app, message):
+        path = os.path.join(self.directory, f"{app}.last.json")
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(message, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+
+    def _send_unix(self, path, data):
+        if self.unix is None:
+            self.unix = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.unix.setblocking(False)
+        try:
+            self.unix.sendto(data, path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            self._remove_stale(path)  # 구독자가 정리하지 못하고 죽었다
+        except BlockingIOError:
+            if self.log:
+                self.log(f"⚠️ 구독자 수신 버퍼가 가득 차 이벤트를 버렸습니다: {os.path.basename(path)}")
+        except OSError:
+            pass
+
+    def _send_udp(self, path, data):
+        if not proc.pid_alive(_subscriber_pid(os.path.basename(path))):
+            self._remove_stale(path)
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                port = int(f.read().strip())
+        except (OSError, ValueError):
+            return
+        if self.udp is None:
+            self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.udp.setblocking(False)
+        try:
+            self.udp.sendto(data, ("127.0.0.1", port))
+        except OSError:
+            pass
+
+    def _remove_stale(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def close(self):
+        for sock in (self.unix, self.udp):
+            if sock is not None:
+                sock.close()
+        self.unix = self.udp = None
+
+
+class Subscriber:
+    """구독자 쪽. for 문으로 돌리면 최근 상태(snapshot) 다음 새 이벤트가 올 때마다 하나씩 나온다"""
+
+    def __init__(self, apps=None, ports=None, directory=None):
+        self.apps = set(apps) if apps else None
+        self.ports = set(ports) if ports else None
+        self.directory = directory or events_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"sub-{os.getpid()}-{next(_counter)}")
+        self.path = None
+        if hasattr(socket, "AF_UNIX") and len(base) + 5 <= UNIX_PATH_MAX:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.path = base + ".sock"
+            if os.path.exists(self.path):  # 같은 PID를 쓰던 이전 프로세스의 잔재
+                os.remove(self.path)
+            self.sock.bind(self.path)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.bind(("127.0.0.1", 0))
+            self.path = base + ".port"
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(str(self.sock.getsockname()[1]))
+
+    def wants(self, message):
+        return ((self.apps is None or message.get("app") in self.apps)
+                and (self.ports is None or message.get("port") in self.ports))
+
+    def snapshot(self):
+        """앱별 마지막 이벤트 (발행한 슈퍼바이저가 살아 있는 것만, 시간순)"""
+        messages = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".last.json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as f:
+                    message = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if isinstance(message, dict) and self.wants(message) and proc.pid_alive(message.get("supervisor")):
+                messages.append(message)
+        return sorted(messages, key=lambda message: message.get("at", 0))
+
+    def recv(self, timeout=None):
+        """다음 이벤트. timeout이 None이면 올 때까지 블로킹, 시간 초과면 None"""
+        self.sock.settimeout(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                data = self.sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                return None
+            message = decode(data)
+            if message is not None and self.wants(message):
+                return message
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.sock.settimeout(remaining)
+
+    def __iter__(self):
+        yield from self.snapshot()
+        while True:
+            yield self.recv()
+
+    def close(self):
+        self.sock.close()
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ProcessEvents:
+    """출력/헬스 체크 훅이 없는 단순 런처용 발행기. 포트가 열리면 listening과 ready를 함께 발행한다"""
+
+    def __init__(self, app, port, publisher=None, timeout=180):
+        self.app = app
+        self.port = port
+        self.timeout = timeout
+        self.publisher = publisher or Publisher()
+        self.process = None
+
+    def publish(self, event, **fields):
+        fields.setdefault("pid", self.process.pid if self.process else None)
+        try:
+            self.publisher.publish(event, self.app, port=self.port, **fields)
+        except OSError:
+            pass  # 이벤트는 부가 기능이라 서버 실행을 막지 않는다
+
+    def starting(self, process):
+        """자식을 띄운 직후 호출. 포트가 열릴 때까지만 백그라운드에서 확인한다"""
+        self.process = process
+        self.publish("starting")
+        threading.Thread(target=self._wait_listening, args=(process,), name="lifecycle-listen", daemon=True).start()
+
+    def _wait_listening(self, process):
+        from .ports import port_in_use
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline and process.poll() is None:
+            if port_in_use(self.port):
+                if process is self.process:
+                    self.publish("listening", pid=process.pid)
+                    self.publish("ready", pid=process.pid)
+                return
+            time.sleep(0.2)
+
+    def exited(self, code, restart_delay=None):
+        """자식 종료. restart_delay가 있으면 재시작 예정"""
+        if code:
+            self.publish("crashed", code=code)
+        else:
+            self.publish("stopped", reason="exit")
+        if restart_delay is not None:
+            self.publish("restarting", reason="crash" if code else "exit", delay=restart_delay)
+
+    def stopped(self, reason="stop"):
+        self.publish("stopped", reason=reason)
+
+
+def describe(message):
+    """이벤트 한 줄 요약"""
+    icon = {"starting": "🟡", "listening": "🟡", "warmed": "🟡", "ready": "🟢",
+            "crashed": "🔴", "restarting": "🔄", "stopped": "⚪"}.get(message["event"], "•")
+    stamp = time.strftime("%H:%M:%S", time.localtime(message.get("at", 0)))
+    extra = " ".join(f"{key}={value}" for key, value in message.items()
+                     if key not in ("event", "app", "port", "pid", "supervisor", "at") and value is not None)
+    return (f"[{stamp}] {icon} {message.get('app')}:{message.get('port')} {message['event']}"
+            f" (PID {message.get('pid') or '-'}){' ' + extra if extra else ''}")
+
+
+def watch(apps=None, ports=None):
+    """이벤트를 계속 출력 (Ctrl+C로 종료)"""
+    try:
+        with Subscriber(apps, ports) as subscriber:
+            print(f"📡 이벤트 구독 중: {subscriber.path}")
+            for message in subscriber:
+                print(describe(message), flush=True)
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,23 @@
+"""타임스탬프 로그: 콘솔 출력 + 파일 추가 ([YYYY-mm-dd HH:MM:SS] 메시지)"""
+
+import os
+import time
+
+
+class Logger:
+    def __init__(self, path=None, echo=True):
+        self.path = path
+        self.echo = echo
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def __call__(self, message):
+        line = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}"
+        if self.echo:
+            print(line, flush=True)
+        if self.path:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                pass
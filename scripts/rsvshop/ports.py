@@ -0,0 +1,114 @@
+"""포트 확인/해제. 사용 여부는 소켓 연결로, 소유 PID는 /proc(리눅스) → netstat(윈도우) → lsof 순으로 찾는다
+(subprocess는 netstat/lsof가 필요할 때만 가져온다)"""
+
+import os
+import socket
+import sys
+import time
+
+from . import proc
+
+LISTEN = "0A"  # /proc/net/tcp 상태 코드
+
+
+def port_in_use(port, host="127.0.0.1", timeout=0.2):
+    """포트에 연결이 되면 True (IPv4, 안 되면 ::1)"""
+    for family, address in ((socket.AF_INET, host), (socket.AF_INET6, "::1")):
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                if sock.connect_ex((address, port)) == 0:
+                    return True
+        except OSError:
+            continue
+    return False
+
+
+def _proc_listen_inodes(port):
+    inodes = set()
+    for name in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(name, "r") as f:
+                next(f)
+                for line in f:
+                    fields = line.split()
+                    if fields[3] == LISTEN and int(fields[1].rsplit(":", 1)[1], 16) == port:
+                        inodes.add(fields[9])
+        except (OSError, StopIteration, IndexError, ValueError):
+            continue
+    return inodes
+
+
+def _proc_socket_owners(inodes):
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        fd_dir = f"/proc/{entry}/fd"
+        try:
+            for fd in os.listdir(fd_dir):
+                try:
+                    if os.readlink(f"{fd_dir}/{fd}") in targets:
+                        pids.append(int(entry))
+                        break
+                except OSError:
+                    continue
+        except OSError:
+            continue
+    return pids
+
+
+def _netstat_pids(port):
+    import subprocess
+    result = subprocess.run(["netstat", "-ano"], capture_output=True, text=True)
+    pids = []
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 5 and parts[1].endswith(f":{port}") and "LISTEN" in line and parts[-1].isdigit():
+            pids.append(int(parts[-1]))
+    return pids
+
+
+def listening_pids(port):
+    """포트를 LISTEN 중인 프로세스 PID 목록 (찾지 못하면 빈 목록)"""
+    try:
+        if sys.platform.startswith("linux") and os.path.isdir("/proc/net"):
+            inodes = _proc_listen_inodes(port)
+            return sorted(set(_proc_socket_owners(inodes))) if inodes else []
+        if os.name == "nt":
+            return sorted(set(_netstat_pids(port)))
+        import subprocess
+        result = subprocess.run(["lsof", "-t", f"-iTCP:{port}", "-sTCP:LISTEN"], capture_output=True, text=True)
+        return sorted({int(pid) for pid in result.stdout.split() if pid.isdigit()})
+    except (OSError, ValueError):
+        return []
+
+
+def free_port(port, log=print, timeout=5):
+    """포트를 LISTEN 중인 프로세스를 종료. 종료한 PID 목록"""
+    killed = []
+    for pid in listening_pids(port):
+        if pid == os.getpid():
+            continue
+        if proc.terminate(pid, timeout=timeout):
+            log(f"포트 {port}의 프로세스 {pid} 종료됨")
+            killed.append(pid)
+    return killed
+
+
+def find_available_port(start_port, max_search=10):
+    for port in range(start_port, start_port + max_search):
+        if not port_in_use(port):
+            return port
+    raise OSError(f"사용 가능한 포트를 찾을 수 없습니다 ({start_port}-{start_port + max_search})")
+
+
+def wait_for_port(port, timeout=60, interval=0.2, open_=True):
+    """포트가 열릴(open_=False면 닫힐) 때까지 대기. 제한 시간 안에 되면 True"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if port_in_use(port) == open_:
+            return True
+        time.sleep(interval)
+    return port_in_use(port) == open_
@@ -0,0 +1,100 @@
+"""프로세스 제어: 생존 확인, 단계적 종료(TERM → KILL), 슈퍼바이저 상태 파일, npm 명령"""
+
+import json
+import os
+import signal
+import time
+
+STATE_FILES = {
+    "server": "logs/python-server-manager.state.json",
+    "apps": "logs/multi-supervisor.state.json",
+}
+
+
+def pid_alive(pid):
+    if not pid:
+        return False
+    if os.name == "nt":
+        import subprocess
+        result = subprocess.run(["tasklist", "/FI", f"PID eq {pid}", "/NH"], capture_output=True, text=True)
+        return str(pid) in result.stdout
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    try:  # 좀비는 종료된 것으로 본다
+        with open(f"/proc/{pid}/stat", "r") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+def terminate(pid, timeout=10, group=False):
+    """SIGTERM(그룹이면 killpg) 후 timeout초 안에 안 끝나면 SIGKILL. 종료됐으면 True"""
+    if os.name == "nt":
+        import subprocess
+        result = subprocess.run(["taskkill", "/F"] + (["/T"] if group else []) + ["/PID", str(pid)],
+                                capture_output=True)
+        return result.returncode == 0
+    kill = os.killpg if group else os.kill
+    try:
+        kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not pid_alive(pid):
+            return True
+        time.sleep(0.1)
+    try:
+        kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        return True
+    time.sleep(0.2)
+    return not pid_alive(pid)
+
+
+def read_state(kind_or_path):
+    """슈퍼바이저 상태 파일. 파일이 없거나 기록한 슈퍼바이저가 죽었으면 None"""
+    path = STATE_FILES.get(kind_or_path, kind_or_path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or not pid_alive(state.get("supervisor_pid")):
+        return None
+    return state
+
+
+def stop_supervisor(kind_or_path, timeout=30, log=print):
+    """상태 파일의 슈퍼바이저에 SIGTERM을 보내 자식까지 정리하게 하고 종료를 기다린다. 멈춘 PID 또는 None"""
+    state = read_state(kind_or_path)
+    if state is None:
+        return None
+    pid = state["supervisor_pid"]
+    log(f"🛑 슈퍼바이저 종료 요청 (PID {pid})")
+    if not terminate(pid, timeout=timeout):
+        log(f"⚠️ 슈퍼바이저 {pid}가 {timeout}초 안에 종료되지 않았습니다")
+        return None
+    child = state.get("child_pid")
+    if child and pid_alive(child):  # 강제 종료된 슈퍼바이저가 남긴 자식
+        terminate(child, timeout=5)
+    return pid
+
+
+def npm_command(*args):
+    """npm 실행 인자 (윈도우는 cmd /c 경유)"""
+    return (["cmd", "/c", "npm"] if os.name == "nt" else ["npm"]) + list(args)
+
+
+def cmdline(pid):
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ").decode("utf-8", "replace").strip()
+    except OSError:
+        return ""
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+RSVShop 스크린샷 회귀 비교
+관리자 화면 캡처(admin-*.png, logs/screenshot-*, test-results/)를 NumPy 배열로 읽어
+타일 단위 픽셀 차이와 SSIM(구조 유사도)을 벡터 연산으로 계산하고, 차이 마스크/변경 영역 박스/표시 이미지를 만든다.
+여러 쌍은 프로세스 풀로 병렬 비교한다. 바이트가 같은 파일은 디코딩 없이 통과.
+
+NumPy가 필요하다 (pip install numpy). Pillow가 있으면 디코딩에 쓰고, 없으면 내장 PNG 디코더
+(8비트 비인터레이스 PNG, 필터 복원은 대각선 파면 단위 벡터 연산)를 쓴다.
+
+사용법:
+  python scripts/screenshot_diff.py diff <기준.png|기준폴더> <현재.png|현재폴더> [--out logs/visual-diff]
+  python scripts/screenshot_diff.py git [--rev HEAD] [경로/패턴 ...]   # 커밋된 캡처 대비 작업 트리
+  옵션: --tile 32 --threshold 16 --ssim 0.98 --workers N --no-images --json
+종료 코드: 0 차이 없음, 1 차이 있음, 2 실행 불가
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+OUT_DIR = "logs/visual-diff"
+TILE = 32
+PIXEL_THRESHOLD = 16  # 채널 최대 차이(0~255)가 이보다 크면 변경 픽셀
+SSIM_THRESHOLD = 0.98  # 타일 SSIM이 이보다 낮으면 변경 타일
+MIN_TILE_FRACTION = 0.002  # 타일 안 변경 픽셀 비율 하한 (안티에일리어싱 잡음 무시)
+CAPTURE_PATTERNS = ("admin-*.png", "logs/screenshot-*.png", "logs/screenshots/*.png", "test-results/**/*.png")
+C1 = (0.01 * 255) ** 2
+C2 = (0.03 * 255) ** 2
+
+
+class ImageError(Exception):
+    pass
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImageError("NumPy가 필요합니다 (pip install numpy)")
+    return numpy
+
+
+# PNG 입출력 ----------------------------------------------------------------------
+
+def _unfilter(np, raw, filters, height, width, bpp):
+    """PNG 스캔라인 필터 복원.
+    (y, x)는 왼쪽·위·왼쪽위에만 의존하므로 x + y가 같은 대각선은 한 번에 계산할 수 있다.
+    행 y를 y칸 밀어 둔 배열에서는 대각선 하나가 열 하나가 되어, 높이+너비 번의 슬라이스 연산으로 끝난다"""
+    skew = np.zeros((height + 1, width + height + 2, bpp), np.int16)  # 0행/0열은 경계(0)
+    data = raw.reshape(height, width, bpp)
+    for y in range(height):
+        skew[y + 1, y + 2:y + 2 + width] = data[y]
+    out = np.zeros_like(skew)
+    kinds = filters.astype(np.int16)[:, None]
+    for k in range(width + height - 1):
+        lo, hi = max(0, k - width + 1), min(height - 1, k)
+        rows = slice(lo + 1, hi + 2)
+        above = slice(lo, hi + 1)
+        a = out[rows, k + 1]  # 왼쪽 (같은 행, 이전 대각선)
+        b = out[above, k + 1]  # 위 (위 행, 이전 대각선)
+        c = out[above, k]  # 왼쪽 위 (두 대각선 전)
+        kind = kinds[lo:hi + 1]
+        p_a, p_b, p_c = np.abs(b - c), np.abs(a - c), np.abs(a + b - 2 * c)
+        paeth = np.where((p_a <= p_b) & (p_a <= p_c), a, np.where(p_b <= p_c, b, c))
+        predictor = np.select([kind == 1, kind == 2, kind == 3, kind == 4], [a, b, (a + b) >> 1, paeth], 0)
+        out[rows, k + 2] = (skew[rows, k + 2] + predictor) & 0xFF
+    result = np.empty((height, width, bpp), np.uint8)
+    for y in range(height):
+        result[y] = out[y + 1, y + 2:y + 2 + width]
+    return result
+
+
+def decode_png(data):
+    """PNG 바이트 → (H, W, 3) uint8 RGB (알파는 흰 배경에 합성)"""
+    np = _numpy()
+    if data[:8] != PNG_SIGNATURE:
+        raise ImageError("PNG가 아닙니다")
+    pos = 8
+    header = None
+    palette = None
+    transparency = None
+    idat = []
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"PLTE":
+            palette = np.frombuffer(chunk, np.uint8).reshape(-1, 3)
+        elif kind == b"tRNS":
+            transparency = np.frombuffer(chunk, np.uint8)
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+    if header is None:
+        raise ImageError("IHDR가 없습니다")
+    width, height, depth, color, _, _, interlace = header
+    if depth != 8 or interlace or color not in CHANNELS:
+        raise ImageError(f"8비트 비인터레이스 PNG만 지원합니다 (depth={depth}, interlace={interlace}) - Pillow를 설치하세요")
+    bpp = CHANNELS[color]
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), np.uint8)
+    if raw.size != height * (width * bpp + 1):
+        raise ImageError("IDAT 크기가 맞지 않습니다")
+    rows = raw.reshape(height, width * bpp + 1)
+    filters = rows[:, 0]
+    if filters.max(initial=0) == 0:
+        pixels = rows[:, 1:].reshape(height, width, bpp)
+    else:
+        pixels = _unfilter(np, rows[:, 1:], filters, height, width, bpp)
+    if color == 3:
+        if palette is None:
+            raise ImageError("PLTE가 없습니다")
+        index = pixels[..., 0]
+        rgb = palette[index]
+        if transparency is not None:
+            alpha = np.full(len(palette), 255, np.uint8)
+            alpha[:len(transparency)] = transparency[:len(palette)]
+            return _flatten(np, rgb, alpha[index])
+        return rgb
+    if color == 0:
+        return np.repeat(pixels, 3, axis=2)
+    if color == 4:
+        return _flatten(np, np.repeat(pixels[..., :1], 3, axis=2), pixels[..., 1])
+    if color == 6:
+        return _flatten(np, pixels[..., :3], pixels[..., 3])
+    return pixels
+
+
+def _flatten(np, rgb, alpha):
+    """알파를 흰 배경에 합성"""
+    a = alpha.astype(np.uint16)[..., None]
+    return ((rgb.astype(np.uint16) * a + 255 * (255 - a) + 127) // 255).astype(np.uint8)
+
+
+def load_image(data):
+    """PNG 바이트 → RGB 배열. Pillow가 있으면 사용 (모든 PNG 형식, C 디코더)"""
+    np = _numpy()
+    try:
+        from PIL import Image
+    except ImportError:
+        return decode_png(data)
+    import io
+    with Image.open(io.BytesIO(data)) as image:
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGBA", image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, image)
+        return np.asarray(image.convert("RGB"))
+
+
+def encode_png(pixels):
+    """(H, W) 회색조 또는 (H, W, 3) RGB uint8 → PNG 바이트 (필터 0)"""
+    np = _numpy()
+    if pixels.ndim == 2:
+        color, pixels = 0, pixels[..., None]
+    else:
+        color = 2
+    height, width, bpp = pixels.shape
+    rows = np.zeros((height, width * bpp + 1), np.uint8)
+    rows[:, 1:] = pixels.reshape(height, -1)
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    return (PNG_SIGNATURE + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)) + chunk(b"IEND", b""))
+
+
+# 비교 ------------------------------------------------------------------------
+
+def _tiles(np, values, tile):
+    """(H, W) → (행 타일 수, 열 타일 수, tile*tile). H, W는 tile의 배수"""
+    rows, cols = values.shape[0] // tile, values.shape[1] // tile
+    return values.reshape(rows, tile, cols, tile).swapaxes(1, 2).reshape(rows, cols, tile * tile)
+
+
+def _pad(np, values, tile):
+    height, width = values.shape[:2]
+    pad = ((0, -height % tile), (0, -width % tile)) + ((0, 0),) * (values.ndim - 2)
+    return np.pad(values, pad, mode="edge") if any(p[1] for p in pad[:2]) else values
+
+
+def tile_components(changed):
+    """변경 타일 격자의 8-연결 성분 → [(행0, 열0, 행1, 열1)] (포함 범위)"""
+    rows, cols = changed.shape
+    seen = set()
+    boxes = []
+    for start in zip(*changed.nonzero()):
+        start = (int(start[0]), int(start[1]))
+        if start in seen:
+            continue
+        seen.add(start)
+        stack = [start]
+        r0, c0, r1, c1 = start[0], start[1], start[0], start[1]
+        while stack:
+            r, c = stack.pop()
+            r0, c0, r1, c1 = min(r0, r), min(c0, c), max(r1, r), max(c1, c)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols and changed[nr, nc] and (nr, nc) not in seen:
+                        seen.add((nr, nc))
+                        stack.append((nr, nc))
+        boxes.append((r0, c0, r1, c1))
+    return boxes
+
+
+def compare_arrays(base, current, tile=TILE, threshold=PIXEL_THRESHOLD, ssim_threshold=SSIM_THRESHOLD):
+    """두 RGB 배열 비교 → (결과 dict, 변경 픽셀 마스크). 크기가 다르면 겹치는 영역을 비교하고 나머지는 변경으로 본다"""
+    np = _numpy()
+    height, width = min(base.shape[0], current.shape[0]), min(base.shape[1], current.shape[1])
+    a = base[:height, :width]
+    b = current[:height, :width]
+    delta = np.abs(a.astype(np.int16) - b.astype(np.int16)).max(axis=2)
+    mask = delta > threshold
+
+    weights = np.array([0.299, 0.587, 0.114], np.float32)
+    gray_a = _tiles(np, _pad(np, a.astype(np.float32) @ weights, tile), tile)
+    gray_b = _tiles(np, _pad(np, b.astype(np.float32) @ weights, tile), tile)
+    mu_a, mu_b = gray_a.mean(-1), gray_b.mean(-1)
+    centered_a, centered_b = gray_a - mu_a[..., None], gray_b - mu_b[..., None]
+    var_a, var_b = (centered_a ** 2).mean(-1), (centered_b ** 2).mean(-1)
+    cov = (centered_a * centered_b).mean(-1)
+    ssim = ((2 * mu_a * mu_b + C1) * (2 * cov + C2)) / ((mu_a ** 2 + mu_b ** 2 + C1) * (var_a + var_b + C2))
+    fraction = _tiles(np, _pad(np, mask, tile), tile).mean(-1)
+    changed = (fraction > MIN_TILE_FRACTION) | (ssim < ssim_threshold)
+
+    boxes = []
+    for r0, c0, r1, c1 in tile_components(changed):
+        y0, x0 = r0 * tile, c0 * tile
+        y1, x1 = min((r1 + 1) * tile, height), min((c1 + 1) * tile, width)
+        region = mask[y0:y1, x0:x1]
+        ys, xs = region.any(axis=1).nonzero()[0], region.any(axis=0).nonzero()[0]
+        if len(ys):  # 변경 픽셀 범위로 좁힘 (SSIM만 걸린 영역은 타일 경계 그대로)
+            y0, y1, x0, x1 = y0 + int(ys[0]), y0 + int(ys[-1]) + 1, x0 + int(xs[0]), x0 + int(xs[-1]) + 1
+        boxes.append({"x": x0, "y": y0, "w": x1 - x0, "h": y1 - y0, "pixels": int(region.sum()),
+                      "ssim": round(float(ssim[r0:r1 + 1, c0:c1 + 1].min()), 4)})
+    size_changed = base.shape[:2] != current.shape[:2]
+    full_height, full_width = max(base.shape[0], current.shape[0]), max(base.shape[1], current.shape[1])
+    extra = full_height * full_width - height * width
+    if size_changed:  # 한쪽에만 있는 영역
+        if full_height > height:
+            boxes.append({"x": 0, "y": height, "w": full_width, "h": full_height - height,
+                          "pixels": full_width * (full_height - height), "ssim": None})
+        if full_width > width:
+            boxes.append({"x": width, "y": 0, "w": full_width - width, "h": height,
+                          "pixels": (full_width - width) * height, "ssim": None})
+    boxes.sort(key=lambda box: -box["w"] * box["h"])
+    changed_pixels = int(mask.sum()) + extra
+    result = {
+        "status": "size" if size_changed else ("changed" if boxes else "same"),
+        "base_size": [int(base.shape[1]), int(base.shape[0])],
+        "current_size": [int(current.shape[1]), int(current.shape[0])],
+        "changed_pixels": changed_pixels,
+        "changed_ratio": round(changed_pixels / (full_height * full_width), 6),
+        "ssim_min": round(float(ssim.min()), 4),
+        "ssim_mean": round(float(ssim.mean()), 4),
+        "tiles_changed": int(changed.sum()),
+        "tiles": int(changed.size),
+        "boxes": boxes,
+    }
+    return result, mask
+
+
+def render_diff(current, mask, boxes):
+    """흐리게 한 현재 화면 위에 변경 픽셀(빨강)과 영역 박스(자홍) 표시"""
+    np = _numpy()
+    height, width = mask.shape
+    view = np.full(current.shape, 255, np.uint8)
+    gray = (current.astype(np.float32) @ np.array([0.299, 0.587, 0.114], np.float32)).astype(np.uint8)
+    view[...] = (gray // 3 + 170)[..., None]
+    view[:height, :width][mask] = (255, 0, 0)
+    for box in boxes:
+        x0, y0 = box["x"], box["y"]
+        x1, y1 = min(x0 + box["w"], view.shape[1]) - 1, min(y0 + box["h"], view.shape[0]) - 1
+        if x1 < x0 or y1 < y0:
+            continue
+        for edge in (view[y0:y0 + 2, x0:x1 + 1], view[max(y0, y1 - 1):y1 + 1, x0:x1 + 1],
+                     view[y0:y1 + 1, x0:x0 + 2], view[y0:y1 + 1, max(x0, x1 - 1):x1 + 1]):
+            edge[...] = (255, 0, 255)
+    return view
+
+
+# 작업 단위 -------------------------------------------------------------------------
+
+def _read_source(source):
+    """('file', 경로) 또는 ('git', 'rev:경로') → 바이트 (없으면 None)"""
+    kind, ref = source
+    if kind == "file":
+        if not os.path.exists(ref):
+            return None
+        with open(ref, "rb") as f:
+            return f.read()
+    result = subprocess.run(["git", "cat-file", "blob", ref], capture_output=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def _safe_name(name):
+    return name.replace(os.sep, "__").replace("/", "__")
+
+
+def compare_pair(job):
+    """병렬 작업 하나: 두 소스를 읽어 비교하고 (요청 시) 마스크/표시 이미지 저장"""
+    started = time.perf_counter()
+    name, base_source, current_source, options = job
+    result = {"name": name}
+    try:
+        base, current = _read_source(base_source), _read_source(current_source)
+        if base is None or current is None:
+            result["status"] = "new" if base is None else "missing"
+            return result
+        if hashlib.blake2b(base).digest() == hashlib.blake2b(current).digest():
+            result.update(status="same", identical=True)
+            return result
+        base_image, current_image = load_image(base), load_image(current)
+        decoded = time.perf_counter()
+        compared, mask = compare_arrays(base_image, current_image, options["tile"], options["threshold"],
+                                        options["ssim"])
+        result.update(compared)
+        result["decode_s"] = round(decoded - started, 3)
+        if options["out"] and compared["status"] != "same":
+            os.makedirs(options["out"], exist_ok=True)
+            stem = os.path.join(options["out"], _safe_name(os.path.splitext(name)[0]))
+            with open(stem + ".diff.png", "wb") as f:
+                f.write(encode_png(render_diff(current_image, mask, compared["boxes"])))
+            with open(stem + ".mask.png", "wb") as f:
+                f.write(encode_png(mask.astype("uint8") * 255))
+            result["diff_image"] = stem + ".diff.png"
+    except (ImageError, OSError, ValueError, zlib.error) as e:
+        result.update(status="error", error=str(e))
+    finally:
+        result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def directory_pairs(base_dir, current_dir):
+    names = set()
+    for root_dir in (base_dir, current_dir):
+        for root, _, files in os.walk(root_dir):
+            for file in files:
+                if file.lower().endswith(".png"):
+                    names.add(os.path.relpath(os.path.join(root, file), root_dir))
+    return [(name, ("file", os.path.join(base_dir, name)), ("file", os.path.join(current_dir, name)))
+            for name in sorted(names)]
+
+
+def git_pairs(rev, patterns):
+    tracked = subprocess.run(["git", "-c", "core.quotePath=false", "ls-tree", "-r", "--name-only", rev],
+                             capture_output=True, text=True, encoding="utf-8")
+    if tracked.returncode != 0:
+        raise ImageError(tracked.stderr.strip() or f"git ls-tree {rev} 실패")
+    names = [n for n in tracked.stdout.splitlines() if n.lower().endswith(".png")
+             and any(fnmatch.fnmatch(n, p) for p in patterns)]
+    return [(name, ("git", f"{rev}:{name}"), ("file", name)) for name in names]
+
+
+def run(pairs, options, workers):
+    jobs = [(name, base, current, options) for name, base, current in pairs]
+    if workers <= 1 or len(jobs) <= 1:
+        return [compare_pair(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(compare_pair, jobs))
+
+
+STATUS_ICONS = {"same": "✅", "changed": "🟥", "size": "📐", "new": "🆕", "missing": "❔", "error": "❌"}
+
+
+def print_results(results, elapsed, workers):
+    changed = [r for r in results if r["status"] in ("changed", "size")]
+    print(f"🖼️ 스크린샷 비교: {len(results)}쌍, 변경 {len(changed)}, "
+          f"{elapsed:.2f}초 (워커 {workers}개)")
+    for r in sorted(results, key=lambda r: (r["status"] == "same", -r.get("changed_ratio", 0))):
+        icon = STATUS_ICONS.get(r["status"], "•")
+        if r["status"] == "same":
+            print(f"  {icon} {r['name']}" + (" (동일 파일)" if r.get("identical") else f" (SSIM {r['ssim_min']})"))
+            continue
+        if r["status"] in ("new", "missing", "error"):
+            print(f"  {icon} {r['name']}: {r.get('error', r['status'])}")
+            continue
+        size = ""
+        if r["status"] == "size":
+            size = f", 크기 {r['base_size'][0]}x{r['base_size'][1]} → {r['current_size'][0]}x{r['current_size'][1]}"
+        print(f"  {icon} {r['name']}: 변경 {r['changed_ratio'] * 100:.2f}% ({r['changed_pixels']:,}px), "
+              f"최소 SSIM {r['ssim_min']}, 타일 {r['tiles_changed']}/{r['tiles']}, 영역 {len(r['boxes'])}개{size}"
+              f" [{r['seconds']:.2f}s]")
+        for box in r["boxes"][:3]:
+            print(f"      ▫ x={box['x']} y={box['y']} {box['w']}x{box['h']} ({box['pixels']:,}px)")
+        if r.get("diff_image"):
+            print(f"      → {r['diff_image']}")
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--tile", type=int, default=TILE, help="타일 크기(px)")
+    common.add_argument("--threshold", type=int, default=PIXEL_THRESHOLD, help="변경 픽셀 기준 (채널 차이 0~255)")
+    common.add_argument("--ssim", type=float, default=SSIM_THRESHOLD, help="변경 타일 SSIM 기준")
+    common.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    common.add_argument("--out", default=OUT_DIR, help="마스크/표시 이미지 디렉토리")
+    common.add_argument("--no-images", action="store_true", help="마스크/표시 이미지 저장 안 함")
+    common.add_argument("--json", action="store_true")
+    parser = argparse.ArgumentParser(description="RSVShop 스크린샷 회귀 비교")
+    sub = parser.add_subparsers(dest="command")
+    diff = sub.add_parser("diff", parents=[common], help="파일 두 개 또는 폴더 두 개 비교")
+    diff.add_argument("base")
+    diff.add_argument("current")
+    git = sub.add_parser("git", parents=[common], help="커밋된 캡처와 작업 트리 비교")
+    git.add_argument("--rev", default="HEAD")
+    git.add_argument("patterns", nargs="*", help=f"경로 패턴 (기본: {' '.join(CAPTURE_PATTERNS)})")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 0
+    try:
+        _numpy()
+        if args.command == "diff":
+            if os.path.isdir(args.base) and os.path.isdir(args.current):
+                pairs = directory_pairs(args.base, args.current)
+            else:
+                pairs = [(os.path.basename(args.current), ("file", args.base), ("file", args.current))]
+        else:
+            pairs = git_pairs(args.rev, args.patterns or CAPTURE_PATTERNS)
+    except ImageError as e:
+        print(f"❌ {e}")
+        return 2
+    if not pairs:
+        print("❌ 비교할 PNG가 없습니다")
+        return 2
+    options = {"tile": args.tile, "threshold": args.threshold, "ssim": args.ssim,
+               "out": None if args.no_images else args.out}
+    workers = max(1, min(args.workers, len(pairs)))
+    started = time.perf_counter()
+    results = run(pairs, options, workers)
+    elapsed = time.perf_counter() - started
+    if args.json:
+        print(json.dumps({"seconds": round(elapsed, 3), "results": results}, ensure_ascii=False, indent=2))
+    else:
+        print_results(results, elapsed, workers)
+    if options["out"]:
+        os.makedirs(options["out"], exist_ok=True)
+        with open(os.path.join(options["out"], "summary.json"), "w", encoding="utf-8") as f:
+            json.dump({"seconds": round(elapsed, 3), "results": results}, f, ensure_ascii=False, indent=2)
+    if any(r["status"] == "error" for r in results):
+        return 2
+    return 1 if any(r["status"] in ("changed", "size", "new", "missing") for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+RSVShop 스모크 체크
+app/ 디렉토리에서 관리자 페이지와 GET API 라우트를 찾아 keep-alive 연결 풀로 동시에 호출하고
+라우트별 상태 코드 기대값과 지연 예산을 검사. 첫 실패에서 바로 중단 (재시작 직후 실행용)
+
+사용법:
+  python scripts/smoke_check.py [--url http://localhost:4900] [--connections 16] [--budget-scale 1.0]
+                                [--no-fail-fast] [--json] [--list]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+from async_http import ConnectionPool, HttpError
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_BUDGET_MS = 1000
+API_BUDGET_MS = 500
+
+# 자동 탐색 결과에 덧씌우는 라우트별 설정 (expect: 허용 상태 코드, budget_ms: 지연 예산, skip: 제외)
+ROUTE_OVERRIDES = {
+    "/api/admin/logs/stream": {"skip": True},  # SSE, 응답이 끝나지 않음
+    "/api/auth/me": {"expect": [200, 401]},
+    "/api/admin/api-keys": {"expect": [200, 401]},
+    "/api/integrations/marketplaces/keys": {"expect": [200, 401]},
+    "/api/admin/error-report": {"expect": [200, 400]},
+    "/api/admin/vat-reports": {"expect": [200, 400]},
+    "/api/admin/table-data": {"expect": [200, 400]},
+    "/api/mobile/dashboard": {"expect": [200, 400]},
+    "/api/site/bookings": {"expect": [200, 400]},
+    "/api/search/global": {"expect": [200, 400]},
+    "/api/pricing/quote": {"expect": [400]},  # 필수 파라미터 없이 호출하면 검증 오류가 정상
+}
+
+
+def _has_get_handler(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        source = f.read()
+    return ("function GET" in source or "const GET" in source
+            or "GET," in source or "GET }" in source or "GET}" in source)
+
+
+def discover_routes(app_dir=None):
+    """동적 세그먼트([id])가 없는 관리자 페이지와 GET API 라우트 목록"""
+    app_dir = app_dir or os.path.join(ROOT_DIR, "app")
+    routes = []
+    for base, kind in (("admin", "page"), ("api", "api")):
+        for current, dirs, files in os.walk(os.path.join(app_dir, base)):
+            dirs.sort()
+            relative = os.path.relpath(current, app_dir).replace(os.sep, "/")
+            if "[" in relative:
+                continue
+            segments = [s for s in relative.split("/") if not (s.startswith("(") and s.endswith(")"))]
+            url = "/" + "/".join(segments)
+            if kind == "page" and "page.tsx" in files:
+                routes.append({"path": url, "kind": "page", "expect": [200], "budget_ms": PAGE_BUDGET_MS})
+            elif kind == "api":
+                handler = next((os.path.join(current, name) for name in ("route.ts", "route.js") if name in files), None)
+                if handler and _has_get_handler(handler):
+                    routes.append({"path": url, "kind": "api", "expect": [200], "budget_ms": API_BUDGET_MS})
+    result = []
+    for route in routes:
+        route.update(ROUTE_OVERRIDES.get(route["path"], {}))
+        if not route.get("skip"):
+            result.append(route)
+    return result
+
+
+class SmokeFailure(Exception):
+    pass
+
+
+async def check_route(pool, route, budget_scale):
+    started = time.perf_counter()
+    try:
+        response = await pool.get(route["path"], {"Accept": "text/html" if route["kind"] == "page" else "application/json"})
+        status = response.status
+    except (OSError, HttpError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+        status = type(e).__name__  # 잘못된 응답은 그 라우트만 실패로 기록
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    budget = route["budget_ms"] * budget_scale
+    result = {"path": route["path"], "status": status, "ms": round(elapsed_ms, 1), "budget_ms": round(budget)}
+    if status not in route["expect"]:
+        result["error"] = f"상태 {status} (기대값 {route['expect']})"
+    elif elapsed_ms > budget:
+        result["error"] = f"{elapsed_ms:.0f}ms > 예산 {budget:.0f}ms"
+    return result
+
+
+async def run_smoke(base_url, routes, connections=16, budget_scale=1.0, fail_fast=True, timeout=5):
+    """(결과 목록, 전체 소요 초). fail_fast면 첫 실패에서 남은 요청을 취소"""
+    url = urlsplit(base_url)
+    pool = ConnectionPool(url.hostname or "127.0.0.1", url.port or 80, size=connections, timeout=timeout)
+    started = time.perf_counter()
+    results = []
+    tasks = [asyncio.ensure_future(check_route(pool, route, budget_scale)) for route in routes]
+    try:
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            results.append(result)
+            if fail_fast and "error" in result:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        pool.close()
+    return results, time.perf_counter() - started
+
+
+def print_results(results, elapsed, total):
+    failures = [r for r in results if "error" in r]
+    for result in sorted(results, key=lambda r: r["ms"], reverse=True):
+        mark = "❌" if "error" in result else "✅"
+        line = f"  {mark} {result['status']!s:>5} {result['ms']:>7.1f}ms  {result['path']}"
+        if "error" in result:
+            line += f"  ← {result['error']}"
+        print(line)
+    skipped = total - len(results)
+    summary = f"\n{'❌ 실패' if failures else '✅ 통과'}: {len(results) - len(failures)}/{total} 라우트, {elapsed * 1000:.0f}ms"
+    if skipped:
+        summary += f" (첫 실패로 {skipped}개 중단)"
+    print(summary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 스모크 체크")
+    parser.add_argument("--url", default=os.environ.get("RSVSHOP_URL", "http://localhost:4900"))
+    parser.add_argument("--connections", type=int, default=16, help="keep-alive 연결 수")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="모든 지연 예산에 곱할 배수")
+    parser.add_argument("--timeout", type=float, default=5, help="요청당 타임아웃(초)")
+    parser.add_argument("--no-fail-fast", action="store_true", help="실패해도 모든 라우트를 검사")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--list", action="store_true", help="검사 대상 라우트만 출력")
+    args = parser.parse_args(argv)
+
+    routes = discover_routes()
+    if args.list:
+        for route in routes:
+            print(f"  {route['kind']:<4} {route['path']:<45} expect={route['expect']} budget={route['budget_ms']}ms")
+        print(f"\n총 {len(routes)}개")
+        return 0
+
+    results, elapsed = asyncio.run(run_smoke(args.url, routes, args.connections, args.budget_scale,
+                                             not args.no_fail_fast, args.timeout))
+    failed = any("error" in r for r in results)
+    if args.json:
+        print(json.dumps({"url": args.url, "elapsed_ms": round(elapsed * 1000, 1), "total": len(routes),
+                          "passed": not failed, "results": results}, ensure_ascii=False, indent=2))
+    else:
+        print(f"🤖 스모크 체크: {args.url} ({len(routes)}개 라우트, 연결 {args.connections}개)")
+        print_results(results, elapsed, len(routes))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+RSVShop 스탠드인 서버
+Next.js 서버 대신 띄우는 가벼운 asyncio HTTP 서버. 관리자/예약/인증 API와 관리자 페이지를
+합성 데이터로 흉내 내어 벤치마크/스모크 도구를 오프라인에서 검증할 수 있게 함
+
+사용법:
+  python scripts/standin_server.py [--port 4900] [--latency-ms 5] [--jitter-ms 5] [--error-rate 0]
+                                   [--startup-ms 0] [--controls]
+
+--controls 사용 시 장애 주입 엔드포인트 (슈퍼바이저 재시작 벤치마크용):
+  GET /__standin/info                       - pid, 누수량, 출력한 로그 줄 수
+  GET /__standin/crash?code=1               - 응답 후 즉시 종료
+  GET /__standin/hang                       - 이벤트 루프를 멈춤 (프로세스는 살아 있음)
+  GET /__standin/leak?mb=512&rate_mb=64     - 초당 rate_mb씩 메모리 누수
+  GET /__standin/flood?lines=100000         - stdout으로 요청 로그를 대량 출력
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import parse_qs, urlsplit
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+               500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _synthetic_reservations(count, seed):
+    rng = random.Random(seed)
+    statuses = ["CONFIRMED", "PENDING", "CANCELLED", "COMPLETED"]
+    today = date.today()
+    rows = []
+    for i in range(count):
+        check_in = today + timedelta(days=rng.randint(-180, 180))
+        rows.append({
+            "id": f"standin-{i:05d}",
+            "guestName": f"고객{i}",
+            "checkInDate": check_in.isoformat(),
+            "checkOutDate": (check_in + timedelta(days=rng.randint(1, 5))).isoformat(),
+            "status": rng.choice(statuses),
+            "totalAmount": rng.randrange(80000, 600000, 1000),
+        })
+    return rows
+
+
+class StandinServer:
+    """keep-alive를 지원하는 합성 API 서버"""
+
+    def __init__(self, host="127.0.0.1", port=4900, latency_ms=5.0, jitter_ms=5.0, error_rate=0.0, seed=42,
+                 log_requests=False, controls=False):
+        self.host = host
+        self.port = port
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.log_requests = log_requests
+        self.rng = random.Random(seed)
+        self.reservations = _synthetic_reservations(500, seed)
+        self.requests = 0
+        self.server = None
+        self.writers = set()  # 열린 연결 (close에서 정리)
+        self.controls = controls
+        self.leaked = []
+        self.flood_lines = 0
+        self.routes = {
+            "/api/admin/stats": self.stats,
+            "/api/admin/reservations": self.reservations_list,
+            "/api/admin/sales": self.sales,
+            "/api/admin/hotels": lambda query: (200, {"hotels": [{"id": "h1", "name": "스탠드인 호텔"}]}),
+            "/api/admin/shopping-malls": lambda query: (200, {"shoppingMalls": []}),
+            "/api/admin/prisma-status": lambda query: (200, {"status": "ok"}),
+            "/api/health": lambda query: (200, {"status": "ok"}),
+            "/api/ping": lambda query: (200, {"status": "ok"}),
+            "/api/health/db": lambda query: (200, {"status": "ok"}),
+            "/api/auth/me": self.auth_me,
+            "/api/auth/login": self.auth_login,
+        }
+
+    def stats(self, query):
+        today = date.today().isoformat()
+        return 200, {
+            "totalReservations": len(self.reservations),
+            "todayReservations": sum(1 for r in self.reservations if r["checkInDate"] == today),
+            "activeRooms": 42,
+            "packages": 17,
+        }
+
+    def reservations_list(self, query):
+        page = max(1, int(query.get("page", ["1"])[0] or 1))
+        limit = max(1, min(100, int(query.get("limit", ["10"])[0] or 10)))
+        rows = self.reservations
+        start, end = query.get("startDate", [None])[0], query.get("endDate", [None])[0]
+        if start and end:
+            rows = [r for r in rows if start <= r["checkInDate"] <= end]
+        offset = (page - 1) * limit
+        return 200, {"reservations": rows[offset:offset + limit], "total": len(rows),
+                     "page": page, "totalPages": (len(rows) + limit - 1) // limit}
+
+    def sales(self, query):
+        start = query.get("startDate", [None])[0] or (date.today() - timedelta(days=90)).isoformat()
+        end = query.get("endDate", [None])[0] or date.today().isoformat()
+        rows = [r for r in self.reservations if start <= r["checkInDate"] <= end and r["status"] != "CANCELLED"]
+        total = sum(r["totalAmount"] for r in rows)
+        return 200, {"totalSales": total, "count": len(rows), "vat": total // 11, "startDate": start, "endDate": end}
+
+    def auth_me(self, query, headers=None):
+        if headers and "rsvshop-standin-session" in headers.get("cookie", ""):
+            return 200, {"user": {"email": "admin@rsvshop.local", "role": "ADMIN"}}
+        return 401, {"error": "인증이 필요합니다"}
+
+    def auth_login(self, query, headers=None):
+        return 200, {"success": True}
+
+    def control(self, action, query):
+        """장애 주입. 실제 동작은 응답을 보낸 뒤 실행되도록 콜백으로 돌려준다"""
+        loop = asyncio.get_running_loop()
+        if action == "info":
+            return 200, {"pid": os.getpid(), "requests": self.requests,
+                         "leaked_mb": len(self.leaked), "flood_lines": self.flood_lines}, None
+        if action == "crash":
+            code = int(query.get("code", ["1"])[0])
+            return 200, {"crash": code}, lambda: os._exit(code)
+        if action == "hang":
+            return 200, {"hang": True}, lambda: loop.call_soon(threading.Event().wait)
+        if action == "leak":
+            total = int(query.get("mb", ["512"])[0])
+            rate = max(1, int(query.get("rate_mb", ["64"])[0]))
+            return 200, {"leak_mb": total}, lambda: loop.create_task(self._leak(total, rate))
+        if action == "flood":
+            lines = int(query.get("lines", ["100000"])[0])
+            flood = threading.Thread(target=self._flood, args=(lines,), daemon=True)
+            return 200, {"flood": lines}, flood.start
+        return 404, {"error": "unknown control", "action": action}, None
+
+    async def _leak(self, total_mb, rate_mb):
+        target = len(self.leaked) + total_mb
+        while len(self.leaked) < target:
+            for _ in range(min(rate_mb, target - len(self.leaked))):
+                # 페이지가 실제로 할당되도록 0이 아닌 값으로 채움
+                self.leaked.append(b"\xa5" * (1 << 20))
+            await asyncio.sleep(1)
+
+    def _flood(self, lines):
+        """Next.js 요청 로그 형식으로 대량 출력 (stdout 파이프가 막히면 이 스레드만 멈춘다)"""
+        for i in range(lines):
+            sys.stdout.write(f" GET /api/admin/reservations?page={i % 50} 200 in {i % 97}ms\n")
+            self.flood_lines += 1
+            if i % 100 == 99:
+                sys.stdout.flush()
+        sys.stdout.flush()
+
+    def route(self, method, target, headers):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        handler = self.routes.get(url.path)
+        extra = {}
+        if self.controls and url.path.startswith("/__standin/"):
+            status, payload, action = self.control(url.path[len("/__standin/"):], query)
+            if action:
+                extra["__after"] = action
+        elif handler in (self.auth_me, self.auth_login):
+            status, payload = handler(query, headers)
+            if handler == self.auth_login and method == "POST":
+                extra["Set-Cookie"] = "rsvshop-standin-session=1; Path=/; HttpOnly"
+        elif handler is not None:
+            status, payload = handler(query)
+        elif url.path == "/" or url.path == "/admin" or url.path.startswith("/admin/"):
+            body = f"<!DOCTYPE html><html><head><title>RSVShop</title></head><body>{url.path}</body></html>"
+            return 200, "text/html; charset=utf-8", body.encode("utf-8"), extra
+        else:
+            status, payload = 404, {"error": "Not Found", "path": url.path}
+        return status, "application/json", json.dumps(payload, ensure_ascii=False).encode("utf-8"), extra
+
+    async def handle(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode("latin-1").split()
+                if len(parts) < 2:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", "0") or 0):
+                    await reader.readexactly(int(headers["content-length"]))
+
+                started = time.monotonic()
+                delay = self.latency + self.rng.random() * self.jitter
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self.error_rate and self.rng.random() < self.error_rate:
+                    status, content_type, body, extra = 500, "application/json", b'{"error":"standin"}', {}
+                else:
+                    status, content_type, body, extra = self.route(parts[0], parts[1], headers)
+                self.requests += 1
+                keep_alive = headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}",
+                        f"Content-Type: {content_type}",
+                        f"Content-Length: {len(body)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                after = extra.pop("__after", None)
+                head += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") +
+                             (b"" if parts[0] == "HEAD" else body))
+                await writer.drain()
+                self.log_request(parts[0], parts[1], status, time.monotonic() - started)
+                if after:
+                    after()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    def log_request(self, method, target, status, seconds):
+        """Next.js dev와 같은 형식의 요청 로그 (출력 파서가 그대로 처리)"""
+        if self.log_requests:
+            print(f" {method} {target} {status} in {int(seconds * 1000)}ms", flush=True)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        """리스너를 닫고 남은 keep-alive 연결을 닫는다 (처리기는 EOF를 받고 스스로 끝난다)
+
+        처리기 태스크를 cancel하면 start_server 콜백이 CancelledError 트레이스백을 남기므로 연결만 닫는다.
+        """
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        for _ in range(100):  # 지연 흉내(sleep) 중인 처리기가 응답을 끝낼 때까지 잠깐 대기
+            if not self.writers:
+                break
+            await asyncio.sleep(0.01)
+
+    async def serve_forever(self, startup_delay=0.0):
+        started = time.monotonic()
+        if startup_delay:
+            # next dev의 초기 컴파일 시간 흉내
+            await asyncio.sleep(startup_delay)
+        await self.start()
+        print(f" ✓ Ready in {int((time.monotonic() - started) * 1000)}ms (standin http://{self.host}:{self.port})",
+              flush=True)
+        async with self.server:
+            await self.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RSVShop 스탠드인 API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4900)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="기본 응답 지연")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="추가 무작위 지연 상한")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    parser.add_argument("--log-requests", action="store_true", help="Next.js 형식 요청 로그 출력")
+    parser.add_argument("--startup-ms", type=float, default=0.0, help="포트를 열기 전 대기 시간 (컴파일 흉내)")
+    parser.add_argument("--controls", action="store_true", help="/__standin/* 장애 주입 엔드포인트 활성화")
+    args = parser.parse_args(argv)
+    server = StandinServer(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                           log_requests=args.log_requests, controls=args.controls)
+    try:
+        asyncio.run(server.serve_forever(args.startup_ms / 1000))
+    except KeyboardInterrupt:
+        print("\n🛑 스탠드인 서버 종료")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
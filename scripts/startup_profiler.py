@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+RSVShop 시작 시간 프로파일러
+Next.js 자식 프로세스의 시작/재시작 단계별 소요 시간을 기록하고 회귀를 감지
+
+기록 단계:
+  spawn        - Popen 호출부터 반환까지
+  first_output - 첫 stdout 라인
+  ready        - Next.js "Ready in" 라인
+  port_bound   - 포트에 TCP 연결 성공
+  first_200    - 첫 HTTP 200 응답
+  + 라우트별 첫 컴파일 시간 ("Compiled /admin in 3.2s (1234 modules)")
+"""
+
+import re
+import socket
+import sqlite3
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from next_output_parser import COMPILED_RE, parse_duration
+
+PHASES = ("spawn", "first_output", "ready", "port_bound", "first_200")
+
+READY_RE = re.compile(r"Ready in ([\d.]+)\s*(ms|s)\b")
+
+
+class StartupHistory:
+    """SQLite 기반 시작 기록 저장소. 쓰기마다 짧은 연결을 열어 스레드 간 공유 문제를 피한다."""
+
+    def __init__(self, path="logs/startup-history.db"):
+        self.path = path
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    port INTEGER,
+                    spawn REAL,
+                    first_output REAL,
+                    ready REAL,
+                    port_bound REAL,
+                    first_200 REAL,
+                    next_ready REAL,
+                    status TEXT NOT NULL DEFAULT 'running'
+                );
+                CREATE TABLE IF NOT EXISTS route_compiles (
+                    run_id INTEGER NOT NULL REFERENCES runs(id),
+                    route TEXT NOT NULL,
+                    seconds REAL NOT NULL,
+                    modules INTEGER,
+                    PRIMARY KEY (run_id, route)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_route_compiles_route ON route_compiles(route);
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def create_run(self, kind, port):
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (started_at, kind, port) VALUES (?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), kind, port),
+            )
+            return cursor.lastrowid
+
+    def update_run(self, run_id, phases, next_ready, status):
+        columns = ", ".join(f"{name} = ?" for name in PHASES)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE runs SET {columns}, next_ready = ?, status = ? WHERE id = ?",
+                [phases.get(name) for name in PHASES] + [next_ready, status, run_id],
+            )
+
+    def add_route_compile(self, run_id, route, seconds, modules):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO route_compiles (run_id, route, seconds, modules) VALUES (?, ?, ?, ?)",
+                (run_id, route, seconds, modules),
+            )
+
+    def recent_runs(self, limit):
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT * FROM runs WHERE status != 'running' ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def route_history(self, limit_per_route):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT route, seconds FROM route_compiles ORDER BY run_id"
+            ).fetchall()
+        history = {}
+        for route, seconds in rows:
+            history.setdefault(route, []).append(seconds)
+        return {route: values[-limit_per_route:] for route, values in history.items()}
+
+
+class StartupRun:
+    """한 번의 시작(또는 재시작)에 대한 단계별 타임스탬프 수집기"""
+
+    def __init__(self, history, kind, port, health_path="/", probe_timeout=180, log=print, on_phase=None):
+        self.history = history
+        self.kind = kind
+        self.port = port
+        self.health_path = health_path
+        self.probe_timeout = probe_timeout
+        self.log = log
+        self.on_phase = on_phase  # 단계가 처음 기록될 때 호출 (슈퍼바이저 라이프사이클 이벤트용)
+        self.t0 = time.monotonic()
+        self.phases = {}
+        self.next_ready = None
+        self.compiled_routes = set()
+        self.finished = threading.Event()
+        try:
+            self.run_id = history.create_run(kind, port)
+        except sqlite3.Error as e:
+            self.log(f"⚠️ 시작 기록 생성 실패: {e}")
+            self.run_id = None
+
+    def mark(self, phase):
+        """단계의 첫 발생 시점만 기록 (spawn 기준 경과 초)"""
+        if phase not in self.phases:
+            self.phases[phase] = time.monotonic() - self.t0
+            if self.on_phase:
+                self.on_phase(phase)
+
+    def on_line(self, line):
+        """Node.js 출력 한 줄 처리"""
+        if "first_output" not in self.phases:
+            self.mark("first_output")
+        if "ready" not in self.phases:
+            match = READY_RE.search(line)
+            if match:
+                self.mark("ready")
+                self.next_ready = parse_duration(match.group(1), match.group(2))
+                return
+        if "Compiled" in line:
+            match = COMPILED_RE.search(line)
+            if match and match.group(1) not in self.compiled_routes:
+                route = match.group(1)
+                self.compiled_routes.add(route)
+                modules = int(match.group(4)) if match.group(4) else None
+                if self.run_id is not None:
+                    try:
+                        self.history.add_route_compile(
+                            self.run_id, route, parse_duration(match.group(2), match.group(3)), modules)
+                    except sqlite3.Error:
+                        pass
+
+    def start_probe(self):
+        """포트 바인딩과 첫 HTTP 200을 백그라운드에서 확인"""
+        thread = threading.Thread(target=self._probe, name="startup-probe", daemon=True)
+        thread.start()
+        return thread
+
+    def _probe(self):
+        deadline = self.t0 + self.probe_timeout
+        url = f"http://127.0.0.1:{self.port}{self.health_path}"
+        while not self.finished.is_set() and time.monotonic() < deadline:
+            if "port_bound" not in self.phases:
+                try:
+                    with socket.create_connection(("127.0.0.1", self.port), timeout=0.2):
+                        self.mark("port_bound")
+                except OSError:
+                    time.sleep(0.1)
+                    continue
+            try:
+                # 첫 요청은 Next.js 온디맨드 컴파일을 유발하므로 넉넉히 기다린다
+                with urllib.request.urlopen(url, timeout=max(1, deadline - time.monotonic())) as response:
+                    if response.status == 200:
+                        self.mark("first_200")
+                        self.finish("ok")
+                        return
+            except (urllib.error.URLError, OSError, ValueError):
+                pass
+            time.sleep(0.25)
+        self.finish("timeout")
+
+    def finish(self, status):
+        """단계 기록을 저장 (한 번만)"""
+        if self.finished.is_set():
+            return
+        self.finished.set()
+        if self.run_id is None:
+            return
+        try:
+            self.history.update_run(self.run_id, self.phases, self.next_ready, status)
+        except sqlite3.Error as e:
+            self.log(f"⚠️ 시작 기록 저장 실패: {e}")
+            return
+        summary = ", ".join(f"{name}={self.phases[name]:.2f}s" for name in PHASES if name in self.phases)
+        self.log(f"⏱️ 시작 프로파일 ({self.kind}, {status}): {summary}")
+
+
+def _baseline(values):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def is_regression(value, baseline, tolerance=0.25, min_delta=0.5):
+    """기준선 대비 비율(tolerance)과 절대값(min_delta)을 모두 넘으면 회귀로 판단"""
+    if value is None or baseline is None:
+        return False
+    return value > baseline * (1 + tolerance) and value - baseline > min_delta
+
+
+def print_report(history, limit=20, window=10, tolerance=0.25):
+    """최근 시작 기록과 추세, 회귀 여부 출력"""
+    runs = history.recent_runs(limit + window)
+    if not runs:
+        print("기록된 시작 이력이 없습니다.")
+        return 0
+
+    print(f"⏱️ Next.js 시작 프로파일 (최근 {min(limit, len(runs))}회, 기준선: 직전 {window}회 중앙값)")
+    header = f"{'id':>5} {'시각':<19} {'종류':<8} " + " ".join(f"{p:>12}" for p in PHASES) + "  상태"
+    print(header)
+    print("-" * len(header))
+
+    regressions = 0
+    for index in range(max(0, len(runs) - limit), len(runs)):
+        run = runs[index]
+        previous = runs[max(0, index - window):index]
+        cells = []
+        for phase in PHASES:
+            value = run.get(phase)
+            baseline = _baseline([r.get(phase) for r in previous])
+            flag = "!" if is_regression(value, baseline, tolerance) else " "
+            if flag == "!":
+                regressions += 1
+            cells.append(f"{value:11.2f}{flag}" if value is not None else f"{'-':>11} ")
+        print(f"{run['id']:>5} {run['started_at']:<19} {run['kind']:<8} " + " ".join(cells) + f"  {run['status']}")
+
+    routes = history.route_history(window + 1)
+    if routes:
+        print("\n📦 라우트별 첫 컴파일 (최근값 / 기준선)")
+        for route, values in sorted(routes.items(), key=lambda item: -item[1][-1]):
+            latest, baseline = values[-1], _baseline(values[:-1])
+            flag = "  ⚠️ 회귀" if is_regression(latest, baseline, tolerance) else ""
+            baseline_text = f"{baseline:.2f}s" if baseline is not None else "-"
+            print(f"  {route:<40} {latest:7.2f}s / {baseline_text:>7}{flag}")
+            if flag:
+                regressions += 1
+
+    if regressions:
+        print(f"\n⚠️ 회귀 의심 {regressions}건 (!: 기준선 대비 {int(tolerance * 100)}% 이상 느림)")
+    else:
+        print("\n✅ 회귀 없음")
+    return regressions
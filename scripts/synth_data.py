@@ -0,0 +1,939 @@
+#!/usr/bin/env python3
+"""
+RSVShop 대량 합성 데이터 생성기
+prisma/schema.prisma에서 모델/필드/관계를 읽어 참조 무결성이 맞는 데이터를 수백만 행 단위로 만든다.
+계절성(여름·연말 성수기, 주말), 호텔 인기도(지프 분포), 객실/패키지 구성, 쇼핑몰별 수수료율을 반영하고,
+큰 테이블은 여러 프로세스가 청크 단위로 병렬 생성한다.
+적재: PostgreSQL은 워커마다 COPY, SQLite(dev.db)는 배치 executemany, none은 생성 속도만 측정.
+
+사용법:
+  python scripts/synth_data.py plan [--scale 1]
+  python scripts/synth_data.py generate --target none [--scale 0.1] [--workers 4]
+  python scripts/synth_data.py generate --target sqlite:prisma/dev.db [--recreate]
+  python scripts/synth_data.py generate --target postgres [--truncate]   # DATABASE_URL 사용 (psycopg 필요)
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from itertools import accumulate
+from urllib.parse import urlparse
+
+SCHEMA_PATH = "prisma/schema.prisma"
+DAY_MS = 86400 * 1000
+
+# scale=1 기준 행 수 (객실/패키지/재고는 호텔 수와 기간에서 파생)
+BASE_COUNTS = {
+    "Hotel": 200,
+    "User": 50000,
+    "Product": 2000,
+    "Booking": 1000000,
+    "Voucher": 300000,
+    "Reservation": 200000,  # 바우처 없이 직접 들어온 예약 (바우처 사용분은 Voucher가 만든다)
+    "Order": 200000,
+}
+GENERIC_COUNT = 100
+
+# (이름, 플랫폼, 수수료율, 예약 비중)
+MALLS = [
+    ("야놀자", "yanolja", 0.15, 28), ("여기어때", "goodchoice", 0.15, 22), ("네이버 예약", "naver", 0.055, 12),
+    ("쿠팡 트래블", "coupang", 0.11, 10), ("인터파크 투어", "interpark", 0.13, 6), ("11번가", "11st", 0.12, 4),
+    ("G마켓", "gmarket", 0.13, 4), ("홈쇼핑", "homeshopping", 0.28, 6), ("자사몰", "direct", 0.0, 8),
+]
+# (이름, 수용 인원, 가격 배수, 비중)
+ROOM_TYPES = [
+    ("스탠다드 더블", 2, 1.0, 40), ("스탠다드 트윈", 2, 1.0, 25), ("디럭스", 2, 1.35, 18),
+    ("패밀리", 4, 1.6, 10), ("스위트", 4, 2.4, 5), ("풀빌라", 6, 3.5, 2),
+]
+# (이름, 가격 배수, 비중)
+PACKAGE_TYPES = [
+    ("룸온리", 1.0, 45), ("조식 포함", 1.18, 30), ("조식+수영장", 1.3, 12), ("디너 뷔페", 1.45, 8),
+    ("얼리체크인+레이트체크아웃", 1.25, 5),
+]
+NIGHTS = ([1, 2, 3, 4, 5, 7], [58, 24, 10, 4, 2, 2])
+# 월별 수요 (1월=인덱스 0). 7~8월 여름 성수기, 12~1월 연말연초
+MONTH_DEMAND = [1.0, 0.8, 0.6, 0.8, 1.0, 0.9, 1.4, 1.6, 0.9, 1.0, 0.7, 1.2]
+WEEKEND_DEMAND = 1.5  # 금/토 체크인
+VOUCHER_PARTNERS = ["CJ온스타일", "GS샵", "현대홈쇼핑", "롯데홈쇼핑", "NS홈쇼핑"]
+CITIES = ["서울", "부산", "제주", "강릉", "여수", "경주", "속초", "인천", "대구", "전주"]
+BRANDS = ["호텔", "리조트", "스테이", "부티크 호텔", "비치 호텔", "스파 리조트"]
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN = "민서준지현우수영하은도윤예진성재희경태호연아"
+CATEGORIES = ["객실 이용권", "식음료", "스파", "레저", "키즈", "기념품", "캠핑", "골프", "워터파크", "공연", "교통", "기타"]
+
+
+class SchemaError(Exception):
+    pass
+
+
+class WriterError(Exception):
+    pass
+
+
+# 스키마 ---------------------------------------------------------------------
+
+class Field:
+    __slots__ = ("name", "type", "optional", "is_list", "attrs", "default", "unique", "is_id", "updated_at",
+                 "relation_fields")
+
+    def __init__(self, name, type_, optional, is_list, attrs):
+        self.name = name
+        self.type = type_
+        self.optional = optional
+        self.is_list = is_list
+        self.attrs = attrs
+        match = re.search(r"@default\((.*?)\)(?=\s*(?:@|//|$))", attrs)
+        self.default = match.group(1) if match else None
+        self.unique = "@unique" in attrs
+        self.is_id = "@id" in attrs
+        self.updated_at = "@updatedAt" in attrs
+        match = re.search(r"@relation\([^)]*fields:\s*\[([^\]]*)\]", attrs)
+        self.relation_fields = [f.strip() for f in match.group(1).split(",")] if match else []
+
+
+class Model:
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+        self.fields = []
+        self.uniques = []  # [[컬럼, ...]]
+        self.columns = []  # 스칼라 필드 (실제 테이블 컬럼)
+        self.foreign_keys = {}  # 컬럼 → 참조 모델
+
+    def field(self, name):
+        return next(f for f in self.fields if f.name == name)
+
+
+FIELD_RE = re.compile(r"^(\w+)\s+(\w+)(\[\])?(\?)?\s*(.*)$")
+
+
+def parse_schema(text):
+    """(models, enums) — models는 선언 순서를 유지하는 {이름: Model}"""
+    models = {}
+    enums = {}
+    current = None
+    kind = None
+    for raw in text.splitlines():
+        line = raw.split("//", 1)[0].strip() if not raw.strip().startswith("///") else ""
+        if not line:
+            continue
+        match = re.match(r"^(model|enum)\s+(\w+)\s*\{$", line)
+        if match:
+            kind, name = match.groups()
+            current = Model(name, len(models)) if kind == "model" else []
+            if kind == "model":
+                models[name] = current
+            else:
+                enums[name] = current
+            continue
+        if line == "}":
+            current = kind = None
+            continue
+        if current is None:
+            continue
+        if kind == "enum":
+            current.append(line.split()[0])
+            continue
+        if line.startswith("@@unique"):
+            current.uniques.append([c.strip() for c in re.search(r"\[([^\]]*)\]", line).group(1).split(",")])
+            continue
+        if line.startswith("@@"):
+            continue
+        match = FIELD_RE.match(line)
+        if not match:
+            raise SchemaError(f"해석할 수 없는 필드: {line}")
+        name, type_, is_list, optional, attrs = match.groups()
+        current.fields.append(Field(name, type_, bool(optional), bool(is_list), attrs))
+    for model in models.values():
+        for field in model.fields:
+            if field.type in models:
+                for column in field.relation_fields:
+                    model.foreign_keys[column] = field.type
+            else:
+                model.columns.append(field)
+                if field.unique and not field.is_id:
+                    model.uniques.append([field.name])
+    return models, enums
+
+
+def load_schema(path=SCHEMA_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_schema(f.read())
+
+
+def dependency_order(models):
+    """참조되는 모델이 먼저 오도록 정렬 (자기 참조 무시)"""
+    ordered = []
+    seen = set()
+
+    def visit(name, stack=()):
+        if name in seen or name in stack:
+            return
+        for target in models[name].foreign_keys.values():
+            if target != name:
+                visit(target, stack + (name,))
+        seen.add(name)
+        ordered.append(name)
+
+    for name in models:
+        visit(name)
+    return ordered
+
+
+# 생성 컨텍스트 -----------------------------------------------------------------
+
+def to_ms(day):
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def korean_name(rng):
+    return rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN)
+
+
+def phone(rng):
+    return f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}"
+
+
+def weighted_index(cumulative, rng):
+    return bisect_left(cumulative, rng.random() * cumulative[-1])
+
+
+class Context:
+    """모든 워커가 공유하는 읽기 전용 상태: 차원 테이블, 날짜별 수요, 가중치 누적표"""
+
+    def __init__(self, models, enums, scale, start, days, seed, tag, now_ms):
+        self.models = models
+        self.enums = enums
+        self.scale = scale
+        self.seed = seed
+        self.tag = tag
+        self.now_ms = now_ms
+        self.today_ms = to_ms(datetime.fromtimestamp(now_ms / 1000, timezone.utc).date())
+        self.days = [to_ms(start + timedelta(days=i)) for i in range(days)]
+        self.demand = []
+        for i in range(days):
+            day = start + timedelta(days=i)
+            self.demand.append(MONTH_DEMAND[day.month - 1] * (WEEKEND_DEMAND if day.weekday() in (4, 5) else 1.0))
+        self.demand_cumulative = list(accumulate(self.demand))
+        self.mean_demand = sum(self.demand) / len(self.demand)
+        self.mall_cumulative = list(accumulate(m[3] for m in MALLS))
+        self.nights_cumulative = list(accumulate(NIGHTS[1]))
+        self.counts = {}
+        self.dims = {}
+        self.package_cumulative = []
+
+    def count(self, model):
+        if model in self.counts:
+            return self.counts[model]
+        if model == "Category":
+            return len(CATEGORIES)
+        return max(1, round(BASE_COUNTS.get(model, GENERIC_COUNT) * self.scale))
+
+    def make_id(self, model, index):
+        return f"c{self.tag}{self.models[model].index:02x}{index:010x}"
+
+    def pick_id(self, model, rng):
+        return self.make_id(model, rng.randrange(self.count(model)))
+
+    def season(self, day_index):
+        """평균 대비 수요 배수 (가격/점유율 계산용)"""
+        return self.demand[day_index] / self.mean_demand
+
+    def sample_day(self, rng):
+        return weighted_index(self.demand_cumulative, rng)
+
+    def pick_package(self, rng):
+        return self.dims["Package"][weighted_index(self.package_cumulative, rng)]
+
+
+def default_value(ctx, model, field, index, rng):
+    """도메인 생성기가 채우지 않은 컬럼: 스키마 기본값 → 타입별 일반 값"""
+    if field.is_id:
+        return ctx.make_id(model.name, index)
+    if field.name in model.foreign_keys:
+        target = model.foreign_keys[field.name]
+        if field.optional and rng.random() < 0.3:
+            return None
+        return ctx.pick_id(target, rng)
+    if field.updated_at or field.default == "now()":
+        return ctx.now_ms
+    default = field.default
+    if default is not None and default not in ("cuid()", "uuid()", "autoincrement()"):
+        if field.type in ctx.enums:
+            return default
+        if default in ("true", "false"):
+            return default == "true"
+        if default.startswith('"'):
+            return default.strip('"')
+        if default == "[]":
+            return []
+        try:
+            return int(default) if field.type == "Int" else float(default)
+        except ValueError:
+            return None
+    if field.optional:
+        return None
+    if field.is_list:
+        return []
+    if field.type in ctx.enums:
+        return ctx.enums[field.type][0]
+    if field.type == "String":
+        return f"{field.name}-{ctx.tag}-{index}" if field.unique else f"{model.name} {field.name} {index}"
+    if field.type == "Int":
+        return rng.randrange(100)
+    if field.type == "Float":
+        return round(rng.uniform(0, 100), 2)
+    if field.type == "Boolean":
+        return True
+    if field.type == "DateTime":
+        return ctx.days[rng.randrange(len(ctx.days))]
+    if field.type == "Json":
+        return {}
+    return None
+
+
+def complete(ctx, model_name, row, index, rng):
+    """행 dict → 컬럼 순서의 튜플 (빠진 컬럼은 default_value)"""
+    model = ctx.models[model_name]
+    return tuple(row[f.name] if f.name in row else default_value(ctx, model, f, index, rng) for f in model.columns)
+
+
+# 차원 테이블 (메인 프로세스) ----------------------------------------------------------
+
+def build_dimensions(ctx, rng):
+    """호텔/객실/패키지/쇼핑몰/카테고리/상품/추가요금/할인 규칙. {모델: [행 dict]}"""
+    now = ctx.now_ms
+    hotels, rooms, packages = [], [], []
+    for i in range(ctx.count("Hotel")):
+        rating = rng.choices([3, 4, 5], [25, 45, 30])[0]
+        hotels.append({
+            "id": ctx.make_id("Hotel", i), "name": f"{rng.choice(CITIES)} {rng.choice(BRANDS)} {i + 1}",
+            "address": f"{rng.choice(CITIES)}시 해변로 {rng.randint(1, 999)}", "phone": phone(rng),
+            "email": f"hotel{i}.{ctx.tag}@example.com", "rating": rating,
+            "status": "ACTIVE" if rng.random() < 0.95 else "INACTIVE", "createdAt": now, "updatedAt": now,
+            # 인기도: 순위의 지프 분포 (상위 호텔에 예약이 몰린다)
+            "_weight": 1 / (i + 1) ** 0.8, "_price": 70000 * math.exp(rng.gauss(0, 0.35)) * (0.8 + 0.15 * rating),
+        })
+    for hotel in hotels:
+        for _ in range(rng.randint(3, 8)):
+            name, capacity, multiplier, weight = rng.choices(ROOM_TYPES, [t[3] for t in ROOM_TYPES])[0]
+            base_price = round(hotel["_price"] * multiplier, -3)
+            rooms.append({
+                "id": ctx.make_id("Room", len(rooms)), "name": name, "description": f"{hotel['name']} {name}",
+                "capacity": capacity, "basePrice": base_price, "hotelId": hotel["id"], "createdAt": now,
+                "updatedAt": now, "imageUrl": None,
+                "_weight": hotel["_weight"] * weight, "_hotel": hotel, "_count": rng.randint(5, 30),
+            })
+    for room in rooms:
+        chosen = [PACKAGE_TYPES[0]] + rng.sample(PACKAGE_TYPES[1:], rng.randint(0, 3))
+        for name, multiplier, weight in chosen:
+            packages.append({
+                "id": ctx.make_id("Package", len(packages)), "name": f"{room['name']} {name}",
+                "description": f"{room['description']} - {name}", "price": round(room["basePrice"] * multiplier, -3),
+                "roomId": room["id"], "createdAt": now, "updatedAt": now,
+                "_weight": room["_weight"] * weight, "_room": room,
+            })
+    malls = [{
+        "id": ctx.make_id("ShoppingMall", i), "name": name, "platform": platform, "commissionRate": rate * 100,
+        "isActive": True, "settlementCycle": "MONTHLY", "settlementDay": rng.choice([5, 10, 15, 25]),
+        "createdAt": now, "updatedAt": now, "description": f"{name} 판매 채널", "lastSettlementDate": None,
+        "nextSettlementDate": None,
+    } for i, (name, platform, rate, _) in enumerate(MALLS)]
+    categories = [{"id": ctx.make_id("Category", i), "name": name, "createdAt": now, "updatedAt": now,
+                   "description": None, "imageUrl": None} for i, name in enumerate(CATEGORIES)]
+    products = []
+    for i in range(ctx.count("Product")):
+        category = rng.choice(categories)
+        products.append({
+            "id": ctx.make_id("Product", i), "name": f"{category['name'].split()[0]} 상품 {i + 1}",
+            "description": "합성 데이터", "price": round(rng.lognormvariate(10.3, 0.6), -2),
+            "stock": rng.randint(0, 500), "categoryId": category["id"], "isActive": rng.random() < 0.9,
+            "createdAt": now, "updatedAt": now, "commissionRate": rng.choice([0.05, 0.1, 0.12, 0.15]),
+            "shippingFee": rng.choice([0, 0, 2500, 3000]), "taxRate": 0.1, "imageUrl": None,
+            "_weight": 1 / (i + 1) ** 0.7,
+        })
+    surcharges, discounts = [], []
+    for hotel in hotels:
+        hotel_rooms = [r for r in rooms if r["_hotel"] is hotel]
+        year = datetime.fromtimestamp(ctx.days[0] / 1000, timezone.utc).year
+        rules = [
+            ("HOTEL", None, "PERCENT", 20, date(year, 1, 1), date(year + 1, 12, 31), 0b1100000, None),  # 금/토
+            ("HOTEL", None, "PERCENT", 30, date(year, 7, 20), date(year, 8, 20), None, None),  # 여름 성수기
+            ("HOTEL", None, "PERCENT", 20, date(year, 12, 24), date(year + 1, 1, 1), None, None),  # 연말
+        ]
+        for room in rng.sample(hotel_rooms, min(2, len(hotel_rooms))):
+            rules.append(("ROOM", room, "FIXED", rng.choice([10000, 20000, 30000]), date(year, 9, 1),
+                          date(year, 10, 10), None, rng.choice([None, "야놀자", "여기어때"])))
+        for priority, (scope, room, rule_type, amount, start, end, dow, channel) in enumerate(rules):
+            surcharges.append({
+                "id": ctx.make_id("SurchargeRule", len(surcharges)), "scope": scope,
+                "roomId": room["id"] if room else None, "packageId": None, "ruleType": rule_type,
+                "amount": amount, "startDate": to_ms(start), "endDate": to_ms(end), "enabled": True,
+                "priority": priority, "dowMask": dow, "channel": channel, "createdAt": now, "updatedAt": now,
+            })
+        for _ in range(rng.randint(0, 5)):
+            start = ctx.days[rng.randrange(len(ctx.days))]
+            percentage = rng.random() < 0.7
+            discounts.append({
+                "id": ctx.make_id("Discount", len(discounts)), "hotelId": hotel["id"],
+                "name": rng.choice(["얼리버드", "연박 할인", "주중 특가", "재방문 고객", "타임세일"]),
+                "description": None, "discountType": "PERCENTAGE" if percentage else "FIXED_AMOUNT",
+                "amount": rng.choice([5, 10, 15, 20]) if percentage else rng.choice([5000, 10000, 20000]),
+                "minAmount": None, "maxDiscount": 50000 if percentage else None, "startDate": start,
+                "endDate": start + rng.randint(7, 90) * DAY_MS, "enabled": True, "usageLimit": None,
+                "usedCount": 0, "createdAt": now, "updatedAt": now, "isVisible": True,
+                "visibleChannels": rng.sample([m[0] for m in MALLS], rng.randint(0, 3)),
+                "visibleFrom": None, "visibleTo": None,
+            })
+    dims = {"Hotel": hotels, "Room": rooms, "Package": packages, "ShoppingMall": malls, "Category": categories,
+            "Product": products, "SurchargeRule": surcharges, "Discount": discounts}
+    for model, rows in dims.items():
+        ctx.counts[model] = len(rows)
+    ctx.dims = dims
+    ctx.package_cumulative = list(accumulate(p["_weight"] for p in packages))
+    ctx.product_cumulative = list(accumulate(p["_weight"] for p in products))
+    return dims
+
+
+def user_rows(ctx, start, count, rng):
+    now = ctx.now_ms
+    for i in range(start, start + count):
+        yield {"id": ctx.make_id("User", i), "email": f"user{i}.{ctx.tag}@example.com",
+               "password": "$2b$10$synthetic.synthetic.synthetic.synthetic.synthe",
+               "name": korean_name(rng), "role": "ADMIN" if i < 3 else "USER", "createdAt": now, "updatedAt": now}
+
+
+# 사실 테이블 (워커 청크) --------------------------------------------------------------
+
+def booking_rows(ctx, start, count, rng):
+    """예약 + 예약 항목. 체크인은 계절 수요, 채널은 쇼핑몰 비중, 가격은 성수기 배수를 따른다"""
+    malls = MALLS
+    for i in range(start, start + count):
+        package = ctx.pick_package(rng)
+        room = package["_room"]
+        day = ctx.sample_day(rng)
+        nights = NIGHTS[0][weighted_index(ctx.nights_cumulative, rng)]
+        mall_name, _, rate, _ = malls[weighted_index(ctx.mall_cumulative, rng)]
+        multiplier = 0.85 + 0.25 * ctx.season(day)
+        selling = round(package["price"] * nights * multiplier, -2)
+        commission = round(selling * rate)
+        supply = round(selling * (1 - rate - rng.uniform(0.06, 0.18)))
+        check_in = ctx.days[day]
+        created = check_in - int(rng.expovariate(1 / 21) * DAY_MS)
+        if check_in < ctx.today_ms:
+            status = rng.choices(["COMPLETED", "CANCELLED", "CONFIRMED"], [88, 9, 3])[0]
+        else:
+            status = rng.choices(["CONFIRMED", "PENDING", "CANCELLED"], [70, 20, 10])[0]
+        booking_id = ctx.make_id("Booking", i)
+        direct = mall_name == "자사몰"
+        yield "Booking", {
+            "id": booking_id, "userId": ctx.pick_id("User", rng), "totalAmount": selling, "status": status,
+            "checkInDate": check_in, "checkOutDate": check_in + nights * DAY_MS, "guestName": korean_name(rng),
+            "guestPhone": phone(rng), "guestEmail": f"guest{i}@example.com" if rng.random() < 0.6 else None,
+            "notes": None, "createdAt": created, "updatedAt": created, "roomId": room["id"],
+            "depositAmount": selling - commission, "externalId": None if direct else f"{mall_name[:2]}-{i}",
+            "orderNumber": None if direct else f"ORD{ctx.tag}{i:09d}", "sellingPrice": selling,
+            "shoppingMall": None if direct else mall_name, "supplyPrice": supply,
+            "profit": selling - supply - commission, "vatAmount": round(selling / 11), "vatRate": 10.0,
+            "commission": commission, "commissionRate": rate * 100,
+        }
+        yield "BookingItem", {"id": ctx.make_id("BookingItem", 2 * i), "bookingId": booking_id,
+                              "packageId": package["id"], "price": round(package["price"] * multiplier, -2),
+                              "quantity": nights, "createdAt": created, "updatedAt": created}
+        if rng.random() < 0.1:  # 같은 객실의 부가 패키지
+            yield "BookingItem", {"id": ctx.make_id("BookingItem", 2 * i + 1), "bookingId": booking_id,
+                                  "packageId": ctx.pick_package(rng)["id"], "price": round(package["price"] * 0.2, -2),
+                                  "quantity": 1, "createdAt": created, "updatedAt": created}
+
+
+def inventory_rows(ctx, start, count, rng):
+    """객실 × 날짜 격자 (date, roomId, packageId=NULL이 유일). 점유율은 계절 수요를 따른다"""
+    rooms = ctx.dims["Room"]
+    days = len(ctx.days)
+    now = ctx.now_ms
+    for i in range(start, start + count):
+        room = rooms[i // days]
+        day = i % days
+        total = room["_count"]
+        occupancy = min(1.0, 0.55 * ctx.season(day) * rng.uniform(0.8, 1.2))
+        yield "Inventory", {"id": ctx.make_id("Inventory", i), "date": ctx.days[day], "roomId": room["id"],
+                            "packageId": None, "totalCount": total, "bookedCount": min(total, round(total * occupancy)),
+                            "isBlocked": rng.random() < 0.01, "createdAt": now, "updatedAt": now}
+
+
+def package_inventory_rows(ctx, start, count, rng):
+    packages = ctx.dims["Package"]
+    days = len(ctx.days)
+    now = ctx.now_ms
+    for i in range(start, start + count):
+        package = packages[i // days]
+        day = i % days
+        season = ctx.season(day)
+        yield "PackageInventory", {
+            "id": ctx.make_id("PackageInventory", i), "date": ctx.days[day], "roomId": package["_room"]["id"],
+            "packageId": package["id"], "allotment": max(0, round(rng.randint(2, 10) / season)),
+            "closed": rng.random() < 0.02 * season, "createdAt": now, "updatedAt": now}
+
+
+def voucher_rows(ctx, start, count, rng):
+    """홈쇼핑 바우처. 60%는 사용되어 바우처 예약(Reservation)을 함께 만든다"""
+    for i in range(start, start + count):
+        package = ctx.pick_package(rng)
+        hotel_id = package["_room"]["_hotel"]["id"]
+        created = ctx.days[rng.randrange(max(1, len(ctx.days) // 2))]
+        status = rng.choices(["REDEEMED", "UNUSED", "EXPIRED"], [60, 30, 10])[0]
+        voucher_id = ctx.make_id("Voucher", i)
+        day = ctx.sample_day(rng)
+        used_at = None
+        if status == "REDEEMED":
+            used_at = min(created + int(rng.expovariate(1 / 30) * DAY_MS), ctx.days[day])
+        partner = rng.choice(VOUCHER_PARTNERS)
+        yield "Voucher", {
+            "id": voucher_id, "partner": partner, "partnerVoucherId": f"{ctx.tag}-P{i:09d}",
+            "code": f"V{ctx.tag}{i:09d}", "hotelId": hotel_id, "packageId": package["id"], "status": status,
+            "buyerName": korean_name(rng), "buyerEmail": None, "metadata": {"channel": partner, "batch": i // 1000},
+            "createdAt": created, "usedAt": used_at}
+        if status == "REDEEMED":
+            nights = NIGHTS[0][weighted_index(ctx.nights_cumulative, rng)]
+            check_in = ctx.days[day]
+            yield "Reservation", {
+                "id": ctx.make_id("Reservation", i), "voucherId": voucher_id, "hotelId": hotel_id,
+                "packageId": package["id"], "guestName": korean_name(rng), "guestPhone": phone(rng),
+                "guestEmail": None, "checkInDate": check_in, "checkOutDate": check_in + nights * DAY_MS,
+                "totalAmount": package["price"] * nights,
+                "status": "COMPLETED" if check_in < ctx.today_ms else "CONFIRMED",
+                "createdAt": used_at, "updatedAt": used_at}
+
+
+def reservation_rows(ctx, start, count, rng):
+    """바우처 없이 들어온 직접 예약 (ID는 바우처 예약과 겹치지 않도록 Voucher 수 뒤부터)"""
+    offset = ctx.count("Voucher")
+    for i in range(start, start + count):
+        package = ctx.pick_package(rng)
+        day = ctx.sample_day(rng)
+        nights = NIGHTS[0][weighted_index(ctx.nights_cumulative, rng)]
+        check_in = ctx.days[day]
+        created = check_in - int(rng.expovariate(1 / 14) * DAY_MS)
+        if check_in < ctx.today_ms:
+            status = rng.choices(["COMPLETED", "CANCELLED"], [90, 10])[0]
+        else:
+            status = rng.choices(["CONFIRMED", "PENDING", "CANCELLED"], [65, 25, 10])[0]
+        yield "Reservation", {
+            "id": ctx.make_id("Reservation", offset + i), "voucherId": None,
+            "hotelId": package["_room"]["_hotel"]["id"], "packageId": package["id"], "guestName": korean_name(rng),
+            "guestPhone": phone(rng), "guestEmail": f"direct{i}@example.com" if rng.random() < 0.5 else None,
+            "checkInDate": check_in, "checkOutDate": check_in + nights * DAY_MS,
+            "totalAmount": round(package["price"] * nights * (0.85 + 0.25 * ctx.season(day)), -2),
+            "status": status, "createdAt": created, "updatedAt": created}
+
+
+def order_rows(ctx, start, count, rng):
+    products = ctx.dims["Product"]
+    for i in range(start, start + count):
+        order_id = ctx.make_id("Order", i)
+        created = ctx.days[ctx.sample_day(rng)]
+        subtotal = commission = shipping = 0
+        items = []
+        for j in range(rng.choices([1, 2, 3], [70, 22, 8])[0]):
+            product = products[weighted_index(ctx.product_cumulative, rng)]
+            quantity = rng.choices([1, 2, 3], [80, 15, 5])[0]
+            subtotal += product["price"] * quantity
+            commission += product["price"] * quantity * product["commissionRate"]
+            shipping = max(shipping, product["shippingFee"])
+            items.append({"id": ctx.make_id("OrderItem", i * 3 + j), "orderId": order_id,
+                          "productId": product["id"], "quantity": quantity, "price": product["price"],
+                          "createdAt": created, "updatedAt": created})
+        discount = round(subtotal * 0.1, -2) if rng.random() < 0.15 else 0
+        yield "Order", {
+            "id": order_id, "userId": ctx.pick_id("User", rng) if rng.random() < 0.7 else None,
+            "orderNumber": f"SO{ctx.tag}{i:09d}", "status": rng.choices(
+                ["DELIVERED", "SHIPPED", "CONFIRMED", "PENDING", "CANCELLED"], [60, 10, 12, 10, 8])[0],
+            "totalAmount": subtotal - discount + shipping, "customerName": korean_name(rng),
+            "customerEmail": f"buyer{i}@example.com", "customerPhone": phone(rng), "shippingAddress": None,
+            "notes": None, "createdAt": created, "updatedAt": created, "commissionAmount": round(commission),
+            "discountAmount": discount, "shippingAmount": shipping, "subtotalAmount": subtotal,
+            "taxAmount": round((subtotal - discount) / 11)}
+        for item in items:
+            yield "OrderItem", item
+
+
+def user_chunk_rows(ctx, start, count, rng):
+    for row in user_rows(ctx, start, count, rng):
+        yield "User", row
+
+
+# 그룹: (이름, 행 생성기, 개수 함수, 만드는 테이블)
+GROUPS = [
+    ("User", user_chunk_rows, lambda ctx: ctx.count("User"), ["User"]),
+    ("Booking", booking_rows, lambda ctx: ctx.count("Booking"), ["Booking", "BookingItem"]),
+    ("Inventory", inventory_rows, lambda ctx: ctx.count("Room") * len(ctx.days), ["Inventory"]),
+    ("PackageInventory", package_inventory_rows, lambda ctx: ctx.count("Package") * len(ctx.days),
+     ["PackageInventory"]),
+    ("Voucher", voucher_rows, lambda ctx: ctx.count("Voucher"), ["Voucher", "Reservation"]),
+    ("Reservation", reservation_rows, lambda ctx: ctx.count("Reservation"), ["Reservation"]),
+    ("Order", order_rows, lambda ctx: ctx.count("Order"), ["Order", "OrderItem"]),
+]
+
+
+# 적재 ---------------------------------------------------------------------------
+
+def copy_escape(value, field):
+    """PostgreSQL COPY text 형식 한 칸"""
+    if value is None:
+        return "\\N"
+    if field.type == "DateTime":
+        return datetime.fromtimestamp(value / 1000, timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    if field.type == "Boolean":
+        return "t" if value else "f"
+    if field.is_list:
+        value = "{" + ",".join('"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in value) + "}"
+    elif field.type == "Json":
+        value = json.dumps(value, ensure_ascii=False)
+    text = str(value)
+    if any(c in text for c in "\\\t\n\r"):
+        text = text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return text
+
+
+def sqlite_value(value, field):
+    if value is None:
+        return None
+    if field.is_list or field.type == "Json":
+        return json.dumps(value, ensure_ascii=False)
+    if field.type == "Boolean":
+        return 1 if value else 0
+    return value  # DateTime은 Prisma SQLite와 같은 에포크 ms 정수
+
+
+class PostgresTarget:
+    """워커마다 연결 하나, 청크마다 COPY FROM STDIN (청크 하나가 트랜잭션 하나)"""
+
+    parallel_writes = True
+
+    def __init__(self, url):
+        self.url = url
+        self.conn = None
+        self.driver = None
+
+    def __getstate__(self):
+        # spawn 방식(윈도우/macOS)에서는 워커에 대상이 피클로 넘어가므로 연결은 빼고 보낸다 (워커가 새로 연다)
+        return {**self.__dict__, "conn": None, "driver": None}
+
+    def connect(self):
+        if self.conn is not None:
+            return
+        try:
+            import psycopg
+            self.driver, self.conn = "psycopg", psycopg.connect(self.url)
+            return
+        except ImportError:
+            pass
+        try:
+            import psycopg2
+            self.driver, self.conn = "psycopg2", psycopg2.connect(self.url)
+        except ImportError:
+            raise WriterError("PostgreSQL 적재에는 psycopg 또는 psycopg2가 필요합니다 (pip install 'psycopg[binary]')")
+
+    def prepare(self, models, tables, truncate):
+        self.connect()
+        if truncate:
+            with self.conn.cursor() as cur:
+                cur.execute("TRUNCATE " + ", ".join(f'"{t}"' for t in tables) + " CASCADE")
+            self.conn.commit()
+
+    def write(self, models, batches):
+        """batches: {테이블: [튜플]} — 부모 테이블이 먼저 오는 순서"""
+        self.connect()
+        with self.conn.cursor() as cur:
+            for table, rows in batches.items():
+                columns = models[table].columns
+                buffer = io.StringIO()
+                for row in rows:
+                    buffer.write("\t".join(copy_escape(v, f) for v, f in zip(row, columns)))
+                    buffer.write("\n")
+                sql = f'COPY "{table}" ({", ".join(chr(34) + f.name + chr(34) for f in columns)}) FROM STDIN'
+                if self.driver == "psycopg":
+                    with cur.copy(sql) as copy:
+                        copy.write(buffer.getvalue())
+                else:
+                    buffer.seek(0)
+                    cur.copy_expert(sql, buffer)
+        self.conn.commit()
+
+    def finish(self, models):
+        if self.conn is not None:
+            self.conn.close()
+
+
+class SqliteTarget:
+    """단일 연결 배치 executemany. 생성은 워커가 병렬로 하고 쓰기는 메인 프로세스가 한다 (SQLite 단일 writer)"""
+
+    parallel_writes = False
+    TYPES = {"String": "TEXT", "Int": "INTEGER", "Float": "REAL", "Boolean": "BOOLEAN", "DateTime": "DATETIME",
+             "Json": "TEXT"}
+
+    def __init__(self, path, recreate=False):
+        self.path = path
+        self.recreate = recreate
+        self.conn = None
+        self.columns = {}  # 테이블 → 실제로 넣을 (인덱스, 필드) 목록
+
+    def __getstate__(self):
+        # 워커는 이 대상에 쓰지 않지만 spawn 방식에서는 initargs로 피클되므로 열린 연결은 빼고 보낸다
+        return {**self.__dict__, "conn": None}
+
+    def _create(self, model):
+        parts = []
+        for field in model.columns:
+            sql_type = "TEXT" if field.is_list else self.TYPES.get(field.type, "TEXT")
+            parts.append(f'"{field.name}" {sql_type}{"" if field.optional else " NOT NULL"}'
+                         f'{" PRIMARY KEY" if field.is_id else ""}')
+        self.conn.execute(f'CREATE TABLE "{model.name}" ({", ".join(parts)})')
+
+    def prepare(self, models, tables, truncate):
+        import sqlite3
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("PRAGMA cache_size=-262144")
+        existing = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        for table in tables:
+            model = models[table]
+            if table in existing and self.recreate:
+                self.conn.execute(f'DROP TABLE "{table}"')
+                existing.discard(table)
+            if table not in existing:
+                self._create(model)
+                for index, columns in enumerate(model.uniques):
+                    self.conn.execute(f'CREATE UNIQUE INDEX "{table}_synth_unique_{index}" ON "{table}" '
+                                      f'({", ".join(chr(34) + c + chr(34) for c in columns)})')
+            elif truncate:
+                self.conn.execute(f'DELETE FROM "{table}"')
+            info = self.conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+            db_columns = {row[1] for row in info}
+            missing = [row[1] for row in info
+                       if row[3] and row[4] is None and not row[5] and row[1] not in {f.name for f in model.columns}]
+            if missing:
+                raise WriterError(f"{table}: 스키마에 없는 NOT NULL 컬럼 {missing} - 오래된 DB입니다 (--recreate)")
+            self.columns[table] = [(i, f) for i, f in enumerate(model.columns) if f.name in db_columns]
+        self.conn.commit()
+
+    def write(self, models, batches):
+        for table, rows in batches.items():
+            columns = self.columns[table]
+            sql = (f'INSERT INTO "{table}" ({", ".join(chr(34) + f.name + chr(34) for _, f in columns)}) '
+                   f'VALUES ({", ".join("?" * len(columns))})')
+            self.conn.executemany(sql, ([sqlite_value(row[i], f) for i, f in columns] for row in rows))
+        self.conn.commit()
+
+    def finish(self, models):
+        if self.conn is not None:
+            self.conn.execute("PRAGMA synchronous=FULL")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
+
+
+class NullTarget:
+    """생성 속도만 측정"""
+
+    parallel_writes = True
+
+    def prepare(self, models, tables, truncate):
+        pass
+
+    def write(self, models, batches):
+        pass
+
+    def finish(self, models):
+        pass
+
+
+def make_target(spec, recreate=False, allow_remote=False):
+    if spec == "none":
+        return NullTarget()
+    if spec.startswith("sqlite:"):
+        return SqliteTarget(spec[len("sqlite:"):], recreate)
+    if spec == "postgres" or spec.startswith(("postgres://", "postgresql://")):
+        url = os.environ.get("DATABASE_URL", "") if spec == "postgres" else spec
+        if not url.startswith(("postgres://", "postgresql://")):
+            raise WriterError("PostgreSQL URL이 없습니다 (DATABASE_URL 또는 --target postgresql://...)")
+        host = urlparse(url).hostname or "localhost"
+        if host not in ("localhost", "127.0.0.1", "::1") and not allow_remote:
+            raise WriterError(f"원격 DB({host})에는 --allow-remote 없이 적재하지 않습니다")
+        return PostgresTarget(url)
+    raise WriterError(f"알 수 없는 대상: {spec} (none, sqlite:<경로>, postgres)")
+
+
+# 병렬 실행 -------------------------------------------------------------------------
+
+_WORKER = {}
+
+
+def _init_worker(ctx, target):
+    _WORKER["ctx"] = ctx
+    _WORKER["target"] = target
+
+
+def _chunk_seed(seed, group, chunk):
+    return (seed * 1000003 + sum(map(ord, group)) * 7919 + chunk) & 0xFFFFFFFF
+
+
+def run_chunk(group_index, start, count, chunk):
+    """청크 하나 생성. 병렬 쓰기 대상이면 워커가 직접 적재하고 행 수만, 아니면 행을 돌려준다"""
+    ctx = _WORKER["ctx"]
+    target = _WORKER["target"]
+    name, generator, _, tables = GROUPS[group_index]
+    rng = random.Random(_chunk_seed(ctx.seed, name, chunk))
+    batches = {table: [] for table in tables}
+    index = start
+    for table, row in generator(ctx, start, count, rng):
+        batches[table].append(complete(ctx, table, row, index, rng))
+        index += 1
+    counts = {table: len(rows) for table, rows in batches.items()}
+    if target.parallel_writes:
+        target.write(ctx.models, batches)
+        return counts, None
+    return counts, batches
+
+
+def plan_counts(ctx):
+    """{그룹: 생성 단위 수}"""
+    return {name: count(ctx) for name, _, count, _ in GROUPS}
+
+
+def generate(ctx, target, workers, chunk_size, truncate, only=None, log=print):
+    models = ctx.models
+    dims = build_dimensions(ctx, random.Random(ctx.seed))
+    groups = [(i, g) for i, g in enumerate(GROUPS) if not only or g[0] in only]
+    tables = [t for t in dependency_order(models)
+              if t in dims or any(t in g[3] for _, g in groups)]
+    target.prepare(models, tables, truncate)
+    stats = {}
+    started = time.perf_counter()
+
+    # 차원 테이블은 메인 프로세스에서 먼저 적재 (사실 테이블 청크가 참조)
+    dim_started = time.perf_counter()
+    dim_rng = random.Random(ctx.seed + 1)
+    dim_batches = {}
+    for table in dependency_order(models):
+        if table in dims:
+            dim_batches[table] = [complete(ctx, table, row, i, dim_rng) for i, row in enumerate(dims[table])]
+    target.write(models, dim_batches)
+    for table, rows in dim_batches.items():
+        stats[table] = {"rows": len(rows), "seconds": time.perf_counter() - dim_started}
+    log(f"  📐 차원 테이블 {sum(len(r) for r in dim_batches.values()):,}행 "
+        f"({', '.join(f'{t} {len(r):,}' for t, r in dim_batches.items())})")
+    if isinstance(target, PostgresTarget):
+        target.finish(models)  # 워커가 각자 새 연결을 연다
+        target.conn = None
+
+    tasks = []
+    for group_index, (name, _, count, _) in groups:
+        total = count(ctx)
+        for chunk, start in enumerate(range(0, total, chunk_size)):
+            tasks.append((group_index, start, min(chunk_size, total - start), chunk))
+    # 큰 그룹을 먼저 섞어 넣어 워커 부하를 고르게
+    tasks.sort(key=lambda t: (t[3], t[0]))
+    group_started = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ctx, target)) as pool:
+        futures = {}
+        for task in tasks:
+            group_started.setdefault(GROUPS[task[0]][0], time.perf_counter())
+            futures[pool.submit(run_chunk, *task)] = task
+        done_chunks = 0
+        for future in as_completed(futures):
+            counts, batches = future.result()
+            if batches is not None:
+                target.write(models, batches)
+            done_chunks += 1
+            for table, rows in counts.items():
+                entry = stats.setdefault(table, {"rows": 0, "seconds": 0.0})
+                entry["rows"] += rows
+                entry["seconds"] = time.perf_counter() - group_started[GROUPS[futures[future][0]][0]]
+            if done_chunks % max(1, len(tasks) // 10) == 0 or done_chunks == len(tasks):
+                elapsed = time.perf_counter() - started
+                rows = sum(e["rows"] for e in stats.values())
+                log(f"  ⏱️ {done_chunks}/{len(tasks)} 청크, {rows:,}행, {rows / elapsed:,.0f}행/초")
+    if not isinstance(target, PostgresTarget):
+        target.finish(models)
+    return stats, time.perf_counter() - started
+
+
+def print_report(stats, elapsed, target_name):
+    total = sum(entry["rows"] for entry in stats.values())
+    print(f"\n📊 합성 데이터 적재 결과 ({target_name})")
+    for table, entry in sorted(stats.items(), key=lambda item: -item[1]["rows"]):
+        print(f"  {table:<18} {entry['rows']:>12,}행")
+    print(f"  {'합계':<16} {total:>12,}행  {elapsed:.1f}초  {total / elapsed:,.0f}행/초")
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--schema", default=SCHEMA_PATH)
+    common.add_argument("--scale", type=float, default=1.0, help="행 수 배율 (1 = 예약 100만 건)")
+    common.add_argument("--days", type=int, default=365, help="재고/예약 기간(일)")
+    common.add_argument("--start", default=None, help="기간 시작일 (기본: 오늘 - 180일)")
+    common.add_argument("--seed", type=int, default=42)
+    parser = argparse.ArgumentParser(description="RSVShop 대량 합성 데이터 생성기")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("plan", parents=[common], help="생성할 행 수 미리 보기")
+    gen = sub.add_parser("generate", parents=[common], help="생성 및 적재")
+    gen.add_argument("--target", default="none", help="none | sqlite:<경로> | postgres | postgresql://...")
+    gen.add_argument("--workers", type=int, default=len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity")
+                     else os.cpu_count() or 2)
+    gen.add_argument("--chunk", type=int, default=20000, help="청크당 행 수")
+    gen.add_argument("--only", help="쉼표로 구분한 그룹만 (User,Booking,Inventory,PackageInventory,Voucher,"
+                                    "Reservation,Order)")
+    gen.add_argument("--truncate", action="store_true", help="적재 전에 대상 테이블 비우기")
+    gen.add_argument("--recreate", action="store_true", help="SQLite: 테이블을 스키마대로 다시 만들기")
+    gen.add_argument("--allow-remote", action="store_true", help="localhost가 아닌 PostgreSQL에도 적재")
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 0
+    try:
+        models, enums = load_schema(args.schema)
+    except (OSError, SchemaError) as e:
+        print(f"❌ 스키마를 읽을 수 없습니다: {e}")
+        return 1
+    start = date.fromisoformat(args.start) if args.start else date.today() - timedelta(days=180)
+    # ID/고유 값은 시드에서 정해진다: 같은 시드로 다시 적재할 때는 --truncate
+    tag = format(args.seed % 0x10000, "04x")
+    ctx = Context(models, enums, args.scale, start, args.days, args.seed, tag, int(time.time() * 1000))
+
+    if args.command == "plan":
+        build_dimensions(ctx, random.Random(args.seed))
+        print(f"📐 스키마 모델 {len(models)}개, 적재 순서: {' → '.join(dependency_order(models))}")
+        for table in ("Hotel", "Room", "Package", "ShoppingMall", "Category", "Product", "SurchargeRule", "Discount"):
+            print(f"  {table:<18} {ctx.count(table):>12,}")
+        for name, count in plan_counts(ctx).items():
+            print(f"  {name:<18} {count:>12,}" + ("  (+ 예약 항목 약 1.1배)" if name == "Booking" else
+                                                  "  (+ 사용된 바우처의 예약 약 60%)" if name == "Voucher" else
+                                                  "  (+ 주문 항목 약 1.4배)" if name == "Order" else ""))
+        return 0
+
+    try:
+        target = make_target(args.target, args.recreate, args.allow_remote)
+        print(f"🏭 합성 데이터 생성: scale={args.scale:g}, 기간 {start} ~ {start + timedelta(days=args.days - 1)}, "
+              f"워커 {args.workers}개, 청크 {args.chunk:,}행, 대상 {args.target}, 태그 {tag}")
+        stats, elapsed = generate(ctx, target, args.workers, args.chunk, args.truncate,
+                                  set(args.only.split(",")) if args.only else None)
+    except WriterError as e:
+        print(f"❌ {e}")
+        return 1
+    print_report(stats, elapsed, args.target)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,16 @@
 import subprocess
 import time
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+import build_cache  # RSVSHOP_MODE=production: 캐시된 빌드로 next start
+from rsvshop import ports, proc  # 포트 확인/해제, npm 명령 (공통 코어)
+from rsvshop.events import ProcessEvents  # 라이프사이클 이벤트 (브라우저 매니저가 구독)
 
 def kill_port(port):
     """포트를 사용하는 프로세스 종료"""
-    try:
-        result = subprocess.run(['netstat', '-ano'], capture_output=True, text=True)
-        for line in result.stdout.split('\n'):
-            if f':{port}' in line and 'LISTENING' in line:
-                parts = line.split()
-                if len(parts) >= 5:
-                    pid = int(parts[-1])
-                    subprocess.run(['taskkill', '/F', '/PID', str(pid)])
-                    print(f"포트 {port}의 프로세스 {pid} 종료됨")
-                    return True
-    except:
-        pass
-    return False
+    return bool(ports.free_port(port))
 
 def start_server():
     """서버 시작"""
@@ -27,21 +21,32 @@ def start_server():
         time.sleep(2)
     
     # 서버 시작
+    process = None
+    events = ProcessEvents("rsvshop", 4900)
     try:
+        command, env = proc.npm_command('run', 'dev'), None
+        if build_cache.production_mode():
+            # 소스가 바뀐 경우에만 빌드하고 next start
+            command, env = build_cache.production_command(4900)
         process = subprocess.Popen(
-            ['cmd', '/c', 'npm', 'run', 'dev'],
-            cwd=os.getcwd()
+            command,
+            cwd=os.getcwd(),
+            env=env
         )
         print(f"✅ 서버 시작됨 (PID: {process.pid})")
+        events.starting(process)
         print("🌐 http://localhost:4900")
         print("🛑 Ctrl+C로 종료")
         
         # 프로세스 대기
-        process.wait()
+        events.exited(process.wait())
+    except build_cache.BuildError as e:
+        print(f"❌ 프로덕션 빌드를 준비하지 못했습니다: {e}")
     except KeyboardInterrupt:
         print("\n🛑 서버 종료")
         if process:
             process.terminate()
+        events.stopped()
 
 if __name__ == "__main__":
     start_server() 
\ No newline at end of file